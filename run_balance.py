@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo balance sweep launcher
+
+Plays headless runs across all cores and reports floor reached, time-to-kill,
+death causes and evolution/trait pick rates. Results stream to a JSON-lines
+file; running the same command again resumes an interrupted sweep.
+
+    python run_balance.py --runs 10000 --policy greedy --out balance.jsonl
+    python run_balance.py --out balance.jsonl --report-only
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add src directory to the import path so the package resolves from the repo root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from cli_game.balance import (  # noqa: E402
+    POLICIES,
+    MAX_RUN_TICKS,
+    run_sweep,
+    load_results,
+    summarize,
+    format_summary,
+)
+
+
+def main():
+    """Parse arguments, run the sweep and print the report"""
+    parser = argparse.ArgumentParser(description="Run headless Monte Carlo balance sweeps")
+    parser.add_argument("--runs", type=int, default=1000, help="runs per policy")
+    parser.add_argument("--seed", type=int, default=0, help="first seed; runs use seed..seed+runs-1")
+    parser.add_argument("--policy", action="append", choices=sorted(POLICIES),
+                        help="bot policy (repeat for several; default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--max-ticks", type=int, default=MAX_RUN_TICKS, help="tick limit per run")
+    parser.add_argument("--out", default="balance.jsonl", help="results file (appended to, resumable)")
+    parser.add_argument("--report-only", action="store_true", help="summarize the results file without playing")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    if not args.report_only:
+        def progress(done, total):
+            if done % 100 == 0 or done == total:
+                print(f"\r{done}/{total} runs", end="", file=sys.stderr, flush=True)
+
+        try:
+            played = run_sweep(
+                args.out, args.runs, args.policy or sorted(POLICIES), args.seed,
+                args.workers, args.max_ticks, progress
+            )
+        except KeyboardInterrupt:
+            print("\nInterrupted; run the same command again to resume", file=sys.stderr)
+            return 130
+        if played:
+            print(file=sys.stderr)
+
+    summary = summarize(load_results(args.out))
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
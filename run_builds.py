@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Build explorer launcher
+
+Enumerates every upgrade / evolution / trait sequence up to a level, prints
+the builds on the DPS / EHP / sustain frontier against a reference enemy, and
+the builds whose stats depend on the order they were picked in.
+
+    python run_builds.py --max-level 10 --enemy OrcWarrior --floor 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add src directory to the import path so the package resolves from the repo root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from cli_game.config import (  # noqa: E402
+    EVOLUTION_STAGE_3_LEVEL, BUILD_TRAIT_EVERY, BUILD_REFERENCE_ENEMY, BUILD_REFERENCE_FLOOR,
+)
+from cli_game.builds import explore, format_report  # noqa: E402
+from cli_game.duels import DUEL_ENEMIES  # noqa: E402
+
+
+def main():
+    """Parse arguments, explore and print the report"""
+    parser = argparse.ArgumentParser(description="Explore the build space and find dominant builds")
+    parser.add_argument("--max-level", type=int, default=EVOLUTION_STAGE_3_LEVEL, help="level builds are taken to")
+    parser.add_argument("--traits-every", type=int, default=BUILD_TRAIT_EVERY, help="levels between trait picks")
+    parser.add_argument("--enemy", default=BUILD_REFERENCE_ENEMY, choices=sorted(DUEL_ENEMIES),
+                        help="reference enemy")
+    parser.add_argument("--floor", type=int, default=BUILD_REFERENCE_FLOOR, help="reference enemy's floor")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--top", type=int, default=20, help="rows per section")
+    parser.add_argument("--json", help="also write the full results to this JSON file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = explore(args.max_level, args.traits_every, args.enemy, args.floor, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Explored in {elapsed:.1f}s", file=sys.stderr)
+
+    print(format_report(report, args.top))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
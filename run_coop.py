@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Headless co-op launcher
+
+Runs either end of a co-op session without a window, for testing the
+protocol with two processes on one machine. The host plays its seat with a
+bot policy in real time; the joining client plays the partner seat with a
+simple bot that chases the nearest enemy in its interpolated view. Both ends
+print bandwidth, round-trip time and snapshot size every second.
+
+    python run_coop.py host --port 47800 --seconds 60
+    python run_coop.py join --port 47800 --seconds 30
+
+To play instead, start the game with --coop-host or --coop-join.
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+# Add src directory to the import path so the package resolves from the repo root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from cli_game.config import FPS, TILE_SIZE, COOP_PORT, COOP_SNAPSHOT_RATE, ATTACK_RANGE  # noqa: E402
+from cli_game.balance import POLICIES  # noqa: E402
+from cli_game.netplay import CoopHost, CoopClient  # noqa: E402
+from cli_game.policies import get_policy, observe  # noqa: E402
+from cli_game.simulation import GameSimulation, GameState, SIM_TICK, CMD_MOVE, CMD_ATTACK, CMD_RESTART  # noqa: E402
+
+
+def format_stats(stats):
+    """One line of connection counters"""
+    rtt = f"{stats['rtt_ms']:.1f}ms" if stats["rtt_ms"] is not None else "-"
+    return (
+        f"up {stats['sent_per_second'] / 1024:.2f} KB/s  down {stats['received_per_second'] / 1024:.2f} KB/s"
+        f"  snapshot {stats['snapshot_bytes']:.0f} B  RTT {rtt}"
+    )
+
+
+def run_host(args):
+    """Step the authoritative simulation in real time and serve the partner seat"""
+    sim = GameSimulation(seed=args.seed)
+    host = CoopHost(sim, args.port, args.snapshot_rate)
+    policy = get_policy(args.policy, args.seed)
+    print(f"Hosting on port {host.port}", file=sys.stderr)
+
+    start = time.perf_counter()
+    try:
+        while not args.seconds or time.perf_counter() - start < args.seconds:
+            host.poll()
+            commands = [(CMD_RESTART,)] if sim.state == GameState.GAME_OVER else policy.decide(observe(sim))
+            events = sim.step(commands, partner_commands=host.take_partner_commands())
+            host.after_step(events)
+
+            if host.steps % FPS == 0:
+                stats = host.stats()
+                status = format_stats(stats) if stats else "waiting for a partner"
+                print(f"floor {sim.floor_number:3d}  players {len(sim.active_players)}  {status}")
+
+            # Real time: sleep off the rest of the tick
+            time.sleep(max(0.0, start + host.steps * SIM_TICK - time.perf_counter()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        host.close()
+    return 0
+
+
+def partner_bot(view, slot):
+    """Walk toward the nearest enemy and swing when in reach"""
+    me = view["players"].get(slot)
+    if not me or not me["alive"] or not view["enemies"]:
+        return [(CMD_MOVE, 0, 0)]
+    target = min(view["enemies"].values(), key=lambda enemy: math.hypot(enemy["x"] - me["x"], enemy["y"] - me["y"]))
+    dx, dy = target["x"] - me["x"], target["y"] - me["y"]
+    dead_zone = TILE_SIZE / 4
+    commands = [(CMD_MOVE, (dx > dead_zone) - (dx < -dead_zone), (dy > dead_zone) - (dy < -dead_zone))]
+    if math.hypot(dx, dy) <= ATTACK_RANGE:
+        commands.append((CMD_ATTACK,))
+    return commands
+
+
+def run_join(args):
+    """Play the partner seat with a bot, reporting the connection every second"""
+    client = CoopClient(args.address, args.port)
+    start = time.perf_counter()
+    last_move = None
+    frames = 0
+    try:
+        while client.connected and (not args.seconds or time.perf_counter() - start < args.seconds):
+            client.poll()
+            view = client.view()
+            if view:
+                commands = partner_bot(view, client.slot)
+                # Movement is a held direction: only send it when it changes
+                if commands[0] == last_move:
+                    commands = commands[1:]
+                else:
+                    last_move = commands[0]
+                client.send(commands)
+                client.take_effects()
+
+            frames += 1
+            if frames % FPS == 0 and view:
+                print(
+                    f"floor {view['floor']:3d}  enemies {len(view['enemies']):3d}  {format_stats(client.stats())}"
+                )
+            time.sleep(max(0.0, start + frames * SIM_TICK - time.perf_counter()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        summary = client.stats()
+        client.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Received {summary['bytes_received']:,} B in {elapsed:.1f}s ({summary['bytes_received'] / elapsed / 1024:.2f} KB/s),"
+        f" sent {summary['bytes_sent']:,} B ({summary['bytes_sent'] / elapsed / 1024:.2f} KB/s),"
+        f" {summary['messages_received']} messages, mean snapshot {summary['snapshot_bytes']:.0f} B"
+    )
+    return 0
+
+
+def main():
+    """Parse arguments and run the chosen end"""
+    parser = argparse.ArgumentParser(description="Run a headless co-op host or partner")
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    host = sub.add_parser("host", help="run the authoritative simulation with a bot player")
+    host.add_argument("--port", type=int, default=COOP_PORT, help="TCP port (0: any free port)")
+    host.add_argument("--seed", type=int, default=0, help="run seed")
+    host.add_argument("--policy", default="greedy", choices=sorted(POLICIES), help="host bot policy")
+    host.add_argument("--snapshot-rate", type=float, default=COOP_SNAPSHOT_RATE, help="snapshots per second")
+    host.add_argument("--seconds", type=float, default=0, help="stop after this long (0: run until interrupted)")
+
+    join = sub.add_parser("join", help="play the partner seat with a bot")
+    join.add_argument("--address", default="127.0.0.1", help="host address")
+    join.add_argument("--port", type=int, default=COOP_PORT, help="host TCP port")
+    join.add_argument("--seconds", type=float, default=0, help="leave after this long (0: stay until the host ends)")
+
+    args = parser.parse_args()
+    return run_host(args) if args.role == "host" else run_join(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
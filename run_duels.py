@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Duel table launcher
+
+Builds (or loads from cache) the time-to-kill / time-to-die tables of every
+evolution form, stat-upgrade mix and trait set against each enemy on each
+floor, and prints the rows asked for.
+
+    python run_duels.py --form direwolf --enemy OrcWarrior --floor 5
+    python run_duels.py --check 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add src directory to the import path so the package resolves from the repo root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import numpy as np  # noqa: E402
+from cli_game.config import DUEL_COUNT, DUEL_FLOORS, DUEL_MAX_TRAITS, DUEL_CACHE_DIR  # noqa: E402
+from cli_game.duels import DUEL_ENEMIES, load_table, select_rows, format_table, play_duel  # noqa: E402
+from cli_game.simulation import STAT_UPGRADES  # noqa: E402
+from cli_game.systems import EVOLUTION_TREE, TRAIT_CATALOG  # noqa: E402
+
+
+def check(table, rows, duels, seed):
+    """Replay a sample of rows with the per-duel Python loop and compare"""
+    rng = random.Random(seed)
+    random.seed(seed)
+    sample = rng.sample(range(len(table["form"])), min(rows, len(table["form"])))
+    played = 0
+    start = time.perf_counter()
+
+    print(f"{'row':<58} {'ttk mean':>17} {'ttd p50':>17} {'win':>15}")
+    for row in sample:
+        form_id = str(table["form"][row])
+        mix = tuple(int(table[f"{stat_id}_ups"][row]) for stat_id in STAT_UPGRADES)
+        traits = str(table["traits"][row])
+        trait_classes = tuple(TRAIT_CATALOG.get(trait_id) for trait_id in traits.split("+") if trait_id)
+        enemy, floor = str(table["enemy"][row]), int(table["floor"][row])
+
+        results = np.array([play_duel(form_id, mix, trait_classes, enemy, floor) for _ in range(duels)])
+        played += duels
+        ttk, ttd = results[:, 0], results[:, 1]
+        win = np.mean(np.isfinite(ttk) & (ttk <= ttd))
+        label = f"{form_id} {'/'.join(map(str, mix))} {traits or '-'} vs {enemy} {floor}"
+        print(
+            f"{label:<58} {ttk.mean():7.2f} / {table['ttk_mean'][row]:7.2f}"
+            f" {np.median(ttd):7.2f} / {table['ttd_p50'][row]:7.2f}"
+            f" {win:6.1%} / {table['win_rate'][row]:6.1%}"
+        )
+
+    elapsed = time.perf_counter() - start
+    print(f"(loop / table) python loop: {played / elapsed:,.0f} duels/s", file=sys.stderr)
+
+
+def main():
+    """Parse arguments, load the table and print the selection"""
+    parser = argparse.ArgumentParser(description="Build and query vectorized duel tables")
+    parser.add_argument("--duels", type=int, default=DUEL_COUNT, help="duels per row")
+    parser.add_argument("--floors", type=int, default=DUEL_FLOORS, help="floors covered")
+    parser.add_argument("--max-traits", type=int, default=DUEL_MAX_TRAITS, help="largest trait set")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--cache", default=DUEL_CACHE_DIR, help="cache directory")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cache")
+    parser.add_argument("--form", choices=sorted(EVOLUTION_TREE), help="only this form")
+    parser.add_argument("--enemy", choices=sorted(DUEL_ENEMIES), help="only this enemy")
+    parser.add_argument("--floor", type=int, help="only this floor")
+    parser.add_argument("--traits", help="only this trait set, e.g. lifesteal+iron_hide ('' for none)")
+    parser.add_argument("--sort", default="ttk_mean",
+                        choices=["ttk_mean", "ttk_p90", "ttd_mean", "ttd_p50", "win_rate"], help="sort column")
+    parser.add_argument("--limit", type=int, default=40, help="rows to print")
+    parser.add_argument("--check", type=int, metavar="ROWS",
+                        help="compare this many random rows against the per-duel Python loop")
+    args = parser.parse_args()
+
+    def progress(done, total):
+        print(f"\r{done:,}/{total:,} duels", end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    table = load_table(args.duels, args.floors, args.max_traits, args.seed,
+                       cache_dir=args.cache, rebuild=args.rebuild, progress=progress)
+    elapsed = time.perf_counter() - start
+    total = len(table["form"]) * args.duels
+    print(f"\r{len(table['form']):,} rows of {args.duels} duels ({total:,}) ready in {elapsed:.1f}s",
+          file=sys.stderr)
+
+    if args.check:
+        check(table, args.check, args.duels, args.seed)
+        return 0
+
+    mask = select_rows(table, args.form, args.enemy, args.floor, args.traits)
+    print(format_table(table, mask, args.sort, args.limit))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Session host launcher
+
+Runs a ladder of bot sessions concurrently in one process on the asyncio
+session host and reports per-session step latency percentiles, host load
+and memory.
+
+    python run_host.py --sessions 300 --policy greedy --tick-rate 0
+    python run_host.py --sessions 50 --tick-rate 60 --max-ticks 3600
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+from collections import Counter
+
+# Add src directory to the import path so the package resolves from the repo root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from cli_game.config import FPS  # noqa: E402
+from cli_game.balance import POLICIES, MAX_RUN_TICKS  # noqa: E402
+from cli_game.host import SessionHost, latency_percentiles  # noqa: E402
+
+
+async def ladder(args):
+    """Play every seed at once on one host, printing load while it runs"""
+    async with SessionHost(args.tick_rate, args.max_sessions) as host:
+        async def monitor():
+            while True:
+                await asyncio.sleep(args.report_every)
+                report = host.report()
+                print(
+                    f"ticks {report['ticks']}  live {report['sessions']}  done {report['finished']}"
+                    f"  tick {report['tick_ms']['mean']:.1f}ms  overruns {report['overruns']}"
+                    f"  latency p50 {report['latency_ms']['p50']:.1f}ms p99 {report['latency_ms']['p99']:.1f}ms",
+                    file=sys.stderr,
+                )
+
+        watcher = asyncio.create_task(monitor())
+        seeds = range(args.seed, args.seed + args.sessions)
+        results = await asyncio.gather(*(host.play(seed, args.policy, args.max_ticks) for seed in seeds))
+        watcher.cancel()
+        return results, host.report()
+
+
+def main():
+    """Parse arguments, run the ladder and print the results"""
+    parser = argparse.ArgumentParser(description="Run many headless bot sessions in one process")
+    parser.add_argument("--sessions", type=int, default=100, help="concurrent sessions")
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--policy", default="greedy", choices=sorted(POLICIES), help="bot policy")
+    parser.add_argument("--max-ticks", type=int, default=MAX_RUN_TICKS, help="tick limit per session")
+    parser.add_argument("--tick-rate", type=float, default=FPS, help="host ticks per second (0: unpaced)")
+    parser.add_argument("--max-sessions", type=int, default=None, help="sessions live at once (the rest wait)")
+    parser.add_argument("--report-every", type=float, default=5.0, help="seconds between load reports")
+    parser.add_argument("--json", action="store_true", help="print every session result as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results, report = asyncio.run(ladder(args))
+    elapsed = time.perf_counter() - start
+    steps = sum(result["steps"] for result in results)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+    floors = Counter(result["floor"] for result in results)
+    p99s = latency_percentiles(result["latency_ms"]["p99"] / 1000 for result in results)
+    print(f"{len(results)} sessions, {steps:,} steps in {elapsed:.1f}s ({steps / elapsed:,.0f} steps/s)")
+    print(f"Host: {report['ticks']} ticks, {report['overruns']} overruns, mean tick {report['tick_ms']['mean']:.1f}ms")
+    print("Step latency ms (all steps): " + "  ".join(f"{k} {v:.2f}" for k, v in report["latency_ms"].items()))
+    print("Per-session p99 ms:          " + "  ".join(f"{k} {v:.2f}" for k, v in p99s.items()))
+    print(f"Peak memory {peak_mb:.0f} MB ({peak_mb / len(results):.2f} MB per session)")
+    print("Floors reached: " + ", ".join(f"{floor}: {count}" for floor, count in sorted(floors.items())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
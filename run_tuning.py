@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Config sweep launcher
+
+Plays headless runs under many variants of the gameplay tunables in config.py
+and writes a results table. Rows stream to a JSON-lines file; running the
+same command again resumes an interrupted sweep.
+
+    python run_tuning.py -p FLOOR_SCALING_FACTOR=1.1,1.15,1.2 -p ATTACK_COOLDOWN=0.3,0.35,0.4
+    python run_tuning.py --random 200 -p ENEMY_SPEED_BASE=1.2:1.8 -p XP_LEVEL_MULTIPLIER=1.2:1.4
+    python run_tuning.py --out tuning.jsonl --report-only --csv tuning.csv
+"""
+
+import argparse
+import os
+import sys
+
+# Add src directory to the import path so the package resolves from the repo root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from cli_game.config import SWEEP_RUNS, Settings  # noqa: E402
+from cli_game.balance import POLICIES, MAX_RUN_TICKS, load_results  # noqa: E402
+from cli_game.tuning import (  # noqa: E402
+    RESULT_COLUMNS,
+    parse_space,
+    grid_variants,
+    random_variants,
+    run_tuning,
+    format_results,
+    write_csv,
+)
+
+
+def main():
+    """Parse arguments, run the sweep and print the results table"""
+    parser = argparse.ArgumentParser(
+        description="Sweep gameplay config values over headless runs",
+        epilog=f"Tunables: {', '.join(Settings.TUNABLES)}",
+    )
+    parser.add_argument("-p", "--param", action="append", default=[], metavar="NAME=VALUES",
+                        help="v1,v2,... (grid or random choice) or low:high (random search); repeatable")
+    parser.add_argument("--random", type=int, metavar="N", help="random search over N variants instead of the grid")
+    parser.add_argument("--search-seed", type=int, default=0, help="seed of the random search")
+    parser.add_argument("--runs", type=int, default=SWEEP_RUNS, help="runs per variant")
+    parser.add_argument("--seed", type=int, default=0, help="first run seed; every variant plays the same seeds")
+    parser.add_argument("--policy", default="greedy", choices=sorted(POLICIES), help="bot policy")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--max-ticks", type=int, default=MAX_RUN_TICKS, help="tick limit per run")
+    parser.add_argument("--out", default="tuning.jsonl", help="results file (appended to, resumable)")
+    parser.add_argument("--report-only", action="store_true", help="print the results file without playing")
+    parser.add_argument("--sort", default="floor_mean", choices=[c for c in RESULT_COLUMNS if c != "top_death"],
+                        help="sort column (descending)")
+    parser.add_argument("--limit", type=int, default=40, help="rows to print")
+    parser.add_argument("--csv", help="also write the full table to this CSV file")
+    args = parser.parse_args()
+
+    if not args.report_only:
+        try:
+            space = parse_space(args.param)
+            variants = random_variants(space, args.random, args.search_seed) if args.random else grid_variants(space)
+        except ValueError as error:
+            parser.error(str(error))
+
+        def progress(done, total):
+            print(f"\r{done}/{total} variants", end="", file=sys.stderr, flush=True)
+
+        try:
+            played = run_tuning(args.out, variants, args.runs, args.policy, args.seed,
+                                args.workers, args.max_ticks, progress)
+        except KeyboardInterrupt:
+            print("\nInterrupted; run the same command again to resume", file=sys.stderr)
+            return 130
+        if played:
+            print(file=sys.stderr)
+
+    rows = load_results(args.out)
+    print(format_results(rows, args.sort, args.limit))
+    if args.csv:
+        write_csv(rows, args.csv, args.sort)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Monte Carlo balance runs
+
+Plays complete headless runs with a bot policy and summarizes them: floor
+reached, time-to-kill per enemy archetype, death causes, and evolution and
+trait pick rates. Sweeps fan out over a process pool, stream one JSON line
+per finished run, and skip runs already in the output file when resumed.
+"""
+
+import json
+import math
+import multiprocessing
+import os
+from collections import Counter, defaultdict
+from .config import *
+from .simulation import (
+    GameSimulation,
+    GameState,
+    CMD_SELECT,
+    EVENT_HIT,
+    EVENT_KILL,
+    EVENT_HURT,
+)
+from .policies import POLICIES, get_policy, observe
+from .systems import EVOLUTION_TREE
+
+MAX_RUN_TICKS = FPS * 60 * 10  # Runs still alive after ten minutes of game time end as "timeout"
+
+
+def play_run(seed, policy_name, max_ticks=MAX_RUN_TICKS):
+    """Play one headless run to death (or max_ticks) and return its record"""
+    sim = GameSimulation(seed=seed)
+    policy = get_policy(policy_name, seed)
+
+    evolutions = []
+    evolution_offers = []
+    traits = []
+    trait_offers = []
+    first_hit = {}  # enemy -> tick of its first hit
+    kill_times = defaultdict(list)  # archetype -> seconds from first hit to death
+    last_hurt_by = None
+
+    while sim.state != GameState.GAME_OVER and sim.tick < max_ticks:
+        commands = policy.decide(observe(sim))
+
+        # Note which offer a selection picks before the step applies it
+        if sim.state in (GameState.EVOLUTION_SELECTION, GameState.TRAIT_SELECTION):
+            for command in commands:
+                if command[0] == CMD_SELECT:
+                    pick = sim.choices[command[1]]
+                    if sim.state == GameState.EVOLUTION_SELECTION:
+                        evolution_offers.append(list(sim.choices))
+                        evolutions.append(pick)
+                    else:
+                        trait_offers.append([trait.id for trait in sim.choices])
+                        traits.append(pick.id)
+                    break
+
+        for event in sim.step(commands):
+            kind = event[0]
+            if kind == EVENT_HIT:
+                first_hit.setdefault(event[1], sim.tick)
+            elif kind == EVENT_KILL:
+                enemy = event[1]
+                ticks = sim.tick - first_hit.pop(enemy, sim.tick)
+                kill_times[type(enemy).__name__].append(round(ticks / FPS, 3))
+            elif kind == EVENT_HURT:
+                last_hurt_by = event[2]
+
+    if sim.state == GameState.GAME_OVER:
+        death_cause = last_hurt_by
+    else:
+        death_cause = "timeout"
+
+    return {
+        "seed": seed,
+        "policy": policy_name,
+        "floor": sim.floor_number,
+        "level": sim.player.level,
+        "form": sim.player.current_form,
+        "ticks": sim.tick,
+        "death_cause": death_cause,
+        "evolutions": evolutions,
+        "evolution_offers": evolution_offers,
+        "traits": traits,
+        "trait_offers": trait_offers,
+        "kill_times": dict(kill_times),
+    }
+
+
+def _play_task(task):
+    """Pool entry point: play one (seed, policy, max_ticks) task"""
+    return play_run(*task)
+
+
+def load_results(path):
+    """Read run records from a results file (a truncated last line is skipped)"""
+    results = []
+    if not os.path.exists(path):
+        return results
+    with open(path) as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except ValueError:
+                continue
+    return results
+
+
+def trim_results(path):
+    """Cut a results file back to its last complete line, so appended records start on a line of their own"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        end = position = f.seek(0, os.SEEK_END)
+        keep = 0
+        while position > 0:
+            start = max(0, position - 4096)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                keep = start + newline + 1
+                break
+            position = start
+        if keep < end:
+            f.truncate(keep)
+
+
+def run_sweep(path, runs, policies=("greedy",), first_seed=0, workers=None,
+              max_ticks=MAX_RUN_TICKS, progress=None):
+    """
+    Play runs seeds per policy across a process pool, appending records to path
+    Seeds already recorded in path are skipped, so an interrupted sweep resumes.
+    Returns the number of runs played.
+    """
+    trim_results(path)
+    done = {(record["seed"], record["policy"]) for record in load_results(path)}
+    tasks = [
+        (seed, policy_name, max_ticks)
+        for policy_name in policies
+        for seed in range(first_seed, first_seed + runs)
+        if (seed, policy_name) not in done
+    ]
+    if not tasks:
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, min(16, len(tasks) // (workers * 8)))
+    played = 0
+    with open(path, "a") as out, multiprocessing.Pool(workers) as pool:
+        for record in pool.imap_unordered(_play_task, tasks, chunksize):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            played += 1
+            if progress:
+                progress(played, len(tasks))
+    return played
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(results):
+    """Aggregate run records into per-policy distributions and pick rates"""
+    by_policy = defaultdict(list)
+    for record in results:
+        by_policy[record["policy"]].append(record)
+
+    summary = {}
+    for policy_name, records in sorted(by_policy.items()):
+        floors = Counter(record["floor"] for record in records)
+        deaths = Counter(record["death_cause"] for record in records)
+
+        kill_times = defaultdict(list)
+        for record in records:
+            for archetype, times in record["kill_times"].items():
+                kill_times[archetype].extend(times)
+        time_to_kill = {}
+        for archetype, times in sorted(kill_times.items()):
+            times.sort()
+            time_to_kill[archetype] = {
+                "kills": len(times),
+                "mean": sum(times) / len(times),
+                "p50": _percentile(times, 0.5),
+                "p90": _percentile(times, 0.9),
+            }
+
+        # Pick rate of each option: times picked / times offered
+        evolution_offered = Counter(form for r in records for offer in r["evolution_offers"] for form in offer)
+        evolution_picked = Counter(form for r in records for form in r["evolutions"])
+        trait_offered = Counter(trait for r in records for offer in r["trait_offers"] for trait in offer)
+        trait_picked = Counter(trait for r in records for trait in r["traits"])
+        paths = Counter(" > ".join(["larva"] + r["evolutions"]) for r in records)
+
+        summary[policy_name] = {
+            "runs": len(records),
+            "floor": {
+                "histogram": dict(sorted(floors.items())),
+                "mean": sum(r["floor"] for r in records) / len(records),
+            },
+            "time_to_kill": time_to_kill,
+            "death_causes": dict(deaths.most_common()),
+            "evolution_pick_rates": {
+                form: _pick_rate(evolution_picked[form], evolution_offered[form])
+                for form in EVOLUTION_TREE if evolution_offered[form]
+            },
+            "evolution_paths": dict(paths.most_common()),
+            "trait_pick_rates": {
+                trait: _pick_rate(trait_picked[trait], trait_offered[trait])
+                for trait in sorted(trait_offered)
+            },
+        }
+    return summary
+
+
+def _pick_rate(picked, offered):
+    """Picked / offered counts with their ratio"""
+    return {"picked": picked, "offered": offered, "rate": picked / offered if offered else 0.0}
+
+
+def format_summary(summary):
+    """Render a summary as a plain-text report"""
+    lines = []
+    for policy_name, stats in summary.items():
+        lines.append(f"== {policy_name}: {stats['runs']} runs")
+
+        lines.append(f"Floor reached (mean {stats['floor']['mean']:.2f}):")
+        for floor, count in stats["floor"]["histogram"].items():
+            lines.append(f"  {floor:>3}: {count:>6}  {count / stats['runs']:6.1%}")
+
+        lines.append("Time to kill (seconds from first hit):")
+        for archetype, ttk in stats["time_to_kill"].items():
+            lines.append(
+                f"  {archetype:<14} kills {ttk['kills']:>7}  mean {ttk['mean']:6.2f}"
+                f"  p50 {ttk['p50']:6.2f}  p90 {ttk['p90']:6.2f}"
+            )
+
+        lines.append("Death causes:")
+        for cause, count in stats["death_causes"].items():
+            lines.append(f"  {cause:<14} {count:>6}  {count / stats['runs']:6.1%}")
+
+        lines.append("Evolution pick rates:")
+        for form, rate in stats["evolution_pick_rates"].items():
+            lines.append(f"  {form:<14} {rate['picked']:>6}/{rate['offered']:<6} {rate['rate']:6.1%}")
+        lines.append("Evolution paths:")
+        for path, count in stats["evolution_paths"].items():
+            lines.append(f"  {count:>6}  {path}")
+
+        lines.append("Trait pick rates:")
+        for trait, rate in stats["trait_pick_rates"].items():
+            lines.append(f"  {trait:<16} {rate['picked']:>6}/{rate['offered']:<6} {rate['rate']:6.1%}")
+        lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,409 @@
+"""
+Build-space explorer
+
+A build is every choice a run makes up to some level: a stat upgrade at each
+level up, an evolution as soon as a stage's level is reached, and a trait
+every few levels. The explorer walks those choices level by level:
+
+- Choice sequences that land on the same state are merged, so every shared
+  prefix is expanded once; evolution and trait transitions are memoized.
+- States with the same form, level, traits and upgrade counts keep only
+  their Pareto-best (max HP, ATK, DEF) points. Every transition is
+  non-decreasing in each stat, so a dominated point can't lead anywhere better.
+- After the first evolution the branches are spread over a process pool.
+
+Final builds are rated analytically against a reference enemy: expected DPS
+from the damage roll table, EHP (max HP times the share of the enemy's hit
+that gets through, inverted) and sustain (lifesteal plus timed heals per second).
+
+evolve_player divides by the old form's multiplier, multiplies by the new one
+and truncates, so the same build (form, upgrade counts, traits) can end up
+with different stats depending on pick order: upgrades taken before an
+evolution are scaled by it, and each truncation can lose a point (or float
+error gain one). The explorer tracks the lowest and highest value of each stat
+over all orderings of a build and reports the widest spreads, along with how
+much of each extreme is rounding, from an exact Fraction replay of its path.
+"""
+
+import functools
+import math
+import multiprocessing
+import os
+from fractions import Fraction
+from .config import *
+from .duels import DUEL_ENEMIES, stage_level, swing_rolls, swing_period, contact_damage, heal_per_second
+from .entities.player import MonsterPlayer
+from .simulation import STAT_UPGRADES
+from .systems import EVOLUTION_TREE, TRAIT_REGISTRY, TRAIT_CATALOG, TimerWheel, evolve_player, damage_for_roll
+
+STATS = ("max_hp", "base_atk", "base_def")  # Player attributes a build state tracks, in order
+MULTIPLIERS = ("hp_mult", "atk_mult", "def_mult")  # EVOLUTION_TREE multiplier of each tracked stat
+START_FORM = next(form_id for form_id, data in EVOLUTION_TREE.items() if data["stage"] == 0)
+
+_scratch = None
+
+
+def _scratch_player():
+    """Per-process player that transitions and ratings are computed on"""
+    global _scratch
+    if _scratch is None:
+        _scratch = MonsterPlayer(0, 0)
+    return _scratch
+
+
+def _load(player, stats, cooldown):
+    """Set a player's tracked stats"""
+    player.max_hp, player.base_atk, player.base_def = stats
+    player.hp = player.max_hp
+    player.speed = settings.PLAYER_SPEED
+    player.base_crit_chance = settings.BASE_CRIT_CHANCE
+    player.attack_cooldown = cooldown
+
+
+@functools.lru_cache(maxsize=None)
+def _upgrade(stat_id, stats):
+    """Stats after a STAT_UPGRADES pick"""
+    values = list(stats)
+    for attribute, amount in STAT_UPGRADES[stat_id].items():
+        if attribute in STATS:
+            values[STATS.index(attribute)] += amount
+    return tuple(values)
+
+
+@functools.lru_cache(maxsize=None)
+def _evolve(old_form, new_form, stats):
+    """Stats after evolve_player"""
+    player = _scratch_player()
+    _load(player, stats, settings.ATTACK_COOLDOWN)
+    player.current_form = old_form
+    evolve_player(player, new_form)
+    return (player.max_hp, player.base_atk, player.base_def)
+
+
+@functools.lru_cache(maxsize=None)
+def _add_trait(trait_class, stats, cooldown):
+    """(stats, attack cooldown) after a trait's apply()"""
+    player = _scratch_player()
+    _load(player, stats, cooldown)
+    player.timers = TimerWheel()  # Drop timers earlier applies scheduled
+    trait_class().apply(player)
+    return (player.max_hp, player.base_atk, player.base_def), player.attack_cooldown
+
+
+@functools.lru_cache(maxsize=None)
+def _trait_classes(mask):
+    """Trait classes of an owned-trait mask, in registry order"""
+    return tuple(trait_class for trait_class in TRAIT_REGISTRY if mask & trait_class.bit)
+
+
+# Choice points: each yields (decision, new key, stat map) for a state; a None
+# decision passes the state through unchanged. Keys are
+# (form, level, trait mask, attack cooldown, upgrade counts).
+
+
+def _upgrade_options(key, entry):
+    """One stat upgrade per level up"""
+    form_id, level, mask, cooldown, counts = key
+    for index, stat_id in enumerate(STAT_UPGRADES):
+        new_counts = counts[:index] + (counts[index] + 1,) + counts[index + 1:]
+        yield stat_id, (form_id, level + 1, mask, cooldown, new_counts), functools.partial(_upgrade, stat_id)
+
+
+def _evolution_options(key, entry):
+    """Evolve as soon as the next stage's level is reached"""
+    form_id, level, mask, cooldown, counts = key
+    data = EVOLUTION_TREE[form_id]
+    next_stage = data["stage"] + 1
+    if not data["evolves_to"] or level < stage_level(next_stage):
+        yield None, key, None
+        return
+    for new_form in data["evolves_to"]:
+        yield new_form, (new_form, level, mask, cooldown, counts), functools.partial(_evolve, form_id, new_form)
+
+
+def _trait_options(key, entry):
+    """Any trait not owned yet"""
+    form_id, level, mask, cooldown, counts = key
+    stats = next(iter(entry["front"]))
+    offered = [trait_class for trait_class in TRAIT_REGISTRY if not mask & trait_class.bit]
+    if not offered:
+        yield None, key, None
+    for trait_class in offered:
+        new_cooldown = _add_trait(trait_class, stats, cooldown)[1]
+        yield (
+            trait_class.id,
+            (form_id, level, mask | trait_class.bit, new_cooldown, counts),
+            functools.partial(_trait_stats, trait_class, cooldown=cooldown),
+        )
+
+
+def _trait_stats(trait_class, stats, cooldown):
+    """Stat map of a trait pick"""
+    return _add_trait(trait_class, stats, cooldown)[0]
+
+
+def _new_entry():
+    """Empty state: Pareto front of stats -> path, per-stat extremes over all orderings"""
+    return {
+        "front": {},
+        "low": [math.inf] * len(STATS),
+        "high": [-math.inf] * len(STATS),
+        "low_paths": [None] * len(STATS),
+        "high_paths": [None] * len(STATS),
+        "orderings": 0,
+    }
+
+
+def _add_to_front(front, stats, path):
+    """Insert stats into a Pareto front unless something there already matches or beats it"""
+    for other in front:
+        if all(a >= b for a, b in zip(other, stats)):
+            return
+    for other in [other for other in front if all(a <= b for a, b in zip(other, stats))]:
+        del front[other]
+    front[stats] = path
+
+
+def _merge(target, entry, decision, move):
+    """Fold a parent state, moved through one choice, into a child state"""
+    if decision is None:
+        extend = lambda path: path  # noqa: E731
+        move = tuple
+    else:
+        extend = lambda path: path + (decision,)  # noqa: E731
+
+    for stats, path in entry["front"].items():
+        _add_to_front(target["front"], move(stats), extend(path))
+
+    # Each stat moves through its own non-decreasing map, so a child's
+    # extremes are the moved extremes of its parents
+    low = move(tuple(entry["low"]))
+    high = move(tuple(entry["high"]))
+    for index in range(len(STATS)):
+        if low[index] < target["low"][index]:
+            target["low"][index] = low[index]
+            target["low_paths"][index] = extend(entry["low_paths"][index])
+        if high[index] > target["high"][index]:
+            target["high"][index] = high[index]
+            target["high_paths"][index] = extend(entry["high_paths"][index])
+    target["orderings"] += entry["orderings"]
+
+
+def _step(layer, options):
+    """Apply one choice point to every state of a layer"""
+    new_layer = {}
+    for key, entry in layer.items():
+        for decision, new_key, move in options(key, entry):
+            target = new_layer.get(new_key)
+            if target is None:
+                target = new_layer[new_key] = _new_entry()
+            _merge(target, entry, decision, move)
+    return new_layer
+
+
+def _advance_level(layer, traits_every):
+    """Level every state up once: upgrade, evolve if due, trait if due"""
+    layer = _step(layer, _upgrade_options)
+    layer = _step(layer, _evolution_options)
+    level = next(iter(layer))[1]
+    if level % traits_every == 0:
+        layer = _step(layer, _trait_options)
+    return layer
+
+
+def rate(stats, cooldown, mask, enemy):
+    """(DPS, EHP, sustain) of a build against an enemy"""
+    player = _scratch_player()
+    _load(player, stats, cooldown)
+    trait_classes = _trait_classes(mask)
+    player.traits = [trait_class() for trait_class in trait_classes]
+
+    crit_chance = player.crit_chance
+    rolls = swing_rolls()
+    loss = lifesteal = 0.0
+    for is_crit, chance in ((False, 1 - crit_chance), (True, crit_chance)):
+        for variance in range(-settings.DAMAGE_VARIANCE, settings.DAMAGE_VARIANCE + 1):
+            damage = damage_for_roll(player, enemy, variance, is_crit)
+            loss += chance / rolls * max(1, damage - enemy.defense)  # Enemy.take_damage
+            lifesteal += chance / rolls * sum(trait.on_damage_dealt(damage) for trait in player.traits)
+
+    swing = swing_period(cooldown)
+    taken = contact_damage(player, enemy)
+    ehp = player.max_hp * enemy.atk / taken if taken else math.inf
+    sustain = lifesteal / swing + heal_per_second(trait_classes)
+    player.traits = []
+    return loss / swing, ehp, sustain
+
+
+def _describe(key):
+    """Build identity fields of a state key"""
+    form_id, level, mask, cooldown, counts = key
+    return {
+        "form": form_id,
+        "level": level,
+        "upgrades": dict(zip(STAT_UPGRADES, counts)),
+        "traits": [trait_class.id for trait_class in _trait_classes(mask)],
+    }
+
+
+def _explore_branch(layer, max_level, traits_every, enemy_name, floor):
+    """Pool entry point: play a branch out to max_level and rate its builds"""
+    enemy = DUEL_ENEMIES[enemy_name](0, 0, floor)
+    while next(iter(layer))[1] < max_level:
+        layer = _advance_level(layer, traits_every)
+
+    builds = []
+    spreads = []
+    states = 0
+    orderings = 0
+    for key, entry in layer.items():
+        states += 1
+        orderings += entry["orderings"]
+        cooldown, mask = key[3], key[2]
+        for stats, path in entry["front"].items():
+            dps, ehp, sustain = rate(stats, cooldown, mask, enemy)
+            builds.append({
+                **_describe(key),
+                "stats": dict(zip(STATS, stats)),
+                "dps": dps,
+                "ehp": ehp,
+                "sustain": sustain,
+                "path": list(path),
+            })
+        if entry["low"] != entry["high"]:
+            spreads.append({
+                **_describe(key),
+                "orderings": entry["orderings"],
+                "low": dict(zip(STATS, entry["low"])),
+                "high": dict(zip(STATS, entry["high"])),
+                "low_paths": dict(zip(STATS, map(list, entry["low_paths"]))),
+                "high_paths": dict(zip(STATS, map(list, entry["high_paths"]))),
+            })
+    return {"builds": builds, "spreads": spreads, "states": states, "orderings": orderings}
+
+
+def pareto(builds, metrics=("dps", "ehp", "sustain")):
+    """Builds no other build matches or beats on every metric"""
+    ordered = sorted(builds, key=lambda build: tuple(-build[metric] for metric in metrics))
+    front = []
+    for build in ordered:
+        values = [build[metric] for metric in metrics]
+        if not any(all(other[metric] >= value for metric, value in zip(metrics, values)) for other in front):
+            front.append(build)
+    return front
+
+
+def exact_stats(path):
+    """
+    Replay a path with exact arithmetic: evolutions scale each stat by the
+    ratio of multipliers without truncating (what evolve_player approximates)
+    """
+    player = _scratch_player()
+    form_id = START_FORM
+    stats = [Fraction(settings.PLAYER_START_HP), Fraction(settings.PLAYER_START_ATK), Fraction(settings.PLAYER_START_DEF)]
+    cooldown = settings.ATTACK_COOLDOWN
+    for decision in path:
+        if decision in STAT_UPGRADES:
+            stats = list(_upgrade(decision, tuple(stats)))
+        elif decision in EVOLUTION_TREE:
+            old, new = EVOLUTION_TREE[form_id], EVOLUTION_TREE[decision]
+            stats = [
+                value * Fraction(str(new[multiplier])) / Fraction(str(old[multiplier]))
+                for value, multiplier in zip(stats, MULTIPLIERS)
+            ]
+            form_id = decision
+        else:
+            _load(player, stats, cooldown)
+            TRAIT_CATALOG.get(decision)().apply(player)
+            stats = [player.max_hp, player.base_atk, player.base_def]
+            cooldown = player.attack_cooldown
+    return dict(zip(STATS, stats))
+
+
+def explore(max_level=None, traits_every=BUILD_TRAIT_EVERY, enemy_name=BUILD_REFERENCE_ENEMY,
+            floor=BUILD_REFERENCE_FLOOR, workers=None):
+    """
+    Enumerate every build up to max_level and rate it against an enemy
+    Returns {"states", "orderings", "builds", "frontier", "spreads"}: merged
+    states and choice sequences counted, every Pareto-kept build, the builds
+    no other build beats on DPS, EHP and sustain together, and the builds
+    whose stats depend on pick order, widest spread first. max_level defaults to
+    the last evolution's level.
+    """
+    if max_level is None:
+        max_level = settings.EVOLUTION_STAGE_3_LEVEL
+    root_key = (START_FORM, 1, 0, settings.ATTACK_COOLDOWN, (0,) * len(STAT_UPGRADES))
+    root = _new_entry()
+    start = (settings.PLAYER_START_HP, settings.PLAYER_START_ATK, settings.PLAYER_START_DEF)
+    root["front"][start] = ()
+    root["low"], root["high"] = list(start), list(start)
+    root["low_paths"] = [()] * len(STATS)
+    root["high_paths"] = [()] * len(STATS)
+    root["orderings"] = 1
+    layer = {root_key: root}
+
+    # The prefix up to the first evolution is shared; after it, one branch per form
+    while next(iter(layer))[1] < min(max_level, stage_level(1)):
+        layer = _advance_level(layer, traits_every)
+    branches = {}
+    for key, entry in layer.items():
+        branches.setdefault(key[0], {})[key] = entry
+    tasks = [(branch, max_level, traits_every, enemy_name, floor) for branch in branches.values()]
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+            results = pool.starmap(_explore_branch, tasks)
+    else:
+        results = [_explore_branch(*task) for task in tasks]
+
+    builds = [build for result in results for build in result["builds"]]
+    spreads = [spread for result in results for spread in result["spreads"]]
+    spreads.sort(key=lambda spread: -max(spread["high"][stat] - spread["low"][stat] for stat in STATS))
+    return {
+        "states": sum(result["states"] for result in results),
+        "orderings": sum(result["orderings"] for result in results),
+        "builds": builds,
+        "frontier": pareto(builds),
+        "spreads": spreads,
+    }
+
+
+def _format_upgrades(upgrades):
+    """hp/atk/def counts as 'a/b/c'"""
+    return "/".join(str(count) for count in upgrades.values())
+
+
+def format_report(report, top=20):
+    """Render an exploration as plain text: frontier builds, then the widest pick-order spreads"""
+    lines = [
+        f"{report['orderings']:,} choice sequences -> {report['states']:,} distinct builds,"
+        f" {len(report['builds']):,} kept after pruning, {len(report['frontier']):,} on the frontier",
+        "",
+        f"Frontier (DPS / EHP / sustain), top {top} by DPS:",
+    ]
+    for build in report["frontier"][:top]:
+        stats = "/".join(str(value) for value in build["stats"].values())
+        lines.append(
+            f"  {build['form']:<14} {_format_upgrades(build['upgrades']):>7}  {stats:>12}"
+            f"  dps {build['dps']:7.2f}  ehp {build['ehp']:8.1f}  sustain {build['sustain']:5.2f}"
+            f"  {'+'.join(build['traits']) or '-'}"
+        )
+        lines.append(f"      {' > '.join(build['path'])}")
+
+    lines.append("")
+    lines.append(f"Pick-order spreads ({len(report['spreads']):,} builds whose stats depend on order), top {top}:")
+    for spread in report["spreads"][:top]:
+        stat = max(STATS, key=lambda name: spread["high"][name] - spread["low"][name])
+        low, high = spread["low"][stat], spread["high"][stat]
+        low_exact = exact_stats(spread["low_paths"][stat])[stat]
+        high_exact = exact_stats(spread["high_paths"][stat])[stat]
+        lines.append(
+            f"  {spread['form']:<14} {_format_upgrades(spread['upgrades']):>7}"
+            f"  {'+'.join(spread['traits']) or '-'}: {stat} {low}..{high}"
+            f" over {spread['orderings']:,} orderings"
+            f" (rounding {low - float(low_exact):+.2f} / {high - float(high_exact):+.2f})"
+        )
+        lines.append(f"      low:  {' > '.join(spread['low_paths'][stat])}")
+        lines.append(f"      high: {' > '.join(spread['high_paths'][stat])}")
+    return "\n".join(lines)
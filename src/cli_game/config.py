@@ -7,6 +7,9 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 SCREEN_TITLE = "Monster Evolution RPG"
 FPS = 60
+IDLE_FPS = 20  # Update/draw rate while a menu is open
+UNFOCUSED_FPS = 5  # Draw rate while the window is not focused
+MAX_STEPS_PER_UPDATE = 5  # Simulation steps one update may catch up on before dropping time
 
 # Tile settings
 TILE_SIZE = 32
@@ -28,6 +31,8 @@ COLOR_TEXT_DARK = (150, 150, 150)
 COLOR_HP_FILL = (50, 200, 50)  # Green HP bar fill
 COLOR_HP_EMPTY = (60, 60, 60)  # Gray HP bar background
 COLOR_ATTACK_EFFECT = (255, 220, 100, 200)  # Yellow-ish attack flash
+COLOR_PROJECTILE_PLAYER = (120, 200, 255)
+COLOR_PROJECTILE_ENEMY = (200, 120, 255)
 
 # Player settings
 PLAYER_SPEED = 3
@@ -38,11 +43,75 @@ PLAYER_START_DEF = 5
 # Combat settings
 BASE_CRIT_CHANCE = 0.1
 BASE_CRIT_MULTIPLIER = 1.5
+DAMAGE_VARIANCE = 2  # Attack damage rolls atk +/- this much
 ATTACK_RANGE = TILE_SIZE * 1.5  # About 48 pixels - allows hitting before full overlap
 ATTACK_COOLDOWN = 0.35  # Faster attacks for better combat feel
 INVINCIBILITY_DURATION = 0.6  # Invincibility window after taking damage
 CONTACT_DAMAGE_COOLDOWN = 0.5  # Cooldown between contact damage ticks
 
+# Projectile settings
+PROJECTILE_CAPACITY = 4096  # Fixed pool size, never grows during play
+PROJECTILE_RADIUS = 6
+ENEMY_PROJECTILE_SPEED = 220  # Pixels per second
+
+# Particle settings
+PARTICLE_CAPACITY = 4096  # Fixed pool size, never grows during play
+
+# Zoom settings
+ZOOM_MIN = 0.25
+ZOOM_MAX = 2.0
+ZOOM_STEP = 1.25  # Zoom factor per key press or wheel notch
+LOD_ZOOM_THRESHOLD = 0.6  # Below this zoom the world is drawn in low detail
+LOD_POINT_SIZE = 4  # Screen pixels per enemy point in low detail
+
+# Minimap settings
+MINIMAP_SCALE = 4  # Screen pixels per tile
+MINIMAP_REVEAL_RADIUS = 5  # Tiles around the player revealed on the minimap
+
+# Culling settings
+CULL_CHUNK_SIZE = TILE_SIZE * 8  # Walls are drawn in chunks of this many pixels square
+CULL_MARGIN = TILE_SIZE * 2  # Extra world pixels drawn around the view
+
+# Co-op settings
+PARTNER_TINT = (255, 210, 150)  # Tint that tells the co-op partner apart from the player
+COOP_PORT = 47800
+COOP_SNAPSHOT_RATE = 20  # Snapshots sent per second
+COOP_INTERP_DELAY = 0.1  # Seconds clients render behind the newest snapshot
+COOP_BASELINES = 64  # Sent snapshots kept as possible delta baselines
+COOP_MAX_MESSAGE = 1 << 20  # Largest frame accepted; a longer (or empty) one closes the connection
+
+# Shared state settings
+SHARED_STATE_NAME = "cli_game_state"  # Shared memory block external tools attach to
+SHARED_STATE_SLOTS = 8  # Snapshots kept in the ring
+SHARED_STATE_MAX_PLAYERS = 2
+SHARED_STATE_MAX_ENEMIES = 128  # Enemies past this are left out of a snapshot
+
+# Replay settings
+REPLAY_DIR = "replays"  # Where each session's replay is saved
+REPLAY_KEYFRAME_INTERVAL = 10  # Seconds of game time between full-state keyframes
+REPLAY_SEEK_STEP = 10  # Seconds jumped by the replay seek keys
+
+# Duel table settings
+DUEL_COUNT = 64  # Duels simulated per build/enemy/floor row
+DUEL_FLOORS = 10  # Floors covered by the tables
+DUEL_MAX_TRAITS = 2  # Largest trait set tabled
+DUEL_MAX_SECONDS = 60  # Duels still undecided after this long count as never (inf)
+DUEL_CHUNK_SIZE = 1 << 20  # Duels simulated per NumPy batch
+DUEL_CACHE_DIR = ".duel_cache"  # Where tables are cached, keyed by config hash
+
+# Build explorer settings
+BUILD_TRAIT_EVERY = 2  # Levels between trait picks (roughly one cleared floor each)
+BUILD_REFERENCE_ENEMY = "OrcWarrior"  # Enemy builds are rated against
+BUILD_REFERENCE_FLOOR = 5
+
+# Session host settings
+HOST_SLICE = 0.005  # Seconds of stepping between yields to the event loop
+HOST_LATENCY_WINDOW = 600  # Step latency samples kept per session
+HOST_OVERLOAD_TICKS = 30  # Overrunning ticks in a row before new sessions are held back
+
+# Timer settings
+TIMER_RESOLUTION = 1 / 120  # Seconds per timer wheel tick
+
 # Camera shake settings
 CAMERA_SHAKE_DURATION = 0.15  # How long the shake lasts
 CAMERA_SHAKE_MAGNITUDE = 6.0  # How intense the shake is
@@ -51,6 +120,11 @@ CAMERA_SHAKE_MAGNITUDE = 6.0  # How intense the shake is
 ATTACK_EFFECT_DURATION = 0.15  # How long attack effect shows
 ATTACK_EFFECT_SIZE = 40  # Size of attack effect circle
 
+# Damage number settings
+DAMAGE_NUMBER_CAPACITY = 64  # Oldest number is recycled when all are in use
+DAMAGE_NUMBER_DURATION = 0.8  # Seconds a number stays on screen
+DAMAGE_NUMBER_RISE = 30  # Pixels a number floats up over its lifetime
+
 # Progression settings
 XP_PER_LEVEL = 100
 XP_LEVEL_MULTIPLIER = 1.3
@@ -65,3 +139,49 @@ ENEMY_SPEED_BASE = 1.5
 
 # Floor progression
 FLOOR_SCALING_FACTOR = 1.15
+
+# Sweep settings
+SWEEP_RUNS = 20  # Runs per config variant (the same seeds for every variant)
+SWEEP_SAMPLES = 100  # Variants drawn by a random search
+
+
+class Settings:
+    """
+    Gameplay tunables, read at run time so a sweep can override them per run
+    The constants above are the defaults; game code reads settings.NAME for
+    anything listed in TUNABLES instead of the star-imported constant.
+    """
+
+    TUNABLES = (
+        "PLAYER_SPEED", "PLAYER_START_HP", "PLAYER_START_ATK", "PLAYER_START_DEF",
+        "BASE_CRIT_CHANCE", "BASE_CRIT_MULTIPLIER", "DAMAGE_VARIANCE",
+        "ATTACK_RANGE", "ATTACK_COOLDOWN", "INVINCIBILITY_DURATION", "CONTACT_DAMAGE_COOLDOWN",
+        "ENEMY_PROJECTILE_SPEED",
+        "XP_PER_LEVEL", "XP_LEVEL_MULTIPLIER",
+        "EVOLUTION_STAGE_1_LEVEL", "EVOLUTION_STAGE_2_LEVEL", "EVOLUTION_STAGE_3_LEVEL",
+        "ENEMY_SPAWN_COUNT", "ENEMY_DETECTION_RANGE", "ENEMY_SPEED_BASE",
+        "FLOOR_SCALING_FACTOR",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Go back to the defaults"""
+        for name in self.TUNABLES:
+            setattr(self, name, globals()[name])
+
+    def override(self, **values):
+        """Replace some tunables (unknown names raise ValueError)"""
+        unknown = sorted(set(values) - set(self.TUNABLES))
+        if unknown:
+            raise ValueError(f"Not tunable: {', '.join(unknown)}")
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def changed(self):
+        """Tunables that differ from their defaults"""
+        return {name: getattr(self, name) for name in self.TUNABLES if getattr(self, name) != globals()[name]}
+
+
+settings = Settings()
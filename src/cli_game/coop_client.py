@@ -0,0 +1,136 @@
+"""
+Co-op client window
+
+Joins a host started with --coop-host and plays its partner seat. The window
+holds no simulation: it draws the interpolated view of the host's snapshots
+(walls baked from the floor grid, enemies, players and projectiles as shapes)
+and sends key presses to the host as partner commands. Menus stay with the
+host; the client shows the host's state while it picks.
+"""
+
+import arcade
+from .config import *
+from .netplay import CoopClient, EFFECT_ATTACK, EFFECT_CAST, EFFECT_CRIT
+from .simulation import GameState, CMD_MOVE, CMD_ATTACK, CMD_SKILL
+from .systems import EVOLUTION_TREE
+from .systems.projectiles import OWNER_ENEMY
+from .ui import bake_wall_texture, draw_wall_texture
+
+EFFECT_DURATION = 0.15  # Seconds a swing, cast or hit flash stays on screen
+EFFECT_COLORS = {
+    EFFECT_ATTACK: COLOR_ATTACK_EFFECT,
+    EFFECT_CAST: COLOR_PROJECTILE_PLAYER,
+    EFFECT_CRIT: (255, 220, 60),
+}
+MOVE_KEYS = {
+    arcade.key.W: (0, 1), arcade.key.UP: (0, 1),
+    arcade.key.S: (0, -1), arcade.key.DOWN: (0, -1),
+    arcade.key.A: (-1, 0), arcade.key.LEFT: (-1, 0),
+    arcade.key.D: (1, 0), arcade.key.RIGHT: (1, 0),
+}
+
+
+class CoopClientWindow(arcade.Window):
+    """Renders a remote co-op session and sends the partner's input"""
+
+    def __init__(self, address="127.0.0.1", port=COOP_PORT):
+        super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, f"{SCREEN_TITLE} - Co-op partner")
+        arcade.set_background_color(COLOR_BACKGROUND)
+        self.client = CoopClient(address, port)
+        self.world_camera = arcade.camera.Camera2D()
+        self.ui_camera = arcade.camera.Camera2D()
+
+        self.shown = None  # Interpolated view of the host's state
+        self.floor = None
+        self.wall_texture = None
+        self.held = set()  # Movement keys held down
+        self.effects = []  # (kind, x, y, expiry time)
+        self.clock = 0.0
+        self.status = arcade.Text("", 10, SCREEN_HEIGHT - 24, COLOR_TEXT, 12)
+
+    def on_key_press(self, key, modifiers):
+        """Movement, attack and skill keys become partner commands"""
+        if key in MOVE_KEYS:
+            self.held.add(key)
+            self._send_movement()
+        elif key == arcade.key.SPACE:
+            self.client.send([(CMD_ATTACK,)])
+        elif key == arcade.key.Q:
+            self.client.send([(CMD_SKILL, 0)])
+        elif key == arcade.key.E:
+            self.client.send([(CMD_SKILL, 1)])
+
+    def on_key_release(self, key, modifiers):
+        """Releasing a movement key changes the held direction"""
+        if key in self.held:
+            self.held.discard(key)
+            self._send_movement()
+
+    def _send_movement(self):
+        """Send the direction of the movement keys held down"""
+        move_x = max(-1, min(1, sum(MOVE_KEYS[key][0] for key in self.held)))
+        move_y = max(-1, min(1, sum(MOVE_KEYS[key][1] for key in self.held)))
+        self.client.send([(CMD_MOVE, move_x, move_y)])
+
+    def on_update(self, delta_time):
+        """Exchange messages with the host and advance the view"""
+        self.clock += delta_time
+        self.client.poll()
+        if not self.client.connected:
+            arcade.close_window()
+            return
+
+        if self.client.floor != self.floor and self.client.wall_grid is not None:
+            self.floor = self.client.floor
+            self.wall_texture = bake_wall_texture(self.client.wall_grid)
+        for kind, x, y, _ in self.client.take_effects():
+            self.effects.append((kind, x, y, self.clock + EFFECT_DURATION))
+        self.effects = [effect for effect in self.effects if effect[3] > self.clock]
+
+        self.shown = self.client.view()
+        if self.shown:
+            me = self.shown["players"].get(self.client.slot)
+            if me:
+                self.world_camera.position = (me["x"], me["y"])
+            self._update_status()
+
+    def _update_status(self):
+        """Floor, host state and network counters"""
+        stats = self.client.stats()
+        rtt = f"{stats['rtt_ms']:.0f}ms" if stats["rtt_ms"] is not None else "-"
+        state = "" if self.shown["state"] == GameState.PLAYING else f"  (host: {self.shown['state']})"
+        me = self.shown["players"].get(self.client.slot)
+        hp = f"  HP {me['hp']}/{me['max_hp']}" if me else ""
+        self.status.text = (
+            f"Floor {self.shown['floor']}{hp}  down {stats['received_per_second'] / 1024:.1f} KB/s"
+            f"  up {stats['sent_per_second'] / 1024:.1f} KB/s  RTT {rtt}{state}"
+        )
+
+    def on_draw(self):
+        """Draw the interpolated world and the status line"""
+        self.clear()
+        if not self.shown:
+            return
+
+        self.world_camera.use()
+        if self.wall_texture:
+            draw_wall_texture(self.wall_texture, self.client.wall_grid)
+        for enemy in self.shown["enemies"].values():
+            arcade.draw_circle_filled(enemy["x"], enemy["y"], TILE_SIZE * 0.4, COLOR_ENEMY)
+        for slot, player in self.shown["players"].items():
+            if player["alive"]:
+                color = PARTNER_TINT if slot else EVOLUTION_TREE[player["form"]]["color"]
+                arcade.draw_circle_filled(player["x"], player["y"], TILE_SIZE / 2, color)
+        for owner, x, y in self.shown["projectiles"]:
+            color = COLOR_PROJECTILE_ENEMY if owner == OWNER_ENEMY else COLOR_PROJECTILE_PLAYER
+            arcade.draw_circle_filled(x, y, 4, color)
+        for kind, x, y, _ in self.effects:
+            arcade.draw_circle_outline(x, y, ATTACK_EFFECT_SIZE / 2, EFFECT_COLORS.get(kind, COLOR_HP_BAR), 2)
+
+        self.ui_camera.use()
+        self.status.draw()
+
+    def on_close(self):
+        """Leave the session"""
+        self.client.close()
+        super().on_close()
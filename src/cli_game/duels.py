@@ -0,0 +1,523 @@
+"""
+Vectorized duel tables
+
+A duel is one player build standing in contact with one enemy: the player
+swings on cooldown, the enemy deals contact damage, timed trait heals tick.
+Duels are simulated as NumPy arrays, one element per duel, and each tick that
+has an event updates every duel at once. Hit outcomes come from the game's own
+code (damage_for_roll, defense, trait hooks), enumerated once per row into
+small tables, and event timing is read off the real cooldown and timer logic,
+so the tables follow the game's melee rules tick for tick.
+
+Each row is a (form, stat-upgrade mix, trait set, enemy, floor) and records:
+- ttk: seconds until the player kills the enemy
+- ttd: seconds until contact damage kills the player (the player keeps
+  swinging, lifesteal included, as if the enemy never died)
+- win_rate: share of duels where the kill lands no later than the death
+Duels still undecided after DUEL_MAX_SECONDS count as inf. Tables are cached
+in DUEL_CACHE_DIR, keyed by a hash of the config and the combat code.
+"""
+
+import functools
+import hashlib
+import inspect
+import itertools
+import json
+import math
+import os
+import sys
+import numpy as np
+from . import config
+from .config import *
+from .entities import enemies as enemies_module, player as player_module
+from .entities.enemies import Slime, Goblin, OrcWarrior
+from .entities.player import MonsterPlayer
+from .simulation import STAT_UPGRADES, SIM_TICK
+from .systems import EVOLUTION_TREE, TRAIT_REGISTRY, TimerWheel, evolve_player
+from .systems import combat, evolution, traits as traits_module
+from .systems.combat import damage_for_roll
+
+DUEL_ENEMIES = {
+    "Slime": Slime,
+    "Goblin": Goblin,
+    "OrcWarrior": OrcWarrior,
+}
+
+
+
+def stage_level(stage):
+    """Level a form of a stage is reached at (inf past the last stage)"""
+    levels = (1, settings.EVOLUTION_STAGE_1_LEVEL, settings.EVOLUTION_STAGE_2_LEVEL, settings.EVOLUTION_STAGE_3_LEVEL)
+    return levels[stage] if stage < len(levels) else math.inf
+
+
+def swing_rolls():
+    """Variance outcomes per swing (twice as many outcomes counting crits)"""
+    return 2 * settings.DAMAGE_VARIANCE + 1
+
+
+def form_path(form_id):
+    """Forms from the starting form to form_id along the evolution tree"""
+    path = [form_id]
+    while EVOLUTION_TREE[path[-1]]["stage"] > 0:
+        path.append(next(
+            parent for parent, data in EVOLUTION_TREE.items() if path[-1] in data["evolves_to"]
+        ))
+    return path[::-1]
+
+
+def upgrades_for(form_id):
+    """Stat upgrades taken by the time a form is reached (one per level up)"""
+    return stage_level(EVOLUTION_TREE[form_id]["stage"]) - 1
+
+
+def stat_mixes(total):
+    """Every split of total stat upgrades, as counts in STAT_UPGRADES order"""
+    stat_ids = list(STAT_UPGRADES)
+    return [
+        tuple(picks.count(stat_id) for stat_id in stat_ids)
+        for picks in itertools.combinations_with_replacement(stat_ids, total)
+    ]
+
+
+def build_player(form_id, mix, trait_classes=()):
+    """
+    Build a player the way a run would: one upgrade per level, taken
+    round-robin from the mix, evolving along the form's path as soon as each
+    stage's level is reached, then the traits
+    """
+    player = MonsterPlayer(0, 0)
+    stat_ids = list(STAT_UPGRADES)
+    remaining = list(mix)
+    path = form_path(form_id)[1:]
+    turn = 0
+
+    while True:
+        while path and player.level >= stage_level(EVOLUTION_TREE[path[0]]["stage"]):
+            evolve_player(player, path.pop(0))
+        if not any(remaining):
+            break
+
+        while not remaining[turn % len(stat_ids)]:
+            turn += 1
+        index = turn % len(stat_ids)
+        turn += 1
+        remaining[index] -= 1
+
+        player.level += 1
+        for attribute, amount in STAT_UPGRADES[stat_ids[index]].items():
+            setattr(player, attribute, getattr(player, attribute) + amount)
+
+    if path:
+        raise ValueError(f"{sum(mix)} upgrades don't reach level {stage_level(EVOLUTION_TREE[form_id]['stage'])}")
+
+    for trait_class in trait_classes:
+        player.add_trait(trait_class())
+    return player
+
+
+def iter_builds(max_traits=DUEL_MAX_TRAITS):
+    """Every (form, stat mix, trait classes) build the tables cover"""
+    trait_sets = [
+        combo for size in range(max_traits + 1) for combo in itertools.combinations(TRAIT_REGISTRY, size)
+    ]
+    for form_id in EVOLUTION_TREE:
+        for mix in stat_mixes(upgrades_for(form_id)):
+            for trait_classes in trait_sets:
+                yield form_id, mix, trait_classes
+
+
+def _attack_ticks(cooldown, max_ticks):
+    """Ticks a held attack fires on, on the simulation's float clock (see MonsterPlayer.can_attack)"""
+    ticks = []
+    now = 0.0
+    last_attack = -math.inf
+    for tick in range(max_ticks):
+        if now - last_attack >= cooldown:
+            last_attack = now
+            ticks.append(tick)
+        now += SIM_TICK
+    return ticks
+
+
+def _contact_ticks(max_ticks, invincibility, rearm_delay):
+    """Ticks contact damage lands on while an enemy stays in touch (rearm timer vs invincibility)"""
+    timers = TimerWheel()
+    ready = [True]
+    invincible_until = 0.0
+    ticks = []
+
+    def rearm():
+        ready[0] = True
+
+    for tick in range(max_ticks):
+        timers.advance(SIM_TICK)
+        if ready[0]:
+            if timers.time_until(invincible_until) <= 0:
+                ticks.append(tick)
+                invincible_until = timers.now + invincibility
+            ready[0] = False
+            timers.schedule(rearm_delay, rearm)
+    return ticks
+
+
+def _heal_ticks(trait_classes, max_ticks):
+    """(tick, amount) of the timed heals a trait set schedules, read off a player's own timers"""
+    player = MonsterPlayer(0, 0)
+    for trait_class in trait_classes:
+        player.add_trait(trait_class())
+    player.hp = 0
+    player.max_hp = math.inf  # Measure heals uncapped
+
+    heals = []
+    for tick in range(max_ticks):
+        before = player.hp
+        player.timers.advance(SIM_TICK)
+        if player.hp != before:
+            heals.append((tick, player.hp - before))
+    return tuple(heals)
+
+
+def _swing_outcomes(player, enemy):
+    """
+    HP the enemy loses and the player steals back per swing outcome
+    (variance roll, then crit), from damage_for_roll's damage
+    """
+    losses = []
+    lifesteal = []
+    for is_crit in (False, True):
+        for variance in range(-settings.DAMAGE_VARIANCE, settings.DAMAGE_VARIANCE + 1):
+            damage = damage_for_roll(player, enemy, variance, is_crit)
+            losses.append(max(1, damage - enemy.defense))  # Enemy.take_damage
+            lifesteal.append(sum(trait.on_damage_dealt(damage) for trait in player.traits))
+    return losses, lifesteal
+
+
+def contact_damage(player, enemy):
+    """HP the player loses per contact hit (MonsterPlayer.take_damage without invincibility)"""
+    damage = max(1, enemy.atk - player.defense)
+    for trait in player.traits:
+        damage = trait.modify_incoming_damage(damage)
+    return damage
+
+
+@functools.lru_cache(maxsize=None)
+def swing_period(cooldown):
+    """Average seconds between swings of a held attack, on the simulation clock"""
+    ticks = _attack_ticks(cooldown, round(DUEL_MAX_SECONDS / SIM_TICK))
+    return (ticks[-1] - ticks[0]) / (len(ticks) - 1) * SIM_TICK
+
+
+def contact_period():
+    """Average seconds between contact hits from an enemy that stays in touch"""
+    return _contact_period(settings.INVINCIBILITY_DURATION, settings.CONTACT_DAMAGE_COOLDOWN)
+
+
+@functools.lru_cache(maxsize=None)
+def _contact_period(invincibility, rearm_delay):
+    """contact_period for given timings"""
+    ticks = _contact_ticks(round(DUEL_MAX_SECONDS / SIM_TICK), invincibility, rearm_delay)
+    return (ticks[-1] - ticks[0]) / (len(ticks) - 1) * SIM_TICK
+
+
+@functools.lru_cache(maxsize=None)
+def heal_per_second(trait_classes):
+    """Average HP per second the timed heals of a trait set restore"""
+    heals = _heal_ticks(trait_classes, round(DUEL_MAX_SECONDS / SIM_TICK))
+    return sum(amount for tick, amount in heals) / DUEL_MAX_SECONDS
+
+
+def _percentile(sorted_rows, fraction):
+    """Nearest-rank percentile of each already sorted row"""
+    width = sorted_rows.shape[1]
+    return sorted_rows[:, min(width - 1, max(0, math.ceil(fraction * width) - 1))]
+
+
+def build_table(duels=DUEL_COUNT, floors=DUEL_FLOORS, max_traits=DUEL_MAX_TRAITS, seed=0,
+                max_seconds=DUEL_MAX_SECONDS, progress=None):
+    """
+    Simulate duels for every build against every enemy on every floor
+    Returns the table as a dict of equal-length column arrays.
+    progress is called with (duels done, total duels) after each batch.
+    """
+    max_ticks = round(max_seconds / SIM_TICK)
+    foes = [
+        (name, floor, enemy_class(0, 0, floor))
+        for floor in range(1, floors + 1)
+        for name, enemy_class in DUEL_ENEMIES.items()
+    ]
+    stat_ids = list(STAT_UPGRADES)
+
+    columns = {"form": [], "traits": [], "enemy": [], "floor": []}
+    for stat_id in stat_ids:
+        columns[f"{stat_id}_ups"] = []
+    enemy_hp, player_hp, max_hp, contact, crit_chance = [], [], [], [], []
+    losses, lifesteal = [], []
+    groups = {}  # (attack cooldown, timed heals) -> row indices sharing that timeline
+
+    # Row parameters (swing outcomes only depend on atk, defense and traits, so they're shared)
+    outcome_cache = {}
+    heal_cache = {}
+    for form_id, mix, trait_classes in iter_builds(max_traits):
+        player = build_player(form_id, mix, trait_classes)
+        trait_names = "+".join(trait_class.id for trait_class in trait_classes)
+        if trait_classes not in heal_cache:
+            heal_cache[trait_classes] = _heal_ticks(trait_classes, max_ticks)
+        timeline = groups.setdefault((player.attack_cooldown, heal_cache[trait_classes]), [])
+
+        for name, floor, enemy in foes:
+            key = (trait_classes, player.atk, enemy.defense)
+            if key not in outcome_cache:
+                outcome_cache[key] = _swing_outcomes(player, enemy)
+            row_losses, row_lifesteal = outcome_cache[key]
+
+            timeline.append(len(enemy_hp))
+            columns["form"].append(form_id)
+            columns["traits"].append(trait_names)
+            columns["enemy"].append(name)
+            columns["floor"].append(floor)
+            for stat_id, count in zip(stat_ids, mix):
+                columns[f"{stat_id}_ups"].append(count)
+            enemy_hp.append(enemy.hp)
+            player_hp.append(player.hp)
+            max_hp.append(player.max_hp)
+            contact.append(contact_damage(player, enemy))
+            crit_chance.append(player.crit_chance)
+            losses.append(row_losses)
+            lifesteal.append(row_lifesteal)
+
+    params = {
+        "enemy_hp": np.array(enemy_hp, dtype=np.int32),
+        "hp": np.array(player_hp, dtype=np.int32),
+        "max_hp": np.array(max_hp, dtype=np.int32),
+        "contact": np.array(contact, dtype=np.int32),
+        "crit_chance": np.array(crit_chance, dtype=np.float64),
+        "losses": np.array(losses, dtype=np.int32).ravel(),
+        "lifesteal": np.array(lifesteal, dtype=np.int32).ravel(),
+    }
+
+    rows = len(enemy_hp)
+    ttk = np.full((rows, duels), np.inf, dtype=np.float32)
+    ttd = np.full((rows, duels), np.inf, dtype=np.float32)
+    row_ttd = np.full(rows, np.inf, dtype=np.float32)
+    outcomes = 2 * swing_rolls()
+    steals = params["lifesteal"].reshape(rows, outcomes).any(axis=1)
+    best_swing = params["losses"].reshape(rows, outcomes).max(axis=1)
+    rng = np.random.default_rng(seed)
+    contact_ticks = _contact_ticks(max_ticks, settings.INVINCIBILITY_DURATION, settings.CONTACT_DAMAGE_COOLDOWN)
+    rows_per_batch = max(1, DUEL_CHUNK_SIZE // duels)
+    done = 0
+
+    for (cooldown, heals), row_ids in groups.items():
+        attack_ticks = _attack_ticks(cooldown, max_ticks)
+        events = _timeline(attack_ticks, heals, contact_ticks)
+        row_ids = np.array(row_ids)
+
+        # Deaths without lifesteal don't depend on the swings: play them once per row
+        _run_duels(row_ids, 1, params, events, rng, None, row_ttd)
+        ttd[row_ids] = row_ttd[row_ids, None]
+
+        # Lifesteal ties survival to the swings, so those duels play out whole,
+        # unless the player outlasts the cap without it (lifesteal only adds HP)
+        joint = steals[row_ids] & np.isfinite(row_ttd[row_ids])
+        # Rows that can't kill within the cap even on best rolls stay inf
+        can_kill = best_swing[row_ids] * len(attack_ticks) >= params["enemy_hp"][row_ids]
+
+        for batch_rows, duel_ttd in [(row_ids[~joint & can_kill], None), (row_ids[joint], ttd.ravel())]:
+            for start in range(0, len(batch_rows), rows_per_batch):
+                batch = batch_rows[start:start + rows_per_batch]
+                _run_duels(batch, duels, params, events, rng, ttk.ravel(), duel_ttd)
+                done += len(batch) * duels
+                if progress:
+                    progress(done, rows * duels)
+        done += np.count_nonzero(~joint & ~can_kill) * duels
+        if progress:
+            progress(done, rows * duels)
+
+    table = {name: np.array(values) for name, values in columns.items()}
+    for name, times in (("ttk", ttk), ("ttd", ttd)):
+        ordered = np.sort(times, axis=1)
+        table[f"{name}_mean"] = times.mean(axis=1)
+        table[f"{name}_p50"] = _percentile(ordered, 0.5)
+        table[f"{name}_p90"] = _percentile(ordered, 0.9)
+    table["win_rate"] = (np.isfinite(ttk) & (ttk <= ttd)).mean(axis=1).astype(np.float32)
+    return table
+
+
+def _timeline(attack_ticks, heals, contact_ticks):
+    """Merge event ticks into (seconds, swings, heal amount, contact hit) in tick order"""
+    events = {}
+    for tick in attack_ticks:
+        events.setdefault(tick, [False, 0, False])[0] = True
+    for tick, amount in heals:
+        events.setdefault(tick, [False, 0, False])[1] += amount
+    for tick in contact_ticks:
+        events.setdefault(tick, [False, 0, False])[2] = True
+    return [(tick * SIM_TICK, *events[tick]) for tick in sorted(events)]
+
+
+def _run_duels(row_ids, duels, params, events, rng, ttk, ttd):
+    """
+    Play duels of the given rows, all on one event timeline, writing each
+    duel's ttk/ttd into the flat result arrays (None skips swings or deaths).
+    Within a tick the order is the simulation's: swing, timers (heals),
+    contact damage. Finished duels are compacted out as they pile up.
+    """
+    if not len(row_ids):
+        return
+    swings = ttk is not None
+    deaths = ttd is not None
+    if not swings:
+        events = [event for event in events if event[2] or event[3]]
+    elif not deaths:
+        events = [event for event in events if event[1]]
+
+    rolls = swing_rolls()
+    outcomes = 2 * rolls
+    duel_row = np.repeat(row_ids, duels)
+    state = {
+        "index": (duel_row * duels + np.tile(np.arange(duels), len(row_ids))),
+        "outcome_base": duel_row * outcomes,
+        "enemy_hp": params["enemy_hp"][duel_row],
+        "hp": params["hp"][duel_row],
+        "max_hp": params["max_hp"][duel_row],
+        "contact": params["contact"][duel_row],
+        "crit_chance": params["crit_chance"][duel_row],
+        "killed": np.full(len(duel_row), not swings),
+        "dead": np.full(len(duel_row), not deaths),
+    }
+    losses = params["losses"]
+    lifesteal = params["lifesteal"]
+    has_lifesteal = bool(lifesteal[(row_ids[:, None] * outcomes + np.arange(outcomes)).ravel()].any())
+    finished = 0
+
+    for seconds, swing, heal, contact_hit in events:
+        n = len(state["index"])
+        hp = state["hp"]
+
+        if swing and swings:
+            outcome = rng.integers(0, rolls, n, dtype=np.int32)
+            outcome += (rng.random(n) < state["crit_chance"]) * rolls
+            outcome += state["outcome_base"]
+            enemy_hp = state["enemy_hp"]
+            enemy_hp -= losses[outcome]
+            if has_lifesteal:
+                hp += lifesteal[outcome]
+                np.minimum(hp, state["max_hp"], out=hp)
+
+            newly = (enemy_hp <= 0) & ~state["killed"]
+            if newly.any():
+                ttk[state["index"][newly]] = seconds
+                state["killed"] |= newly
+                finished += np.count_nonzero(newly & state["dead"])
+
+        if heal and deaths:
+            hp += heal
+            np.minimum(hp, state["max_hp"], out=hp)
+
+        if contact_hit and deaths:
+            hp -= state["contact"]
+            newly = (hp <= 0) & ~state["dead"]
+            if newly.any():
+                ttd[state["index"][newly]] = seconds
+                state["dead"] |= newly
+                finished += np.count_nonzero(newly & state["killed"])
+
+        if finished * 8 > n:
+            keep = ~(state["killed"] & state["dead"])
+            state = {name: values[keep] for name, values in state.items()}
+            finished = 0
+            if not len(state["index"]):
+                return
+
+
+def config_hash(params):
+    """Hash of everything a table depends on: its parameters, the config with its overrides and the combat code"""
+    constants = {name: getattr(config, name) for name in dir(config) if name.isupper()}
+    sources = [
+        inspect.getsource(module)
+        for module in (combat, evolution, traits_module, enemies_module, player_module, sys.modules[__name__])
+    ]
+    payload = json.dumps([params, constants, settings.changed(), EVOLUTION_TREE, STAT_UPGRADES, sources], sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def load_table(duels=DUEL_COUNT, floors=DUEL_FLOORS, max_traits=DUEL_MAX_TRAITS, seed=0,
+               max_seconds=DUEL_MAX_SECONDS, cache_dir=DUEL_CACHE_DIR, rebuild=False, progress=None):
+    """Get the duel table from the cache, building and caching it on a miss"""
+    params = {"duels": duels, "floors": floors, "max_traits": max_traits, "seed": seed, "max_seconds": max_seconds}
+    path = os.path.join(cache_dir, f"duels-{config_hash(params)}.npz")
+    if not rebuild and os.path.exists(path):
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+
+    table = build_table(progress=progress, **params)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        np.savez_compressed(f, **table)
+    os.replace(path + ".tmp", path)
+    return table
+
+
+def select_rows(table, form=None, enemy=None, floor=None, traits=None):
+    """Boolean mask of table rows matching the given column values"""
+    mask = np.ones(len(table["form"]), dtype=bool)
+    for name, value in (("form", form), ("enemy", enemy), ("floor", floor), ("traits", traits)):
+        if value is not None:
+            mask &= table[name] == value
+    return mask
+
+
+def format_table(table, mask=None, sort="ttk_mean", limit=40):
+    """Render (selected) rows as plain text, sorted by a column"""
+    rows = np.flatnonzero(mask) if mask is not None else np.arange(len(table["form"]))
+    rows = rows[np.argsort(table[sort][rows], kind="stable")][:limit]
+    stat_columns = [f"{stat_id}_ups" for stat_id in STAT_UPGRADES]
+
+    lines = [
+        f"{'form':<14} {'/'.join(STAT_UPGRADES):>10} {'traits':<32} {'enemy':<10} {'floor':>5}"
+        f"  {'ttk mean':>8} {'p50':>6} {'p90':>6}  {'ttd mean':>8} {'p50':>6} {'p90':>6}  {'win':>6}"
+    ]
+    for row in rows:
+        mix = "/".join(str(table[column][row]) for column in stat_columns)
+        lines.append(
+            f"{table['form'][row]:<14} {mix:>10} {table['traits'][row] or '-':<32} {table['enemy'][row]:<10}"
+            f" {table['floor'][row]:>5}  {table['ttk_mean'][row]:8.2f} {table['ttk_p50'][row]:6.2f}"
+            f" {table['ttk_p90'][row]:6.2f}  {table['ttd_mean'][row]:8.2f} {table['ttd_p50'][row]:6.2f}"
+            f" {table['ttd_p90'][row]:6.2f}  {table['win_rate'][row]:6.1%}"
+        )
+    return "\n".join(lines)
+
+
+def play_duel(form_id, mix, trait_classes, enemy_name, floor, max_seconds=DUEL_MAX_SECONDS):
+    """
+    Play one duel the slow way, a Python loop over ticks driving the game
+    objects themselves (the reference the tables are checked against)
+    Returns (ttk, ttd) in seconds; uses the shared random module.
+    """
+    player = build_player(form_id, mix, trait_classes)
+    enemy = DUEL_ENEMIES[enemy_name](0, 0, floor)
+    ready = [True]
+    ttk = ttd = math.inf
+
+    def rearm():
+        ready[0] = True
+
+    for tick in range(round(max_seconds / SIM_TICK)):
+        damage = player.perform_attack(enemy)
+        if damage:
+            enemy.take_damage(damage)
+
+        player.timers.advance(SIM_TICK)
+        if ready[0]:
+            player.take_damage(enemy.atk)
+            ready[0] = False
+            player.timers.schedule(settings.CONTACT_DAMAGE_COOLDOWN, rearm)
+
+        if ttk == math.inf and enemy.hp <= 0:
+            ttk = tick * SIM_TICK
+        if ttd == math.inf and player.hp <= 0:
+            ttd = tick * SIM_TICK
+        if ttk < math.inf and ttd < math.inf:
+            break
+    return ttk, ttd
@@ -3,6 +3,6 @@ Game entities: player and enemies
 """
 
 from .player import MonsterPlayer
-from .enemies import Enemy, Slime, Goblin, OrcWarrior
+from .enemies import Enemy, Slime, Goblin, OrcWarrior, GoblinShaman
 
-__all__ = ['MonsterPlayer', 'Enemy', 'Slime', 'Goblin', 'OrcWarrior']
+__all__ = ['MonsterPlayer', 'Enemy', 'Slime', 'Goblin', 'OrcWarrior', 'GoblinShaman']
@@ -6,6 +6,8 @@ import arcade
 import random
 import math
 from ..config import *
+from ..systems.projectiles import OWNER_ENEMY
+from ..systems.spatial import rect_hits_grid
 
 
 class Enemy(arcade.Sprite):
@@ -27,16 +29,19 @@ class Enemy(arcade.Sprite):
         self.hp = hp
         self.atk = atk
         self.defense = defense
-        self.speed = speed
+        self.speed = speed * (settings.ENEMY_SPEED_BASE / ENEMY_SPEED_BASE)  # Tuning scales every archetype
         self.xp_value = xp_value
 
         # AI
         self.target = None
-        self.detection_range = ENEMY_DETECTION_RANGE
+        self.detection_range = settings.ENEMY_DETECTION_RANGE
         self.wander_timer = 0
         self.wander_direction = random.uniform(0, 2 * math.pi)
         self.aggro = False
 
+        # Shared projectile pool (set by the floor that spawns this enemy)
+        self.projectiles = None
+
     def _create_texture(self):
         """Create a simple colored rectangle as texture"""
         self.texture = arcade.make_soft_square_texture(
@@ -59,7 +64,14 @@ class Enemy(arcade.Sprite):
         dy = self.center_y - target.center_y
         return math.sqrt(dx * dx + dy * dy)
 
-    def update_ai(self, player, walls, delta_time):
+    def hits_walls(self, wall_grid):
+        """Check whether the enemy's square overlaps a wall tile"""
+        half_w = self.width / 2
+        half_h = self.height / 2
+        x, y = self.center_x, self.center_y
+        return rect_hits_grid(wall_grid, x - half_w, y - half_h, x + half_w, y + half_h)
+
+    def update_ai(self, player, wall_grid, delta_time):
         """Update enemy AI behavior"""
         distance = self.distance_to(player)
 
@@ -91,8 +103,8 @@ class Enemy(arcade.Sprite):
             self.center_x += dx * self.speed * 0.5
             self.center_y += dy * self.speed * 0.5
 
-        # Check wall collision
-        if arcade.check_for_collision_with_list(self, walls):
+        # Check wall collision (enemies are axis-aligned squares, so test the wall grid)
+        if self.hits_walls(wall_grid):
             # Revert movement
             if self.aggro:
                 dx = player.center_x - self.center_x
@@ -115,7 +127,7 @@ class Slime(Enemy):
     """Weak starting enemy"""
 
     def __init__(self, x, y, floor_level=1):
-        scaling = FLOOR_SCALING_FACTOR ** (floor_level - 1)
+        scaling = settings.FLOOR_SCALING_FACTOR ** (floor_level - 1)
         hp = int(30 * scaling)
         atk = int(5 * scaling)
         defense = int(1 * scaling)
@@ -128,7 +140,7 @@ class Goblin(Enemy):
     """Medium strength enemy"""
 
     def __init__(self, x, y, floor_level=1):
-        scaling = FLOOR_SCALING_FACTOR ** (floor_level - 1)
+        scaling = settings.FLOOR_SCALING_FACTOR ** (floor_level - 1)
         hp = int(50 * scaling)
         atk = int(8 * scaling)
         defense = int(3 * scaling)
@@ -141,10 +153,49 @@ class OrcWarrior(Enemy):
     """Strong enemy"""
 
     def __init__(self, x, y, floor_level=1):
-        scaling = FLOOR_SCALING_FACTOR ** (floor_level - 1)
+        scaling = settings.FLOOR_SCALING_FACTOR ** (floor_level - 1)
         hp = int(80 * scaling)
         atk = int(12 * scaling)
         defense = int(5 * scaling)
         xp = int(50 * scaling)
 
         super().__init__(x, y, hp, atk, defense, xp, (255, 100, 100), speed=1.8)
+
+
+class GoblinShaman(Enemy):
+    """Ranged enemy that keeps its distance and throws bolts"""
+
+    def __init__(self, x, y, floor_level=1):
+        scaling = settings.FLOOR_SCALING_FACTOR ** (floor_level - 1)
+        hp = int(35 * scaling)
+        atk = int(7 * scaling)
+        defense = int(2 * scaling)
+        xp = int(40 * scaling)
+
+        super().__init__(x, y, hp, atk, defense, xp, (180, 120, 255), speed=1.2)
+
+        self.preferred_range = 160  # Stops approaching inside this distance
+        self.fire_range = 260
+        self.fire_cooldown = 2.0
+        self.fire_timer = random.uniform(0.5, self.fire_cooldown)
+
+    def update_ai(self, player, wall_grid, delta_time):
+        """Approach to casting range, then hold position and fire"""
+        distance = self.distance_to(player)
+
+        if not (self.aggro and distance < self.preferred_range):
+            super().update_ai(player, wall_grid, delta_time)
+
+        if not self.aggro or self.projectiles is None:
+            return
+
+        self.fire_timer -= delta_time
+        if self.fire_timer <= 0 and distance <= self.fire_range:
+            self.fire_timer = self.fire_cooldown
+            self.projectiles.spawn_fan(
+                self.center_x, self.center_y,
+                player.center_x - self.center_x, player.center_y - self.center_y,
+                settings.ENEMY_PROJECTILE_SPEED, 1, 0,
+                self.fire_range / settings.ENEMY_PROJECTILE_SPEED,
+                self.atk, OWNER_ENEMY
+            )
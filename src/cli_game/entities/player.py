@@ -3,60 +3,88 @@ Player entity with stats, evolution, and combat
 """
 
 import arcade
-import time
 from ..config import *
-from ..systems.combat import calculate_damage
+from ..systems.combat import roll_damage
+from ..systems.geometry import normalize
+from ..systems.timers import TimerWheel
+
+# Circle textures by form color, generated once and shared by every player
+_FORM_TEXTURES = {}
+
+
+def get_form_texture(color):
+    """Get the cached circle texture for a form color"""
+    color = tuple(color)
+    texture = _FORM_TEXTURES.get(color)
+    if texture is None:
+        texture = arcade.make_circle_texture(TILE_SIZE, color)
+        _FORM_TEXTURES[color] = texture
+    return texture
 
 
 class MonsterPlayer(arcade.Sprite):
     """The player-controlled monster with evolution capabilities"""
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, timers=None):
         super().__init__()
 
+        # Game clock shared with the rest of the game
+        self.timers = timers if timers is not None else TimerWheel()
+
         # Visual
         self.center_x = x
         self.center_y = y
-        self.width = TILE_SIZE
-        self.height = TILE_SIZE
-        self.color = COLOR_PLAYER
+        self.form_color = COLOR_PLAYER
+        self.texture = get_form_texture(COLOR_PLAYER)
 
         # Core stats
-        self.max_hp = PLAYER_START_HP
+        self.max_hp = settings.PLAYER_START_HP
         self.hp = self.max_hp
-        self.base_atk = PLAYER_START_ATK
-        self.base_def = PLAYER_START_DEF
-        self.speed = PLAYER_SPEED
-        self.base_crit_chance = BASE_CRIT_CHANCE
+        self.base_atk = settings.PLAYER_START_ATK
+        self.base_def = settings.PLAYER_START_DEF
+        self.speed = settings.PLAYER_SPEED
+        self.base_crit_chance = settings.BASE_CRIT_CHANCE
         self.evo_power = 1.0
 
         # Progression
         self.xp = 0
         self.level = 1
-        self.xp_to_next_level = XP_PER_LEVEL
+        self.xp_to_next_level = settings.XP_PER_LEVEL
         self.evolution_stage = 0
         self.current_form = "larva"
 
-        # Combat
-        self.last_attack_time = 0
-        self.attack_cooldown = ATTACK_COOLDOWN
-        self.invincibility_timer = 0.0
-        self.invincibility_duration = INVINCIBILITY_DURATION
+        # Combat (times are game time from self.timers)
+        self.last_attack_time = float("-inf")
+        self.last_attack_crit = False
+        self.attack_cooldown = settings.ATTACK_COOLDOWN
+        self.invincible_until = 0.0
+        self.invincibility_duration = settings.INVINCIBILITY_DURATION
 
         # Collections
         self.traits = []
+        self.trait_mask = 0  # Bits of owned traits (see TraitCatalog)
         self.skills = []
 
         # Movement
         self.velocity_x = 0
         self.velocity_y = 0
 
-        # Reference to game window for triggering effects
-        self.game_window = None
+        # Facing direction (unit vector of last movement, used for aiming skills)
+        self.facing_x = 1.0
+        self.facing_y = 0.0
+
+        # Called with the damage taken on each hit (the simulation records it)
+        self.on_hurt = None
 
     def update_color(self, color):
         """Update player color (used when evolving)"""
-        self.color = color
+        self.form_color = color
+        self.texture = get_form_texture(color)
+
+    @property
+    def invincibility_timer(self):
+        """Seconds of invincibility left"""
+        return self.timers.time_until(self.invincible_until)
 
     @property
     def atk(self):
@@ -91,13 +119,14 @@ class MonsterPlayer(arcade.Sprite):
             self.xp -= self.xp_to_next_level
             self.level += 1
             level_ups += 1
-            self.xp_to_next_level = int(XP_PER_LEVEL * (XP_LEVEL_MULTIPLIER ** (self.level - 1)))
+            self.xp_to_next_level = int(settings.XP_PER_LEVEL * (settings.XP_LEVEL_MULTIPLIER ** (self.level - 1)))
 
         return level_ups
 
     def add_trait(self, trait):
         """Add a trait to the player"""
         self.traits.append(trait)
+        self.trait_mask |= trait.bit
         trait.apply(self)
 
     def add_skill(self, skill):
@@ -107,15 +136,15 @@ class MonsterPlayer(arcade.Sprite):
 
     def can_attack(self):
         """Check if attack cooldown has passed"""
-        return time.time() - self.last_attack_time >= self.attack_cooldown
+        return self.timers.now - self.last_attack_time >= self.attack_cooldown
 
     def perform_attack(self, target):
         """Attack an enemy"""
         if not self.can_attack():
             return 0
 
-        self.last_attack_time = time.time()
-        damage = calculate_damage(self, target)
+        self.last_attack_time = self.timers.now
+        damage, self.last_attack_crit = roll_damage(self, target)
 
         # Apply lifesteal from traits
         lifesteal_amount = 0
@@ -142,16 +171,17 @@ class MonsterPlayer(arcade.Sprite):
         self.hp -= actual_damage
 
         # Set invincibility window
-        self.invincibility_timer = self.invincibility_duration
+        self.invincible_until = self.timers.now + self.invincibility_duration
 
-        # Trigger screen shake if game window reference exists
-        if self.game_window:
-            self.game_window.trigger_camera_shake()
+        if self.on_hurt:
+            self.on_hurt(actual_damage)
 
         return actual_damage
 
     def heal(self, amount):
-        """Heal the player"""
+        """Heal the player (a downed player stays down)"""
+        if not self.is_alive():
+            return 0
         old_hp = self.hp
         self.hp = min(self.hp + amount, self.max_hp)
         return self.hp - old_hp
@@ -162,18 +192,14 @@ class MonsterPlayer(arcade.Sprite):
 
     def update_movement(self, delta_time):
         """Update player position based on velocity"""
+        if self.velocity_x or self.velocity_y:
+            self.facing_x, self.facing_y = normalize(self.velocity_x, self.velocity_y)
+
         self.center_x += self.velocity_x * self.speed
         self.center_y += self.velocity_y * self.speed
 
     def update_traits(self, delta_time):
-        """Update trait effects (e.g., regen)"""
-        # Update invincibility timer
-        if self.invincibility_timer > 0:
-            self.invincibility_timer -= delta_time
-            if self.invincibility_timer < 0:
-                self.invincibility_timer = 0
-
-        # Update traits
+        """Update per-frame trait effects (timed effects use self.timers)"""
         for trait in self.traits:
             trait.update(self, delta_time)
 
@@ -181,15 +207,7 @@ class MonsterPlayer(arcade.Sprite):
         """Called each frame"""
         pass
 
-    def draw(self):
-        """Draw the player sprite"""
-        # Blink during invincibility
-        if self.invincibility_timer > 0:
-            # Blink effect: show/hide every 0.1 seconds
-            if int(self.invincibility_timer * 10) % 2 == 0:
-                return  # Skip drawing to create blink effect
-
-        arcade.draw_circle_filled(
-            self.center_x, self.center_y, self.width / 2, self.color
-        )
-
+    def update_blink(self):
+        """Blink during invincibility: show/hide every 0.1 seconds"""
+        timer = self.invincibility_timer
+        self.visible = timer <= 0 or int(timer * 10) % 2 != 0
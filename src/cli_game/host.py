@@ -0,0 +1,254 @@
+"""
+Multi-session host
+
+Runs many headless games in one process on a shared asyncio tick loop, for
+bot ladders, automated tests and (later) a server. Every host tick steps each
+live session exactly once, starting from a rotating offset so no session is
+always served last, and yields to the event loop every HOST_SLICE seconds so
+command submits and new sessions are handled mid-tick.
+
+The simulation draws from the shared random module, so each session keeps
+its own copy of the random state and the host swaps it in around the
+session's step: a session plays exactly as it would alone with the same seed
+and inputs, however sessions interleave.
+
+Backpressure: a tick that overruns its period is not caught up by bursting
+steps; the missed time is dropped, so every session slows down evenly. After
+HOST_OVERLOAD_TICKS overruns in a row new sessions wait in open() until a
+tick finishes in time again. Each step's latency (from the tick's scheduled
+start to the end of that session's step) is kept per session for
+percentiles.
+
+    async with SessionHost() as host:
+        results = await asyncio.gather(*(host.play(seed, "greedy") for seed in range(200)))
+    print(host.report())
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from .config import *
+from .balance import _percentile
+from .policies import get_policy, observe
+from .simulation import GameSimulation, GameState
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def latency_percentiles(samples):
+    """p50/p90/p99 of latency samples (seconds) in milliseconds"""
+    ordered = sorted(samples)
+    return {f"p{round(fraction * 100)}": _percentile(ordered, fraction) * 1000 for fraction in PERCENTILES}
+
+
+class Session:
+    """One hosted game: a simulation, its own random state, a command source and step latencies"""
+
+    def __init__(self, session_id, seed, policy_name=None, max_ticks=None, on_step=None):
+        self.id = session_id
+        # Unseeded sessions draw a seed from the host's random state, so each plays its own game
+        # and result() still reports a seed that reproduces it
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+
+        # Build the simulation on its own random state, leaving the host's untouched
+        outer_state = random.getstate()
+        self.sim = GameSimulation(seed=self.seed)
+        self.random_state = random.getstate()
+        random.setstate(outer_state)
+
+        self.policy = get_policy(policy_name, seed) if policy_name else None
+        self.max_ticks = max_ticks
+        self.on_step = on_step  # Called with (session, events) after each step
+        self.inputs = deque()  # Commands submitted by a client, one entry per step
+        self.steps = 0
+        self.latencies = deque(maxlen=HOST_LATENCY_WINDOW)
+        self.closed = False
+        self.done = asyncio.get_running_loop().create_future()
+
+    def submit(self, commands):
+        """Queue the commands of one step (sessions without a policy step idle when nothing is queued)"""
+        self.inputs.append(list(commands))
+
+    def close(self):
+        """Stop stepping; the host finishes the session on its next tick"""
+        self.closed = True
+
+    @property
+    def finished(self):
+        """Closed, out of ticks, or a bot whose run is over"""
+        if self.closed or (self.max_ticks is not None and self.steps >= self.max_ticks):
+            return True
+        return self.policy is not None and self.sim.state == GameState.GAME_OVER
+
+    def step(self):
+        """Advance one tick on this session's random state and return its events"""
+        random.setstate(self.random_state)
+        try:
+            if self.inputs:
+                commands = self.inputs.popleft()
+            elif self.policy:
+                commands = self.policy.decide(observe(self.sim))
+            else:
+                commands = ()
+            events = self.sim.step(commands)
+        finally:
+            self.random_state = random.getstate()
+        self.steps += 1
+        return events
+
+    def result(self):
+        """Where the session ended, with its step latency percentiles"""
+        return {
+            "session": self.id,
+            "seed": self.seed,
+            "steps": self.steps,
+            "state": self.sim.state,
+            **self.sim.summary(),
+            "latency_ms": latency_percentiles(self.latencies),
+        }
+
+
+class SessionHost:
+    """Steps many sessions on one asyncio tick loop"""
+
+    def __init__(self, tick_rate=FPS, max_sessions=None, slice_seconds=HOST_SLICE):
+        self.tick_period = 1 / tick_rate if tick_rate else 0.0  # 0: unpaced, as fast as possible
+        self.max_sessions = max_sessions
+        self.slice_seconds = slice_seconds
+        self.sessions = {}  # id -> Session, in round-robin order
+        self.next_id = 0
+
+        self.ticks = 0
+        self.overruns = 0
+        self.overrun_streak = 0
+        self.tick_times = deque(maxlen=HOST_LATENCY_WINDOW)  # Seconds of work per tick
+        self.latencies = deque(maxlen=HOST_LATENCY_WINDOW * 16)  # Step latencies across sessions
+        self.finished = 0
+
+        self.capacity = asyncio.Event()  # Set while new sessions may join
+        self.capacity.set()
+        self.wakeup = asyncio.Event()  # Set when a session joins an idle host
+        self.running = False
+        self.task = None
+
+    async def __aenter__(self):
+        self.running = True  # Before the task starts, so a stop() that comes first sticks
+        self.task = asyncio.create_task(self.run())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.stop()
+        await self.task
+
+    def _has_room(self):
+        """Whether a new session may join now"""
+        return self.max_sessions is None or len(self.sessions) < self.max_sessions
+
+    def _update_capacity(self):
+        """Open or close admission from load and the session cap"""
+        overloaded = self.tick_period and self.overrun_streak >= HOST_OVERLOAD_TICKS
+        if self._has_room() and not overloaded:
+            self.capacity.set()
+        else:
+            self.capacity.clear()
+
+    async def open(self, seed=None, policy_name=None, max_ticks=None, on_step=None):
+        """Start a session once the host has capacity for it"""
+        while not (self.capacity.is_set() and self._has_room()):
+            await self.capacity.wait()
+            self._update_capacity()
+        session = Session(self.next_id, seed, policy_name, max_ticks, on_step)
+        self.next_id += 1
+        self.sessions[session.id] = session
+        self._update_capacity()
+        self.wakeup.set()
+        return session
+
+    async def play(self, seed, policy_name="greedy", max_ticks=None):
+        """Play a bot session to the end and return its result"""
+        session = await self.open(seed, policy_name, max_ticks)
+        return await session.done
+
+    def stop(self):
+        """End the tick loop after the current tick; unfinished sessions are finished as they are"""
+        self.running = False
+        self.wakeup.set()
+
+    def _finish(self, session):
+        """Remove a session and resolve its done future"""
+        del self.sessions[session.id]
+        self.finished += 1
+        if not session.done.done():
+            session.done.set_result(session.result())
+
+    async def _tick(self, scheduled):
+        """Step every live session once, yielding to the event loop between slices"""
+        order = list(self.sessions.values())
+        if order:
+            offset = self.ticks % len(order)
+            order = order[offset:] + order[:offset]
+
+        slice_end = time.perf_counter() + self.slice_seconds
+        for session in order:
+            if not session.closed:
+                events = session.step()
+                latency = time.perf_counter() - scheduled
+                session.latencies.append(latency)
+                self.latencies.append(latency)
+                if session.on_step:
+                    session.on_step(session, events)
+            if session.finished:
+                self._finish(session)
+            if time.perf_counter() >= slice_end:
+                await asyncio.sleep(0)
+                slice_end = time.perf_counter() + self.slice_seconds
+
+    async def run(self):
+        """Tick every session until stop() (set running first; __aenter__ does)"""
+        deadline = time.perf_counter()
+        while self.running:
+            if not self.sessions:
+                # Idle: no load to shed, so an overload streak can't keep admission closed
+                self.overrun_streak = 0
+                self._update_capacity()
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                deadline = time.perf_counter()
+                continue
+
+            started = time.perf_counter()
+            await self._tick(max(deadline, started))
+            self.ticks += 1
+            now = time.perf_counter()
+            self.tick_times.append(now - started)
+
+            # Overran: drop the missed time rather than bursting steps to catch up
+            deadline += self.tick_period
+            if self.tick_period and now > deadline:
+                self.overruns += 1
+                self.overrun_streak += 1
+                deadline = now
+            else:
+                self.overrun_streak = 0
+            self._update_capacity()
+            await asyncio.sleep(max(0.0, deadline - now))
+
+        for session in list(self.sessions.values()):
+            self._finish(session)
+
+    def report(self):
+        """Load and latency figures of the host"""
+        tick_times = sorted(self.tick_times)
+        return {
+            "sessions": len(self.sessions),
+            "finished": self.finished,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "accepting": self.capacity.is_set(),
+            "tick_ms": {
+                "mean": sum(tick_times) / len(tick_times) * 1000 if tick_times else 0.0,
+                "max": tick_times[-1] * 1000 if tick_times else 0.0,
+            },
+            "latency_ms": latency_percentiles(self.latencies),
+        }
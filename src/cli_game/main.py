@@ -1,139 +1,175 @@
 """
 Main game loop and window
+
+The window is a renderer and input adapter: key presses become simulation
+commands, each update steps the GameSimulation at a fixed tick, and the events
+it reports drive effects, menus and the camera. Every session is recorded as a
+replay; with --replay the window plays one back instead of taking input.
+With --coop-host the window also serves the partner seat to one remote
+client (see netplay); co-op sessions are not recorded. With --share-state
+every tick is also published to shared memory for tools in other processes.
 """
 
+import argparse
+import math
+import os
+import random
+import time
 import arcade
 from .config import *
-from .entities import MonsterPlayer
-from .systems import (
-    DungeonFloor,
-    get_evolution_options,
-    evolve_player,
-    EVOLUTION_TREE,
-    get_random_traits,
-    SKILL_REGISTRY,
+from .coop_client import CoopClientWindow
+from .netplay import CoopHost
+from .replay import Replay, ReplayPlayer, load_replay
+from .shared_state import SharedStatePublisher
+from .simulation import (
+    GameSimulation,
+    SIM_TICK,
+    GameState,
+    CMD_MOVE,
+    CMD_ATTACK,
+    CMD_SKILL,
+    CMD_SELECT,
+    CMD_RESTART,
+    EVENT_FLOOR,
+    EVENT_ATTACK,
+    EVENT_CAST,
+    EVENT_HIT,
+    EVENT_HURT,
+)
+from .systems import ParticleSystem, TimerWheel
+from .ui import (
+    HUD,
+    EnemyHPBars,
+    ChunkedLayer,
+    VisibleLayer,
+    DamageNumbers,
+    Minimap,
+    bake_wall_texture,
+    draw_wall_texture,
+    draw_enemy_points,
+    TraitSelectionMenu,
+    EvolutionSelectionMenu,
+    GameOverMenu,
+    StatUpgradeMenu,
 )
-from .systems.skills import get_skill_by_id
-from .ui import HUD, TraitSelectionMenu, EvolutionSelectionMenu, GameOverMenu, StatUpgradeMenu
-
-
-class AttackEffect:
-    """Visual effect for player attacks"""
-
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.lifetime = 0.0
-        self.max_lifetime = ATTACK_EFFECT_DURATION
-        self.size = ATTACK_EFFECT_SIZE
-        self.color = COLOR_ATTACK_EFFECT
-
-    def update(self, delta_time):
-        """Update effect lifetime"""
-        self.lifetime += delta_time
-
-    def is_expired(self):
-        """Check if effect should be removed"""
-        return self.lifetime >= self.max_lifetime
-
-    def draw(self):
-        """Draw the attack effect"""
-        # Fade out over time
-        alpha = int(255 * (1 - self.lifetime / self.max_lifetime))
-        color = (*self.color[:3], alpha)
-
-        # Draw expanding circle
-        current_size = self.size * (1 + self.lifetime / self.max_lifetime)
-        arcade.draw_circle_filled(self.x, self.y, current_size, color)
-
-
-class GameState:
-    """Game state enum"""
-    PLAYING = "playing"
-    STAT_UPGRADE = "stat_upgrade"
-    TRAIT_SELECTION = "trait_selection"
-    EVOLUTION_SELECTION = "evolution_selection"
-    GAME_OVER = "game_over"
 
 
 class MonsterEvolutionGame(arcade.Window):
     """Main game window"""
 
-    def __init__(self):
+    def __init__(self, replay_path=None, trust_keyframes=False, coop_port=None, shared_state_name=None):
         super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
         arcade.set_background_color(COLOR_BACKGROUND)
 
-        # Game state
-        self.state = GameState.PLAYING
-
-        # Core objects
-        self.player = None
-        self.current_floor = None
-        self.floor_number = 1
+        # Game rules and state, stepped at a fixed tick
+        self.sim = None
+        self.player_list = None
+        self.step_time = 0.0  # Real time not yet simulated
+
+        # Recording of this session, or the replay being watched
+        self.replay = None
+        self.replay_path = None
+        self.replay_player = None
+        if replay_path:
+            self.replay_player = ReplayPlayer(load_replay(replay_path, trust_keyframes))
+        self.replay_speed = 1.0
+        self.replay_paused = False
+
+        # Input: held movement axes and commands queued for the next step
+        self.move_x = 0
+        self.move_y = 0
+        self.commands = []
 
         # Visual effects
-        self.attack_effects = []
+        self.particles = ParticleSystem()
+        self.damage_numbers = DamageNumbers()
 
         # UI
         self.hud = HUD()
+        self.enemy_hp_bars = EnemyHPBars()
+        self.minimap = Minimap()
+
+        # Viewport-culled world layers and per-frame drawn/culled counts
+        self.wall_layer = None
+        self.wall_lod_texture = None  # Walls baked at a pixel per tile for zoomed-out views
+        self.enemy_layer = VisibleLayer()
+        self.draw_stats = {}
         self.current_menu = None
+        self.menu_state = None  # (state, choices) the current menu was opened for
+
+        # Idle mode: world frozen into a framebuffer while a menu is open
+        self.frozen_world = None
+        self.frozen_world_quad = None
+        self.frozen_menu = None  # Menu the frozen world was captured for
+        self.needs_redraw = True
+        self.skip_flip = False
+        self.has_focus = True
+        self.frame_rates = None
 
         # Cameras
         self.world_camera = None   # 월드(맵, 플레이어, 적)용
+        self.zoom = 1.0
         self.ui_camera = None      # HUD/메뉴용
 
-        # Pending level ups
-        self.pending_level_ups = 0
-
-        # Contact damage cooldown
-        self.contact_damage_cooldown = CONTACT_DAMAGE_COOLDOWN
-        self.contact_damage_timer = 0.0
-
-        # Camera shake
-        self.camera_shake_timer = 0.0
+        # Camera shake (timed on the window's own wheel so the simulation never holds window callbacks)
+        self.effect_timers = TimerWheel()
+        self.camera_shaking = False
+        self.camera_shake_end = None
         self.camera_shake_duration = CAMERA_SHAKE_DURATION
         self.camera_shake_magnitude = CAMERA_SHAKE_MAGNITUDE
         self.base_camera_x = 0
         self.base_camera_y = 0
+        self.shake_rng = random.Random()  # Kept off the shared random module the simulation draws from
+
+        # State published to other processes after each step
+        self.shared_state = SharedStatePublisher(shared_state_name) if shared_state_name else None
 
         # Setup
+        self.coop = None
         self.setup()
 
+        # Co-op: serve the partner seat (partner input isn't recorded, so neither is the session)
+        if coop_port is not None:
+            self.coop = CoopHost(self.sim, coop_port)
+            self.replay = None
+            self.set_caption(f"{SCREEN_TITLE} - Co-op host on port {self.coop.port}")
+
+    @property
+    def player(self):
+        """The simulated player"""
+        return self.sim.player
+
+    @property
+    def current_floor(self):
+        """The simulated floor"""
+        return self.sim.current_floor
+
+    @property
+    def state(self):
+        """The simulation's game state"""
+        return self.sim.state
+
     def setup(self):
         """Initialize/reset the game"""
         # Create cameras
         self.world_camera = arcade.camera.Camera2D()
         self.ui_camera = arcade.camera.Camera2D()
 
-        # Reset floor
-        self.floor_number = 1
-        self.current_floor = DungeonFloor(self.floor_number)
-
-        # Create player
-        spawn_x, spawn_y = self.current_floor.get_player_spawn_position()
-        self.player = MonsterPlayer(spawn_x, spawn_y)
-        self.player.game_window = self  # Set reference for screen shake
-
-        # Give player initial skills based on form
-        self._update_player_skills()
-
-        # Reset state
-        self.state = GameState.PLAYING
-        self.current_menu = None
-        self.pending_level_ups = 0
-        self.contact_damage_timer = 0.0
-        self.camera_shake_timer = 0.0
-
-    def _update_player_skills(self):
-        """Update player skills based on current form"""
-        form_data = EVOLUTION_TREE.get(self.player.current_form)
-        if form_data:
-            skill_ids = form_data.get("skills", [])
-            self.player.skills = []
-            for skill_id in skill_ids:
-                skill = get_skill_by_id(skill_id)
-                if skill:
-                    self.player.add_skill(skill)
+        if self.replay_player:
+            self.sim = self.replay_player.sim
+            self._update_replay_caption()
+        else:
+            seed = random.randrange(2 ** 31)
+            self.sim = GameSimulation(seed)
+            self.replay = Replay(seed)
+            self.replay_path = os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{seed}.replay")
+
+        self.step_time = 0.0
+        self.move_x = 0
+        self.move_y = 0
+        self.commands = []
+        self._handle_events(self.sim.events)
+        self._sync_menu()
 
     def on_key_press(self, key, modifiers):
         """Handle key press events"""
@@ -142,175 +178,270 @@ class MonsterEvolutionGame(arcade.Window):
             self.set_fullscreen(not self.fullscreen)
             return
 
-        # Menu handling
-        if self.state == GameState.STAT_UPGRADE:
-            self.current_menu.handle_key_press(key)
+        # Watching a replay: only playback controls
+        if self.replay_player:
+            self._on_replay_key_press(key)
             return
-        elif self.state == GameState.TRAIT_SELECTION:
-            self.current_menu.handle_key_press(key)
-            return
-        elif self.state == GameState.EVOLUTION_SELECTION:
-            self.current_menu.handle_key_press(key)
-            return
-        elif self.state == GameState.GAME_OVER:
-            self.current_menu.handle_key_press(key)
+
+        # Menu handling (ignored while a pick waits for the next step)
+        if self.current_menu:
+            self.request_redraw()
+            if not self.commands:
+                self.current_menu.handle_key_press(key)
             return
 
         # Playing state controls
         if self.state == GameState.PLAYING:
             # Movement
             if key == arcade.key.W or key == arcade.key.UP:
-                self.player.velocity_y = 1
+                self._set_movement(self.move_x, 1)
             elif key == arcade.key.S or key == arcade.key.DOWN:
-                self.player.velocity_y = -1
+                self._set_movement(self.move_x, -1)
             elif key == arcade.key.A or key == arcade.key.LEFT:
-                self.player.velocity_x = -1
+                self._set_movement(-1, self.move_y)
             elif key == arcade.key.D or key == arcade.key.RIGHT:
-                self.player.velocity_x = 1
+                self._set_movement(1, self.move_y)
 
             # Attack
             elif key == arcade.key.SPACE:
-                self._player_attack()
+                self.commands.append((CMD_ATTACK,))
 
             # Skills
             elif key == arcade.key.Q:
-                if len(self.player.skills) > 0:
-                    self.player.skills[0].activate(
-                        self.player,
-                        self.current_floor.enemies,
-                        self.current_floor.walls
-                    )
+                self.commands.append((CMD_SKILL, 0))
             elif key == arcade.key.E:
-                if len(self.player.skills) > 1:
-                    self.player.skills[1].activate(
-                        self.player,
-                        self.current_floor.enemies,
-                        self.current_floor.walls
-                    )
+                self.commands.append((CMD_SKILL, 1))
+
+            # Zoom
+            elif key in (arcade.key.MINUS, arcade.key.NUM_SUBTRACT):
+                self._zoom_by(1 / ZOOM_STEP)
+            elif key in (arcade.key.EQUAL, arcade.key.PLUS, arcade.key.NUM_ADD):
+                self._zoom_by(ZOOM_STEP)
+
+    def _on_replay_key_press(self, key):
+        """Replay controls: pause, speed, seek and zoom"""
+        if key == arcade.key.SPACE:
+            self.replay_paused = not self.replay_paused
+        elif key == arcade.key.BRACKETLEFT:
+            self.replay_speed = max(0.25, self.replay_speed / 2)
+        elif key == arcade.key.BRACKETRIGHT:
+            self.replay_speed = min(32.0, self.replay_speed * 2)
+        elif key == arcade.key.LEFT:
+            self._seek_replay(-REPLAY_SEEK_STEP)
+        elif key == arcade.key.RIGHT:
+            self._seek_replay(REPLAY_SEEK_STEP)
+        elif key in (arcade.key.MINUS, arcade.key.NUM_SUBTRACT):
+            self._zoom_by(1 / ZOOM_STEP)
+        elif key in (arcade.key.EQUAL, arcade.key.PLUS, arcade.key.NUM_ADD):
+            self._zoom_by(ZOOM_STEP)
+        self._update_replay_caption()
+        self.request_redraw()
+
+    def _seek_replay(self, seconds):
+        """Jump the replay by some seconds of game time"""
+        player = self.replay_player
+        player.seek(player.step + round(seconds / SIM_TICK))
+        self.sim = player.sim
+        self.step_time = 0.0
+        self._enter_floor()
+        self._sync_menu()
+        self._center_camera_on_player()
+
+    def _update_replay_caption(self):
+        """Show replay position and speed in the title bar"""
+        player = self.replay_player
+        status = "paused" if self.replay_paused else f"x{self.replay_speed:g}"
+        self.set_caption(
+            f"{SCREEN_TITLE} - Replay {player.step * SIM_TICK:.0f}/{player.replay.steps * SIM_TICK:.0f}s {status}"
+        )
+
+    def save_replay(self):
+        """Write this session's replay (on game over and on exit)"""
+        if not self.replay or not self.replay.steps:
+            return
+        self.replay.finish(self.sim)
+        os.makedirs(os.path.dirname(self.replay_path), exist_ok=True)
+        self.replay.save(self.replay_path)
+
+    def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
+        """Zoom the world camera with the mouse wheel"""
+        if self.state == GameState.PLAYING and scroll_y:
+            self._zoom_by(ZOOM_STEP ** scroll_y)
+
+    def _zoom_by(self, factor):
+        """Scale the world camera zoom, clamped to the allowed range"""
+        self.zoom = max(ZOOM_MIN, min(self.zoom * factor, ZOOM_MAX))
+        self._center_camera_on_player()
 
     def on_key_release(self, key, modifiers):
         """Handle key release events"""
         if self.state == GameState.PLAYING:
             if key in (arcade.key.W, arcade.key.UP):
-                if self.player.velocity_y > 0:
-                    self.player.velocity_y = 0
+                if self.move_y > 0:
+                    self._set_movement(self.move_x, 0)
             elif key in (arcade.key.S, arcade.key.DOWN):
-                if self.player.velocity_y < 0:
-                    self.player.velocity_y = 0
+                if self.move_y < 0:
+                    self._set_movement(self.move_x, 0)
             elif key in (arcade.key.A, arcade.key.LEFT):
-                if self.player.velocity_x < 0:
-                    self.player.velocity_x = 0
+                if self.move_x < 0:
+                    self._set_movement(0, self.move_y)
             elif key in (arcade.key.D, arcade.key.RIGHT):
-                if self.player.velocity_x > 0:
-                    self.player.velocity_x = 0
-
-    def _player_attack(self):
-        """Handle player basic attack"""
-        if not self.player.can_attack():
-            return
-
-        # Create attack effect at player position
-        effect = AttackEffect(self.player.center_x, self.player.center_y)
-        self.attack_effects.append(effect)
-
-        # Find enemies in range
-        for enemy in self.current_floor.enemies:
-            distance = (
-                (enemy.center_x - self.player.center_x) ** 2 +
-                (enemy.center_y - self.player.center_y) ** 2
-            ) ** 0.5
+                if self.move_x > 0:
+                    self._set_movement(0, self.move_y)
 
-            if distance <= ATTACK_RANGE:
-                damage = self.player.perform_attack(enemy)
-                # Apply damage to enemy
-                enemy.take_damage(damage)
+    def _set_movement(self, move_x, move_y):
+        """Change the held movement direction"""
+        self.move_x = move_x
+        self.move_y = move_y
+        self.commands.append((CMD_MOVE, move_x, move_y))
 
-                if not enemy.is_alive():
-                    # Enemy died
-                    xp_gained = enemy.xp_value
-                    level_ups = self.player.gain_xp(xp_gained)
-                    self.pending_level_ups += level_ups
+    def _on_choice_selected(self, choice):
+        """Menu callback: pick one of the simulation's offered choices"""
+        self.commands.append((CMD_SELECT, self.sim.choices.index(choice)))
 
-                    self.current_floor.enemies.remove(enemy)
-
-                # Only attack one enemy per press
-                break
+    def _on_restart_selected(self):
+        """Game over menu callback: start a new run"""
+        self.commands.append((CMD_RESTART,))
 
     def trigger_camera_shake(self):
-        """Trigger camera shake effect"""
-        self.camera_shake_timer = self.camera_shake_duration
-
-    def _check_player_enemy_collision(self):
-        """Check if player is touching enemies (contact damage)"""
-        hit_list = arcade.check_for_collision_with_list(
-            self.player,
-            self.current_floor.enemies
+        """Trigger camera shake effect (restarts the shake if already running)"""
+        if self.camera_shake_end:
+            self.camera_shake_end.cancel()
+        self.camera_shaking = True
+        self.camera_shake_end = self.effect_timers.schedule(
+            self.camera_shake_duration, self._stop_camera_shake
         )
 
-        # Only deal contact damage if cooldown expired
-        if hit_list and self.contact_damage_timer <= 0:
-            enemy = hit_list[0]  # Take damage from first enemy in list
-            self.player.take_damage(enemy.atk)
-            self.contact_damage_timer = self.contact_damage_cooldown
+    def _stop_camera_shake(self):
+        """End the camera shake"""
+        self.camera_shaking = False
+        self.camera_shake_end = None
 
     def on_update(self, delta_time):
-        """Update game logic"""
-        if self.state == GameState.PLAYING:
-            # Decrement contact damage timer
-            if self.contact_damage_timer > 0:
-                self.contact_damage_timer -= delta_time
-                if self.contact_damage_timer < 0:
-                    self.contact_damage_timer = 0
-
-            # Decrement camera shake timer
-            if self.camera_shake_timer > 0:
-                self.camera_shake_timer -= delta_time
-                if self.camera_shake_timer < 0:
-                    self.camera_shake_timer = 0
-
-            # Update player movement
-            old_x = self.player.center_x
-            old_y = self.player.center_y
-
-            self.player.update_movement(delta_time)
-
-            # Check wall collision
-            if arcade.check_for_collision_with_list(self.player, self.current_floor.walls):
-                self.player.center_x = old_x
-                self.player.center_y = old_y
-
-            # Update traits
-            self.player.update_traits(delta_time)
-
-            # Update floor (enemy AI)
-            self.current_floor.update(self.player, delta_time)
-
-            # Update attack effects
-            for effect in self.attack_effects:
-                effect.update(delta_time)
-            # Remove expired effects
-            self.attack_effects = [e for e in self.attack_effects if not e.is_expired()]
-
-            # Check player-enemy collision
-            self._check_player_enemy_collision()
-
-            # Check if player died
-            if not self.player.is_alive():
-                self._game_over()
-                return
+        """Step the simulation and update effects"""
+        self._apply_frame_rate()
+
+        # Fixed-step simulation: real time is banked and spent in whole ticks
+        # (at most a few per update, so a long stall drops time instead of spiralling)
+        max_steps = MAX_STEPS_PER_UPDATE
+        if self.replay_player:
+            if not self.replay_paused:
+                self.step_time += delta_time * self.replay_speed
+                max_steps *= math.ceil(self.replay_speed)
+        else:
+            self.step_time += delta_time
+        steps = min(int(self.step_time / SIM_TICK), max_steps)
+        self.step_time = min(self.step_time - steps * SIM_TICK, SIM_TICK)
+        for _ in range(steps):
+            self._step()
+        self._sync_menu()
 
-            # Check if floor cleared
-            if self.current_floor.is_cleared():
-                self._floor_cleared()
+        if self.state == GameState.PLAYING:
+            # Age and cull effect particles and damage numbers, run effect timers
+            self.effect_timers.advance(delta_time)
+            self.particles.update(delta_time)
+            self.damage_numbers.update(delta_time)
 
-            # Check for pending level ups
-            if self.pending_level_ups > 0 and self.state == GameState.PLAYING:
-                self.pending_level_ups -= 1
-                self._show_stat_upgrade()
+            # Reveal the minimap around the player (no-op until a new tile is entered)
+            self.minimap.reveal_around(self.player.center_x, self.player.center_y)
 
             # Center camera on player
             self._center_camera_on_player()
 
+    def _step(self):
+        """Advance the simulation one tick with queued input, or with the replay's"""
+        if self.replay_player:
+            events = self.replay_player.advance()
+            if events is None:
+                return
+            if self.replay_player.step % FPS == 0:
+                self._update_replay_caption()
+        else:
+            commands, self.commands = self.commands, []
+            if self.coop:
+                self.coop.poll()
+                events = self.sim.step(commands, partner_commands=self.coop.take_partner_commands())
+                self.coop.after_step(events)
+                if self.coop.steps % FPS == 0:
+                    self._update_coop_caption()
+            else:
+                self.replay.record(self.sim, commands)
+                events = self.sim.step(commands)
+        if self.shared_state:
+            self.shared_state.publish(self.sim)
+        self._handle_events(events)
+        self._sync_player_list()
+
+    def _update_coop_caption(self):
+        """Show the partner's connection counters in the title bar"""
+        stats = self.coop.stats()
+        if stats is None:
+            status = f"waiting for a partner on port {self.coop.port}"
+        else:
+            rtt = f"{stats['rtt_ms']:.0f}ms" if stats["rtt_ms"] is not None else "-"
+            status = (
+                f"partner up {stats['sent_per_second'] / 1024:.1f} KB/s, "
+                f"snapshot {stats['snapshot_bytes']:.0f} B, RTT {rtt}"
+            )
+        self.set_caption(f"{SCREEN_TITLE} - Co-op {status}")
+
+    def _handle_events(self, events):
+        """Turn simulation events into effects"""
+        for event in events:
+            kind = event[0]
+            if kind == EVENT_HIT:
+                enemy, damage, crit = event[1:]
+                self.particles.emit("hit", enemy.center_x, enemy.center_y)
+                self.damage_numbers.show(enemy.center_x, enemy.top, damage, crit)
+            elif kind == EVENT_ATTACK:
+                self.particles.emit("attack", event[1], event[2], reach=ATTACK_EFFECT_SIZE)
+            elif kind == EVENT_CAST:
+                skill, x, y, dir_x, dir_y = event[1:]
+                self.particles.emit(skill.id, x, y, dir_x, dir_y, reach=skill.range)
+            elif kind == EVENT_HURT:
+                self.trigger_camera_shake()
+            elif kind == EVENT_FLOOR:
+                self._enter_floor()
+
+    def _enter_floor(self):
+        """Reset the view for a new floor or a new run"""
+        self._reset_world_layers()
+        self.particles.clear()
+        self.damage_numbers.clear()
+
+        self._sync_player_list()
+
+        if self.camera_shake_end:
+            self.camera_shake_end.cancel()
+        self._stop_camera_shake()
+
+    def _sync_player_list(self):
+        """Draw the player, and the partner while it stands (it joins, leaves and goes down mid-floor)"""
+        players = [player for player in self.sim.players if player is self.player or player.is_alive()]
+        if self.player_list is None or list(self.player_list) != players:
+            self.player_list = arcade.SpriteList()
+            self.player_list.extend(players)
+
+    def _sync_menu(self):
+        """Open the menu for the simulation's state when it changes"""
+        sim = self.sim
+        if self.menu_state and self.menu_state[0] == sim.state and self.menu_state[1] is sim.choices:
+            return
+        self.menu_state = (sim.state, sim.choices)
+
+        if sim.state == GameState.STAT_UPGRADE:
+            self.current_menu = StatUpgradeMenu(self._on_choice_selected)
+        elif sim.state == GameState.TRAIT_SELECTION:
+            self.current_menu = TraitSelectionMenu(sim.choices, self._on_choice_selected)
+        elif sim.state == GameState.EVOLUTION_SELECTION:
+            self.current_menu = EvolutionSelectionMenu(sim.choices, self._on_choice_selected)
+        elif sim.state == GameState.GAME_OVER:
+            self.current_menu = GameOverMenu(sim.summary(), self._on_restart_selected)
+            self.save_replay()
+        else:
+            self.current_menu = None
+        self.request_redraw()
+
     def on_resize(self, width, height):
         """Handle window resize events"""
         super().on_resize(width, height)
@@ -326,202 +457,225 @@ class MonsterEvolutionGame(arcade.Window):
             self.hud.hud_y_start = height - 30
 
         # Recenter camera on player
-        if hasattr(self, 'player') and self.player:
+        if getattr(self, 'sim', None):
             self._center_camera_on_player()
 
+        # Recapture the frozen world at the new size
+        self.frozen_menu = None
+        self.request_redraw()
+
     def _center_camera_on_player(self):
         """Center the camera on the player (Camera2D semantics)"""
-        import random
-
         # Camera2D.position is the world-space center of the camera, not bottom-left
-        half_w = self.width / 2
-        half_h = self.height / 2
+        half_w = self.width / 2 / self.zoom
+        half_h = self.height / 2 / self.zoom
 
         map_w = MAP_WIDTH * TILE_SIZE
         map_h = MAP_HEIGHT * TILE_SIZE
 
-        # Clamp camera center so viewport never goes outside map bounds
-        target_x = max(half_w, min(self.player.center_x, map_w - half_w))
-        target_y = max(half_h, min(self.player.center_y, map_h - half_h))
+        # Clamp camera center so viewport never goes outside map bounds,
+        # or center the map when the view is larger than it
+        if half_w * 2 >= map_w:
+            target_x = map_w / 2
+        else:
+            target_x = max(half_w, min(self.player.center_x, map_w - half_w))
+        if half_h * 2 >= map_h:
+            target_y = map_h / 2
+        else:
+            target_y = max(half_h, min(self.player.center_y, map_h - half_h))
 
         # Store base position
         self.base_camera_x = target_x
         self.base_camera_y = target_y
 
         # Apply camera shake if active
-        if self.camera_shake_timer > 0:
-            shake_x = random.uniform(-self.camera_shake_magnitude, self.camera_shake_magnitude)
-            shake_y = random.uniform(-self.camera_shake_magnitude, self.camera_shake_magnitude)
+        if self.camera_shaking:
+            shake_x = self.shake_rng.uniform(-self.camera_shake_magnitude, self.camera_shake_magnitude)
+            shake_y = self.shake_rng.uniform(-self.camera_shake_magnitude, self.camera_shake_magnitude)
             target_x += shake_x
             target_y += shake_y
 
         if self.world_camera:
+            self.world_camera.zoom = self.zoom
             self.world_camera.position = (target_x, target_y)
 
-    def _show_stat_upgrade(self):
-        """Show stat upgrade menu"""
-        self.state = GameState.STAT_UPGRADE
-        self.current_menu = StatUpgradeMenu(self._on_stat_upgrade_selected)
-
-    def _on_stat_upgrade_selected(self, stat_id):
-        """Handle stat upgrade selection"""
-        if stat_id == "hp":
-            self.player.max_hp += 20
-            self.player.hp += 20
-        elif stat_id == "atk":
-            self.player.base_atk += 5
-        elif stat_id == "def":
-            self.player.base_def += 3
-
-        self.state = GameState.PLAYING
-        self.current_menu = None
-
-        # Check if player can evolve
-        self._check_evolution()
-
-    def _check_evolution(self):
-        """Check if player can evolve and show menu if so"""
-        evolution_options = get_evolution_options(self.player)
-        if evolution_options:
-            self.state = GameState.EVOLUTION_SELECTION
-            self.current_menu = EvolutionSelectionMenu(
-                evolution_options,
-                self._on_evolution_selected
-            )
-
-    def _on_evolution_selected(self, form_id):
-        """Handle evolution selection"""
-        evolve_player(self.player, form_id)
-        self._update_player_skills()
-
-        self.state = GameState.PLAYING
-        self.current_menu = None
-
-    def _floor_cleared(self):
-        """Handle floor cleared"""
-        # Show trait selection
-        owned_trait_ids = [t.id for t in self.player.traits]
-        available_traits = get_random_traits(3, owned_trait_ids)
-
-        if available_traits:
-            self.state = GameState.TRAIT_SELECTION
-            self.current_menu = TraitSelectionMenu(
-                available_traits,
-                self._on_trait_selected
-            )
-        else:
-            # No traits available, go to next floor
-            self._next_floor()
-
-    def _on_trait_selected(self, trait):
-        """Handle trait selection"""
-        self.player.add_trait(trait)
-
-        # Go to next floor
-        self._next_floor()
-
-    def _next_floor(self):
-        """Generate next floor"""
-        self.floor_number += 1
-        self.current_floor = DungeonFloor(self.floor_number)
-
-        # Spawn player at start
-        spawn_x, spawn_y = self.current_floor.get_player_spawn_position()
-        self.player.center_x = spawn_x
-        self.player.center_y = spawn_y
-
-        self.state = GameState.PLAYING
-        self.current_menu = None
-
-    def _game_over(self):
-        """Handle game over"""
-        stats = {
-            "form": self.player.current_form,
-            "level": self.player.level,
-            "floor": self.floor_number,
-            "trait_count": len(self.player.traits)
-        }
-
-        self.state = GameState.GAME_OVER
-        self.current_menu = GameOverMenu(stats, self._restart_game)
-
-    def _restart_game(self):
-        """Restart the game"""
-        self.setup()
-
-    def _draw_enemy_hp_bars(self):
-        """Draw HP bars above enemies"""
-        bar_width = 30
-        bar_height = 4
-        bar_offset_y = 8  # Pixels above enemy
-
-        for enemy in self.current_floor.enemies:
-            # Calculate HP ratio
-            hp_ratio = max(0, min(1, enemy.hp / enemy.max_hp))
-
-            # Bar position
-            bar_x = enemy.center_x
-            bar_y = enemy.top + bar_offset_y
-
-            # Background (empty HP)
-            arcade.draw_rect_filled(
-                arcade.XYWH(bar_x, bar_y, bar_width, bar_height),
-                COLOR_HP_EMPTY
-            )
-
-            # Foreground (current HP)
-            if hp_ratio > 0:
-                fill_width = bar_width * hp_ratio
-                fill_x = bar_x - (bar_width - fill_width) / 2
-                arcade.draw_rect_filled(
-                    arcade.XYWH(fill_x, bar_y, fill_width, bar_height),
-                    COLOR_HP_FILL
-                )
-
-            # Border
-            arcade.draw_rect_outline(
-                arcade.XYWH(bar_x, bar_y, bar_width, bar_height),
-                COLOR_UI_BORDER,
-                1
-            )
-
-    def on_draw(self):
-        """Draw the game"""
-        self.clear()
-
+    def _reset_world_layers(self):
+        """Rebuild the culled draw layers for the current floor"""
+        self.wall_layer = ChunkedLayer(self.current_floor.walls)
+        self.wall_lod_texture = bake_wall_texture(self.current_floor.wall_grid)
+        self.enemy_layer.clear()
+        self.enemy_hp_bars.clear()
+        self.minimap.reset(self.current_floor.wall_grid)
+
+    def _view_rect(self, margin=CULL_MARGIN):
+        """World-space (left, bottom, right, top) seen by the world camera, plus a margin"""
+        x, y = self.world_camera.position
+        zoom = self.world_camera.zoom
+        half_w = self.width / 2 / zoom + margin
+        half_h = self.height / 2 / zoom + margin
+        return x - half_w, y - half_h, x + half_w, y + half_h
+
+    def _draw_enemy_hp_bars(self, visible_enemies):
+        """Draw HP bars above on-screen enemies (one batched draw; culled enemies keep hidden bars)"""
+        self.enemy_hp_bars.sync(self.current_floor.enemies, visible_enemies)
+        self.enemy_hp_bars.draw()
+
+    def _draw_world(self):
+        """Draw the world through the world camera"""
         # --- 월드 카메라: 맵 / 적 / 플레이어 ---
         if self.world_camera:
             self.world_camera.use()
 
-        # Draw world
-        self.current_floor.walls.draw()
-        self.current_floor.enemies.draw()
-        self.player.draw()
-
-        # Draw attack effects
-        for effect in self.attack_effects:
-            effect.draw()
-
-        # Draw enemy HP bars
-        self._draw_enemy_hp_bars()
+        # Draw world, skipping walls and enemies outside the view
+        view = self._view_rect()
+        visible_enemies = self.enemy_layer.update(self.current_floor.enemy_index, *view)
+        if self.zoom < LOD_ZOOM_THRESHOLD:
+            self._draw_world_lod(visible_enemies)
+        else:
+            self.wall_layer.draw(*view)
+            self.enemy_layer.draw()
+            self.current_floor.projectiles.draw()
+            for player in self.player_list:
+                player.update_blink()
+            self.player_list.draw()
+
+            # Draw effect particles
+            self.particles.draw()
+
+            # Draw enemy HP bars and damage numbers above them
+            self._draw_enemy_hp_bars(visible_enemies)
+            self.damage_numbers.draw()
+
+        self.draw_stats = {
+            "walls": (self.wall_layer.drawn, self.wall_layer.culled),
+            "enemies": (self.enemy_layer.drawn, self.enemy_layer.culled),
+            "hp_bars": (len(visible_enemies), len(self.current_floor.enemies) - len(visible_enemies)),
+        }
 
+    def _draw_world_lod(self, visible_enemies):
+        """Zoomed-out world: baked walls, enemy points, no bars or effects"""
+        draw_wall_texture(self.wall_lod_texture, self.current_floor.wall_grid)
+        draw_enemy_points(visible_enemies, self.zoom)
+        self.current_floor.projectiles.draw()
+        for player in self.player_list:
+            player.update_blink()
+        self.player_list.draw()
+
+    def _draw_hud(self):
+        """Draw the HUD through the UI camera"""
         # --- UI 카메라: HUD / 메뉴 ---
         if self.ui_camera:
             self.ui_camera.use()
 
-        # Draw HUD
         if self.state in (GameState.PLAYING, GameState.STAT_UPGRADE):
             self.hud.draw(self.player, self.width, self.height)
+            self.minimap.draw(self.player, self.current_floor.enemies, self.width, self.height)
+
+    def _cache_frozen_world(self):
+        """Render the world and HUD once into an offscreen framebuffer"""
+        size = self.get_framebuffer_size()
+        if self.frozen_world is None or self.frozen_world.size != size:
+            self.frozen_world = self.ctx.framebuffer(color_attachments=[self.ctx.texture(size)])
+            self.frozen_world_quad = arcade.gl.geometry.quad_2d_fs()
+
+        with self.frozen_world.activate():
+            self.frozen_world.clear(color=self.background_color)
+            self._draw_world()
+            self._draw_hud()
+
+    def request_redraw(self):
+        """Redraw the next idle frame (after input, resize or expose)"""
+        self.needs_redraw = True
+
+    def _apply_frame_rate(self):
+        """Throttle updates and draws while a menu is open, and draws while unfocused"""
+        update_rate = 1 / (IDLE_FPS if self.current_menu else FPS)
+        draw_rate = update_rate if self.has_focus else max(update_rate, 1 / UNFOCUSED_FPS)
+        if (update_rate, draw_rate) == self.frame_rates:
+            return
 
-        # Draw menus
-        if self.current_menu:
-            self.current_menu.draw()
+        # Update rate first: the draw rate may never be faster than it
+        self.frame_rates = (update_rate, draw_rate)
+        self.set_update_rate(update_rate)
+        self.set_draw_rate(draw_rate)
+
+    def on_activate(self):
+        """Window gained focus"""
+        self.has_focus = True
+        self.request_redraw()
+        self._apply_frame_rate()
+
+    def on_deactivate(self):
+        """Window lost focus"""
+        self.has_focus = False
+        self._apply_frame_rate()
+
+    def on_expose(self):
+        """Window contents were damaged and must be redrawn"""
+        self.request_redraw()
+
+    def flip(self):
+        """Present the frame, unless on_draw left the previous one on screen"""
+        if self.skip_flip:
+            self.skip_flip = False
+            return
+        super().flip()
+
+    def on_draw(self):
+        """Draw the game"""
+        if self.current_menu is None:
+            self.frozen_menu = None
+            self.clear()
+            self._draw_world()
+            self._draw_hud()
+            return
+
+        # Idle mode: the world is frozen behind a menu, so only redraw after input
+        if self.frozen_menu is self.current_menu and not self.needs_redraw:
+            self.skip_flip = True
+            return
+        self.needs_redraw = False
+
+        if self.frozen_menu is not self.current_menu:
+            self._cache_frozen_world()
+            self.frozen_menu = self.current_menu
+
+        self.ui_camera.use()
+        self.frozen_world.color_attachments[0].use(0)
+        with self.ctx.enabled_only():
+            self.frozen_world_quad.render(self.ctx.utility_textured_quad_program)
+        self.current_menu.draw(self.width, self.height)
 
 
 def main():
     """Main entry point"""
-    game = MonsterEvolutionGame()
-    arcade.run()
+    parser = argparse.ArgumentParser(description=SCREEN_TITLE)
+    parser.add_argument("--replay", help="watch a recorded session instead of playing")
+    parser.add_argument("--trust-keyframes", action="store_true",
+                        help="load the replay's pickled keyframes for instant seeking")
+    parser.add_argument("--coop-host", type=int, nargs="?", const=COOP_PORT, metavar="PORT",
+                        help=f"let a co-op partner join on a TCP port (default {COOP_PORT})")
+    parser.add_argument("--coop-join", metavar="HOST[:PORT]", help="join a co-op host as its partner")
+    parser.add_argument("--share-state", nargs="?", const=SHARED_STATE_NAME, metavar="NAME",
+                        help=f"publish every tick to a shared memory block (default {SHARED_STATE_NAME})")
+    args = parser.parse_args()
+
+    if args.coop_join:
+        address, _, port = args.coop_join.partition(":")
+        CoopClientWindow(address or "127.0.0.1", int(port) if port else COOP_PORT)
+        arcade.run()
+        return
+
+    game = MonsterEvolutionGame(args.replay, args.trust_keyframes, args.coop_host, args.share_state)
+    try:
+        arcade.run()
+    finally:
+        # Keep the replay even when the game crashes
+        game.save_replay()
+        if game.coop:
+            game.coop.close()
+        if game.shared_state:
+            game.shared_state.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,652 @@
+"""
+Local co-op over TCP
+
+The host runs the authoritative GameSimulation and gives its partner seat to
+one remote client. Both ends exchange length-prefixed messages over a
+non-blocking TCP socket that is polled once per step, so the game window and
+headless loops can both drive it:
+
+- client -> host: the partner's commands and an ack of the newest snapshot
+- host -> client: the floor layout whenever a floor starts, then snapshots of
+  player, enemy and effect state COOP_SNAPSHOT_RATE times per second
+
+Snapshots are quantized, with positions in 1/4 pixels and every value as a
+16-bit integer. They are delta-compressed against the newest snapshot the
+client has acked, so only changed fields of changed entities and removals are
+sent, and the body is then zlib-compressed. Projectiles and effects (swings,
+casts and hits since the last snapshot) are short-lived, so they are always
+sent whole. Clients render COOP_INTERP_DELAY behind the newest snapshot and
+interpolate positions between the two snapshots around that time.
+
+Every message carries the sender's clock, the newest peer clock it has seen
+and how long it has held it, so both ends can measure round-trip time.
+NetStats counts bytes and messages in each direction.
+"""
+
+import json
+import socket
+import struct
+import time
+import zlib
+from collections import deque
+import numpy as np
+from .config import *
+from .simulation import (
+    SIM_TICK,
+    STATES,
+    FORMS,
+    ENEMY_KINDS,
+    CMD_MOVE,
+    CMD_ATTACK,
+    CMD_SKILL,
+    EVENT_FLOOR,
+    EVENT_ATTACK,
+    EVENT_CAST,
+    EVENT_HIT,
+)
+
+PROTOCOL_VERSION = 1
+
+# Message types
+MSG_HELLO = 1  # host -> client: JSON session info
+MSG_FLOOR = 2  # host -> client: floor number and packed wall grid
+MSG_SNAPSHOT = 3  # host -> client: delta-compressed state
+MSG_INPUT = 4  # client -> host: snapshot ack and partner commands
+
+FRAME = struct.Struct("!IB")  # Length of what follows the length, message type
+CLOCK = struct.Struct("!III")  # Sender's clock, newest peer clock, ms it was held (wrapping ms)
+SNAPSHOT_HEADER = struct.Struct("!IIIBH")  # Seq, baseline seq (0: none), host step, state, floor
+FLOOR_HEADER = struct.Struct("!HBB")  # Floor, rows, columns
+INPUT_HEADER = struct.Struct("!I")  # Newest snapshot seq received
+EFFECT = struct.Struct("!BHHH")  # Kind, x, y, value
+
+POSITION_SCALE = 4  # Quantized positions are in 1/4 pixels
+PLAYER_FIELDS = ("alive", "x", "y", "hp", "max_hp", "level", "form")
+ENEMY_FIELDS = ("kind", "x", "y", "hp", "max_hp")
+EFFECT_ATTACK, EFFECT_CAST, EFFECT_HIT, EFFECT_CRIT = range(4)
+
+EMPTY_STATE = {"players": {}, "enemies": {}}
+
+
+def _valid_partner_command(command, skill_count):
+    """Whether a decoded client command is one the partner may give, with in-range arguments"""
+    if not isinstance(command, list) or not command:
+        return False
+    name, args = command[0], command[1:]
+    if name == CMD_MOVE:
+        return len(args) == 2 and all(type(value) is int and value in (-1, 0, 1) for value in args)
+    if name == CMD_ATTACK:
+        return not args
+    if name == CMD_SKILL:
+        return len(args) == 1 and type(args[0]) is int and 0 <= args[0] < skill_count
+    return False
+
+
+def _clock_ms():
+    """Local clock in wrapping 32-bit milliseconds"""
+    return int(time.perf_counter() * 1000) & 0xFFFFFFFF
+
+
+def _quantize(value):
+    """Clamp to an unsigned 16-bit integer"""
+    return max(0, min(0xFFFF, int(round(value))))
+
+
+def _quantize_position(value):
+    """World pixels to 1/4-pixel units"""
+    return _quantize(value * POSITION_SCALE)
+
+
+class NetStats:
+    """Traffic and round-trip counters of one connection"""
+
+    def __init__(self, window=1.0):
+        self.window = window  # Seconds the rates are averaged over
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.history = deque()  # (time, bytes sent, bytes received) totals
+        self.rtt_ms = None  # Smoothed round-trip time
+        self.rtt_last_ms = None
+
+    def sent(self, size):
+        """Count an outgoing message"""
+        self.bytes_sent += size
+        self.messages_sent += 1
+
+    def received(self, size):
+        """Count an incoming message"""
+        self.bytes_received += size
+        self.messages_received += 1
+
+    def rtt_sample(self, ms):
+        """Fold in one round-trip measurement"""
+        self.rtt_last_ms = ms
+        self.rtt_ms = ms if self.rtt_ms is None else self.rtt_ms * 0.9 + ms * 0.1
+
+    def rates(self):
+        """(bytes sent, bytes received) per second over the last window"""
+        now = time.perf_counter()
+        self.history.append((now, self.bytes_sent, self.bytes_received))
+        while len(self.history) > 2 and now - self.history[1][0] >= self.window:
+            self.history.popleft()
+        start, sent, received = self.history[0]
+        elapsed = now - start
+        if elapsed <= 0:
+            return 0.0, 0.0
+        return (self.bytes_sent - sent) / elapsed, (self.bytes_received - received) / elapsed
+
+    def summary(self):
+        """Counters and rates as a dict"""
+        sent_rate, received_rate = self.rates()
+        return {
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "messages_sent": self.messages_sent,
+            "messages_received": self.messages_received,
+            "sent_per_second": sent_rate,
+            "received_per_second": received_rate,
+            "rtt_ms": self.rtt_ms,
+        }
+
+
+class Connection:
+    """Length-prefixed messages over a non-blocking TCP socket"""
+
+    def __init__(self, sock):
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = sock
+        self.outbox = bytearray()
+        self.inbox = bytearray()
+        self.closed = False
+        self.stats = NetStats()
+        self.peer_clock = None  # Newest clock the peer sent, and when it arrived
+        self.peer_clock_at = 0
+
+    def send(self, kind, payload):
+        """Queue a message (flush() or pump() sends it)"""
+        frame = FRAME.pack(len(payload) + 1, kind) + payload
+        self.outbox += frame
+        self.stats.sent(len(frame))
+
+    def flush(self):
+        """Send as much of the outbox as the socket takes"""
+        try:
+            while self.outbox:
+                sent = self.sock.send(self.outbox)
+                del self.outbox[:sent]
+        except BlockingIOError:
+            pass
+        except OSError:
+            self.closed = True
+
+    def pump(self):
+        """Flush, then return every complete message received as (kind, payload)"""
+        self.flush()
+        while not self.closed:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self.closed = True
+                break
+            self.inbox += data
+
+        messages = []
+        while len(self.inbox) >= FRAME.size:
+            length, kind = FRAME.unpack_from(self.inbox)
+            if not 1 <= length <= COOP_MAX_MESSAGE:
+                # Not a frame we could have sent: the stream can't be trusted past here
+                self.inbox.clear()
+                self.closed = True
+                break
+            end = 4 + length
+            if len(self.inbox) < end:
+                break
+            messages.append((kind, bytes(self.inbox[FRAME.size:end])))
+            del self.inbox[:end]
+            self.stats.received(end)
+        return messages
+
+    def clock(self):
+        """Clock header: our clock, the peer's newest clock and how long we've held it"""
+        now = _clock_ms()
+        if self.peer_clock is None:
+            return CLOCK.pack(now, 0, 0)
+        return CLOCK.pack(now, self.peer_clock, (now - self.peer_clock_at) & 0xFFFFFFFF)
+
+    def read_clock(self, payload):
+        """Read a clock header, sampling round-trip time; returns its size"""
+        stamp, echo, held = CLOCK.unpack_from(payload)
+        now = _clock_ms()
+        self.peer_clock, self.peer_clock_at = stamp, now
+        if echo:
+            self.stats.rtt_sample((now - echo - held) & 0xFFFFFFFF)
+        return CLOCK.size
+
+    def close(self):
+        """Close the socket"""
+        self.closed = True
+        self.sock.close()
+
+
+def _encode_entities(current, baseline):
+    """Removed keys, then changed entities as (key, changed-field mask, changed values)"""
+    removed = [key for key in baseline if key not in current]
+    parts = [struct.pack(f"!H{len(removed)}H", len(removed), *removed)]
+
+    changed = []
+    for key, values in current.items():
+        old = baseline.get(key)
+        if old == values:
+            continue
+        mask = 0
+        fields = []
+        for index, value in enumerate(values):
+            if old is None or old[index] != value:
+                mask |= 1 << index
+                fields.append(value)
+        changed.append(struct.pack(f"!HB{len(fields)}H", key, mask, *fields))
+    parts.append(struct.pack("!H", len(changed)))
+    parts.extend(changed)
+    return b"".join(parts)
+
+
+def _decode_entities(body, offset, baseline, field_count):
+    """Inverse of _encode_entities; returns (entities, new offset)"""
+    (count,) = struct.unpack_from("!H", body, offset)
+    removed = set(struct.unpack_from(f"!{count}H", body, offset + 2))
+    offset += 2 + 2 * count
+    entities = {key: values for key, values in baseline.items() if key not in removed}
+
+    (count,) = struct.unpack_from("!H", body, offset)
+    offset += 2
+    for _ in range(count):
+        key, mask = struct.unpack_from("!HB", body, offset)
+        offset += 3
+        changed = struct.unpack_from(f"!{bin(mask).count('1')}H", body, offset)
+        offset += 2 * len(changed)
+        values = list(entities.get(key, (0,) * field_count))
+        changed = iter(changed)
+        for index in range(field_count):
+            if mask & (1 << index):
+                values[index] = next(changed)
+        entities[key] = tuple(values)
+    return entities, offset
+
+
+def encode_snapshot(state, baseline):
+    """Snapshot body: player and enemy deltas against baseline, then projectiles and effects whole"""
+    projectiles = state["projectiles"]
+    effects = state["effects"][:0xFFFF]
+    return b"".join([
+        _encode_entities(state["players"], baseline["players"]),
+        _encode_entities(state["enemies"], baseline["enemies"]),
+        struct.pack("!H", len(projectiles) // 4),
+        projectiles,
+        struct.pack("!H", len(effects)),
+        *(EFFECT.pack(*effect) for effect in effects),
+    ])
+
+
+def decode_snapshot(body, baseline):
+    """Inverse of encode_snapshot"""
+    players, offset = _decode_entities(body, 0, baseline["players"], len(PLAYER_FIELDS))
+    enemies, offset = _decode_entities(body, offset, baseline["enemies"], len(ENEMY_FIELDS))
+    (count,) = struct.unpack_from("!H", body, offset)
+    offset += 2
+    projectiles = body[offset:offset + count * 4]
+    offset += count * 4
+    (count,) = struct.unpack_from("!H", body, offset)
+    offset += 2
+    effects = [EFFECT.unpack_from(body, offset + index * EFFECT.size) for index in range(count)]
+    return {"players": players, "enemies": enemies, "projectiles": projectiles, "effects": effects}
+
+
+class CoopHost:
+    """Serves the partner seat of a simulation to one TCP client"""
+
+    def __init__(self, sim, port=COOP_PORT, snapshot_rate=COOP_SNAPSHOT_RATE, address="127.0.0.1"):
+        self.sim = sim
+        self.listener = socket.create_server((address, port))
+        self.listener.setblocking(False)
+        self.port = self.listener.getsockname()[1]  # Port 0 picks a free one
+        self.snapshot_steps = max(1, round(FPS / snapshot_rate))
+
+        self.connection = None
+        self.partner_commands = []
+        self.steps = 0  # Steps since the host started (snapshot time base)
+
+        # Delta state: snapshots sent by seq, and the newest the client acked
+        self.seq = 0
+        self.sent = {}
+        self.acked = 0
+        self.enemy_ids = {}
+        self.next_enemy_id = 1
+        self.effects = []
+        self.snapshot_sizes = deque(maxlen=100)
+
+    @property
+    def connected(self):
+        """Whether a client holds the partner seat"""
+        return self.connection is not None
+
+    def poll(self):
+        """Accept a client and read its input (call once per step, before stepping)"""
+        if self.connection is None:
+            try:
+                sock, _ = self.listener.accept()
+            except BlockingIOError:
+                return
+            self._join(sock)
+
+        for kind, payload in self.connection.pump():
+            if kind == MSG_INPUT:
+                try:
+                    self._on_input(payload)
+                except (ValueError, struct.error, TypeError):
+                    # Malformed input (JSONDecodeError is a ValueError): drop the client, keep the game
+                    self.connection.closed = True
+                    break
+        if self.connection.closed:
+            self._leave()
+
+    def _join(self, sock):
+        """Seat a new client as the partner"""
+        self.connection = Connection(sock)
+        self.sim.add_partner()
+        self.seq = 0
+        self.sent = {}
+        self.acked = 0
+        self.effects = []
+        hello = {"version": PROTOCOL_VERSION, "slot": 1, "fps": FPS, "snapshot_rate": FPS / self.snapshot_steps}
+        self.connection.send(MSG_HELLO, json.dumps(hello).encode())
+        self._send_floor()
+        self.connection.flush()
+
+    def _leave(self):
+        """Free the partner seat"""
+        self.connection.close()
+        self.connection = None
+        self.partner_commands = []
+        if self.sim.partner:
+            self.sim.remove_partner()
+
+    def _on_input(self, payload):
+        """Take a client's snapshot ack and queue its commands"""
+        offset = self.connection.read_clock(payload)
+        (ack,) = INPUT_HEADER.unpack_from(payload, offset)
+        offset += INPUT_HEADER.size
+        if ack in self.sent:
+            self.acked = max(self.acked, ack)
+        if len(payload) > offset:
+            commands = json.loads(payload[offset:])
+            if not isinstance(commands, list):
+                raise TypeError("partner commands must be a list")
+            skill_count = len(self.sim.partner.skills) if self.sim.partner else 0
+            for command in commands:
+                if _valid_partner_command(command, skill_count):
+                    self.partner_commands.append(tuple(command))
+
+    def take_partner_commands(self):
+        """Commands the partner sent since the last step"""
+        commands, self.partner_commands = self.partner_commands, []
+        return commands
+
+    def after_step(self, events):
+        """Collect a step's effects and floor changes, and send a snapshot when one is due"""
+        self.steps += 1
+        if self.connection is None:
+            return
+
+        for event in events:
+            kind = event[0]
+            if kind == EVENT_FLOOR:
+                self._send_floor()
+            elif kind == EVENT_ATTACK:
+                self.effects.append((EFFECT_ATTACK, _quantize_position(event[1]), _quantize_position(event[2]), 0))
+            elif kind == EVENT_CAST:
+                self.effects.append((EFFECT_CAST, _quantize_position(event[2]), _quantize_position(event[3]), 0))
+            elif kind == EVENT_HIT:
+                enemy, damage, crit = event[1:]
+                self.effects.append((
+                    EFFECT_CRIT if crit else EFFECT_HIT,
+                    _quantize_position(enemy.center_x), _quantize_position(enemy.center_y), _quantize(damage),
+                ))
+
+        if self.steps % self.snapshot_steps == 0:
+            self._send_snapshot()
+        self.connection.flush()
+
+    def _send_floor(self):
+        """Send the current floor's wall grid, bit-packed"""
+        grid = self.sim.current_floor.wall_grid
+        rows, cols = grid.shape
+        payload = FLOOR_HEADER.pack(self.sim.floor_number, rows, cols) + np.packbits(grid).tobytes()
+        self.connection.send(MSG_FLOOR, payload)
+
+    def _enemy_id(self, enemy):
+        """Stable wire id of an enemy"""
+        net_id = self.enemy_ids.get(enemy)
+        if net_id is None:
+            net_id = self.enemy_ids[enemy] = self.next_enemy_id
+            self.next_enemy_id = self.next_enemy_id % 0xFFFF + 1
+        return net_id
+
+    def capture(self):
+        """Quantized state of the simulation"""
+        sim = self.sim
+        players = {}
+        for slot, player in enumerate(sim.players):
+            players[slot] = (
+                int(player.is_alive()),
+                _quantize_position(player.center_x),
+                _quantize_position(player.center_y),
+                _quantize(player.hp),
+                _quantize(player.max_hp),
+                _quantize(player.level),
+                FORMS.index(player.current_form),
+            )
+
+        enemies = {}
+        for enemy in sim.current_floor.enemies:
+            enemies[self._enemy_id(enemy)] = (
+                ENEMY_KINDS.index(type(enemy).__name__),
+                _quantize_position(enemy.center_x),
+                _quantize_position(enemy.center_y),
+                _quantize(enemy.hp),
+                _quantize(enemy.max_hp),
+            )
+        self.enemy_ids = {enemy: self.enemy_ids[enemy] for enemy in sim.current_floor.enemies}
+
+        # Projectiles as (x | owner << 15, y) pairs
+        x, y, owner = sim.current_floor.projectiles.live()
+        x = np.clip(np.rint(x * POSITION_SCALE), 0, 0x7FFF).astype(np.uint16)
+        x |= owner.astype(np.uint16) << 15
+        y = np.clip(np.rint(y * POSITION_SCALE), 0, 0xFFFF).astype(np.uint16)
+        projectiles = np.column_stack((x, y)).astype(">u2").tobytes()
+
+        return {"players": players, "enemies": enemies, "projectiles": projectiles, "effects": self.effects}
+
+    def _send_snapshot(self):
+        """Send the state, delta-compressed against the newest acked snapshot"""
+        state = self.capture()
+        self.seq += 1
+        baseline = self.sent.get(self.acked)
+        base_seq = self.acked if baseline else 0
+
+        body = zlib.compress(encode_snapshot(state, baseline or EMPTY_STATE))
+        header = SNAPSHOT_HEADER.pack(
+            self.seq, base_seq, self.steps, STATES.index(self.sim.state), self.sim.floor_number
+        )
+        payload = self.connection.clock() + header + body
+        self.connection.send(MSG_SNAPSHOT, payload)
+        self.snapshot_sizes.append(FRAME.size + len(payload))
+
+        self.sent[self.seq] = state
+        self.sent.pop(self.seq - COOP_BASELINES, None)
+        self.effects = []
+
+    def stats(self):
+        """Connection counters plus the mean snapshot size"""
+        if self.connection is None:
+            return None
+        summary = self.connection.stats.summary()
+        summary["snapshot_bytes"] = sum(self.snapshot_sizes) / max(1, len(self.snapshot_sizes))
+        return summary
+
+    def close(self):
+        """Drop the client and stop listening"""
+        if self.connection:
+            self._leave()
+        self.listener.close()
+
+
+class CoopClient:
+    """Plays the partner seat of a remote host"""
+
+    def __init__(self, address="127.0.0.1", port=COOP_PORT, timeout=5.0):
+        self.connection = Connection(socket.create_connection((address, port), timeout))
+        self.hello = None
+        self.floor = None
+        self.wall_grid = None
+
+        self.baselines = {}  # seq -> decoded state
+        self.newest = 0  # Newest snapshot seq received
+        self.acked = 0  # Newest seq acked to the host
+        self.buffer = deque(maxlen=COOP_SNAPSHOT_RATE * 2)  # Decoded snapshots for interpolation
+        self.clock_offsets = deque(maxlen=COOP_SNAPSHOT_RATE * 2)  # Local arrival minus host time
+        self.effects = []
+        self.pending = []
+        self.snapshot_sizes = deque(maxlen=100)
+
+    @property
+    def connected(self):
+        """Whether the host is still there"""
+        return not self.connection.closed
+
+    @property
+    def slot(self):
+        """Player slot this client controls"""
+        return self.hello["slot"] if self.hello else 1
+
+    def send(self, commands):
+        """Queue partner commands for the next poll"""
+        self.pending.extend(list(command) for command in commands)
+
+    def poll(self):
+        """Read host messages, then send queued commands and the snapshot ack"""
+        for kind, payload in self.connection.pump():
+            if kind == MSG_HELLO:
+                self.hello = json.loads(payload)
+            elif kind == MSG_FLOOR:
+                self._on_floor(payload)
+            elif kind == MSG_SNAPSHOT:
+                self._on_snapshot(payload)
+
+        if self.pending or self.newest != self.acked:
+            payload = self.connection.clock() + INPUT_HEADER.pack(self.newest)
+            if self.pending:
+                payload += json.dumps(self.pending, separators=(",", ":")).encode()
+            self.connection.send(MSG_INPUT, payload)
+            self.connection.flush()
+            self.pending = []
+            self.acked = self.newest
+
+    def _on_floor(self, payload):
+        """Unpack a floor's wall grid"""
+        self.floor, rows, cols = FLOOR_HEADER.unpack_from(payload)
+        bits = np.frombuffer(payload, dtype=np.uint8, offset=FLOOR_HEADER.size)
+        self.wall_grid = np.unpackbits(bits)[:rows * cols].reshape(rows, cols).astype(bool)
+
+    def _on_snapshot(self, payload):
+        """Rebuild a snapshot from its baseline and buffer it"""
+        offset = self.connection.read_clock(payload)
+        seq, base_seq, step, state, floor = SNAPSHOT_HEADER.unpack_from(payload, offset)
+        offset += SNAPSHOT_HEADER.size
+        baseline = self.baselines.get(base_seq) if base_seq else EMPTY_STATE
+        if baseline is None:
+            return  # Baseline already dropped; the host falls back to a full snapshot once acks catch up
+
+        snapshot = decode_snapshot(zlib.decompress(payload[offset:]), baseline)
+        snapshot.update(seq=seq, time=step * SIM_TICK, state=STATES[state], floor=floor)
+        self.baselines[seq] = snapshot
+        self.baselines.pop(seq - COOP_BASELINES, None)
+        self.newest = seq
+        self.buffer.append(snapshot)
+        self.clock_offsets.append(time.perf_counter() - snapshot["time"])
+        self.effects.extend(snapshot["effects"])
+        self.snapshot_sizes.append(FRAME.size + len(payload))
+
+    def take_effects(self):
+        """Effects received since the last call, as (kind, x, y, value) in world pixels"""
+        effects = [(kind, x / POSITION_SCALE, y / POSITION_SCALE, value) for kind, x, y, value in self.effects]
+        self.effects = []
+        return effects
+
+    def view(self, now=None):
+        """
+        World state COOP_INTERP_DELAY behind the newest snapshot (None before the first)
+        Positions are interpolated between the two snapshots around that time;
+        anything in only one of them is shown as in the later one.
+        """
+        if not self.buffer:
+            return None
+        if now is None:
+            now = time.perf_counter()
+
+        # The smallest offset is the least delayed arrival seen recently
+        render_time = now - min(self.clock_offsets) - COOP_INTERP_DELAY
+        later = next((snapshot for snapshot in self.buffer if snapshot["time"] >= render_time), self.buffer[-1])
+        index = self.buffer.index(later)
+        earlier = self.buffer[index - 1] if index > 0 else later
+        span = later["time"] - earlier["time"]
+        alpha = min(1.0, max(0.0, (render_time - earlier["time"]) / span)) if span > 0 else 1.0
+
+        def blend(current, previous, fields):
+            entities = {}
+            for key, values in current.items():
+                old = previous.get(key)
+                entity = dict(zip(fields, values))
+                if old is not None:
+                    entity["x"] = old[1] + (values[1] - old[1]) * alpha
+                    entity["y"] = old[2] + (values[2] - old[2]) * alpha
+                entity["x"] /= POSITION_SCALE
+                entity["y"] /= POSITION_SCALE
+                entities[key] = entity
+            return entities
+
+        players = blend(later["players"], earlier["players"], PLAYER_FIELDS)
+        for player in players.values():
+            player["form"] = FORMS[player["form"]]
+        enemies = blend(later["enemies"], earlier["enemies"], ENEMY_FIELDS)
+        for enemy in enemies.values():
+            enemy["kind"] = ENEMY_KINDS[enemy["kind"]]
+
+        packed = np.frombuffer(later["projectiles"], dtype=">u2").reshape(-1, 2)
+        projectiles = [
+            (int(x) >> 15, (int(x) & 0x7FFF) / POSITION_SCALE, int(y) / POSITION_SCALE) for x, y in packed
+        ]
+        return {
+            "time": render_time,
+            "state": later["state"],
+            "floor": later["floor"],
+            "players": players,
+            "enemies": enemies,
+            "projectiles": projectiles,
+        }
+
+    def stats(self):
+        """Connection counters plus the mean snapshot size"""
+        summary = self.connection.stats.summary()
+        summary["snapshot_bytes"] = sum(self.snapshot_sizes) / max(1, len(self.snapshot_sizes))
+        return summary
+
+    def close(self):
+        """Leave the session"""
+        self.connection.close()
@@ -0,0 +1,251 @@
+"""
+Scripted bot policies for automated play
+
+A policy looks at an Observation of the simulation (player, enemies,
+cooldowns, HP, open choices) and returns the commands for this tick, the same
+inputs the window produces from key presses. Menus are answered with the
+policy's standard picks. Decisions are plain arithmetic over a handful of
+tuples so bots stay cheap next to the simulation itself.
+"""
+
+import math
+import random
+from .config import *
+from .simulation import (
+    GameState,
+    CMD_MOVE,
+    CMD_ATTACK,
+    CMD_SKILL,
+    CMD_SELECT,
+)
+
+
+class Observation:
+    """What a policy sees of the simulation on one tick"""
+
+    def __init__(self, sim):
+        player = sim.player
+        now = sim.timers.now
+
+        self.state = sim.state
+        self.tick = sim.tick
+        self.floor = sim.floor_number
+
+        # Player
+        self.x = player.center_x
+        self.y = player.center_y
+        self.hp = player.hp
+        self.max_hp = player.max_hp
+        self.level = player.level
+        self.form = player.current_form
+        self.facing = (player.facing_x, player.facing_y)
+        self.attack_ready = player.can_attack()
+        self.skills = [(skill.can_use(now), skill.range) for skill in player.skills]  # (ready, range)
+
+        # Enemies as (x, y, hp, archetype)
+        self.enemies = [
+            (enemy.center_x, enemy.center_y, enemy.hp, type(enemy).__name__)
+            for enemy in sim.current_floor.enemies
+        ]
+        self.wall_grid = sim.current_floor.wall_grid
+
+        # Open selection as ids (stat ids, trait ids or form ids)
+        if sim.state == GameState.TRAIT_SELECTION:
+            self.choices = [trait.id for trait in sim.choices]
+        else:
+            self.choices = list(sim.choices)
+
+    def nearest_enemy(self):
+        """Get (enemy, distance) of the closest enemy, or (None, inf)"""
+        best = None
+        best_sq = math.inf
+        x, y = self.x, self.y
+        for enemy in self.enemies:
+            dx = enemy[0] - x
+            dy = enemy[1] - y
+            dist_sq = dx * dx + dy * dy
+            if dist_sq < best_sq:
+                best = enemy
+                best_sq = dist_sq
+        return best, math.sqrt(best_sq)
+
+
+def observe(sim):
+    """Build the observation of a simulation's current tick"""
+    return Observation(sim)
+
+
+DIRECTIONS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+DETOUR_TICKS = 20  # Ticks spent walking a detour before heading for the target again
+
+
+def _axis(delta, dead_zone=TILE_SIZE / 4):
+    """Turn a distance along one axis into a -1/0/1 key direction"""
+    return (delta > dead_zone) - (delta < -dead_zone)
+
+
+class Policy:
+    """Base policy: standard menu picks plus stuck-aware steering; subclasses play"""
+
+    # Standard picks; the first listed option that is offered wins
+    stat_order = ("atk", "hp", "def")  # Cycled through, except "hp" when below half health
+    trait_preference = (
+        "lifesteal", "berserker_rage", "deadly_precision", "predator_instinct", "vitality_boost",
+        "regrowth", "armor_shell", "iron_hide", "quick_fury", "rune_surge",
+    )
+    evolution_preference = (
+        "drakelet", "youngdragon", "ancientdragon", "skywhale",
+        "beastling", "direwolf", "fenrir", "rockcore", "stonegolem", "titangolem",
+    )
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)  # Never the shared random module, so bots don't shift the game's rolls
+        self.stat_picks = 0
+
+        # Steering: when a move doesn't change position, detour sideways for a while
+        self.last_position = None
+        self.last_move = (0, 0)
+        self.detour = None
+        self.detour_ticks = 0
+
+    def decide(self, obs):
+        """Get this tick's commands for any state"""
+        if obs.state == GameState.PLAYING:
+            return self.act(obs)
+        if obs.state == GameState.STAT_UPGRADE:
+            return [(CMD_SELECT, self.pick_stat(obs))]
+        if obs.state == GameState.TRAIT_SELECTION:
+            return [(CMD_SELECT, self.pick_preferred(obs.choices, self.trait_preference))]
+        if obs.state == GameState.EVOLUTION_SELECTION:
+            return [(CMD_SELECT, self.pick_preferred(obs.choices, self.evolution_preference))]
+        return []
+
+    def act(self, obs):
+        """Get commands while playing"""
+        raise NotImplementedError
+
+    def pick_stat(self, obs):
+        """Index of the stat upgrade to take"""
+        if obs.hp < obs.max_hp / 2 and "hp" in obs.choices:
+            return obs.choices.index("hp")
+        stat_id = self.stat_order[self.stat_picks % len(self.stat_order)]
+        self.stat_picks += 1
+        return obs.choices.index(stat_id) if stat_id in obs.choices else 0
+
+    def pick_preferred(self, choices, preference):
+        """Index of the most preferred offered choice (first offered if none are listed)"""
+        for choice_id in preference:
+            if choice_id in choices:
+                return choices.index(choice_id)
+        return 0
+
+    def steer(self, obs, move_x, move_y):
+        """Get the move command toward a direction, detouring around walls that block it"""
+        position = (obs.x, obs.y)
+        blocked = self.last_move != (0, 0) and position == self.last_position
+        if blocked and (move_x or move_y or self.detour_ticks):
+            # Last move went nowhere: head off in some other direction for a while
+            self.detour = self.rng.choice([d for d in DIRECTIONS if d != self.last_move])
+            self.detour_ticks = DETOUR_TICKS
+        if self.detour_ticks > 0:
+            self.detour_ticks -= 1
+            move_x, move_y = self.detour
+
+        self.last_position = position
+        self.last_move = (move_x, move_y)
+        return (CMD_MOVE, move_x, move_y)
+
+    def cast_ready_skills(self, obs, distance, commands):
+        """Add a cast for every ready skill whose range reaches distance"""
+        for slot, (ready, reach) in enumerate(obs.skills):
+            if ready and distance <= reach:
+                commands.append((CMD_SKILL, slot))
+
+
+class GreedyMeleePolicy(Policy):
+    """Run at the nearest enemy, swing whenever in range, fire skills that reach"""
+
+    def act(self, obs):
+        """Close in and attack"""
+        target, distance = obs.nearest_enemy()
+        if target is None:
+            return [self.steer(obs, 0, 0)]
+
+        commands = [self.steer(obs, _axis(target[0] - obs.x), _axis(target[1] - obs.y))]
+        if obs.attack_ready and distance <= settings.ATTACK_RANGE:
+            commands.append((CMD_ATTACK,))
+        self.cast_ready_skills(obs, distance, commands)
+        return commands
+
+
+class KiteSkillPolicy(Policy):
+    """Hold enemies at skill range, backing off while skills cool down"""
+
+    stat_order = ("hp", "atk", "def")
+
+    @property
+    def kite_range(self):
+        """Back off inside this distance while nothing is ready (follows settings overrides)"""
+        return settings.ATTACK_RANGE * 2
+
+    def act(self, obs):
+        """Keep distance, cast when skills are up, swing only when cornered"""
+        target, distance = obs.nearest_enemy()
+        if target is None:
+            return [self.steer(obs, 0, 0)]
+
+        dx = target[0] - obs.x
+        dy = target[1] - obs.y
+        ready_reach = max((reach for ready, reach in obs.skills if ready), default=0)
+
+        if not obs.skills:
+            move = (_axis(dx), _axis(dy))  # No skills yet: fight in melee
+        elif ready_reach and distance > ready_reach * 0.8:
+            move = (_axis(dx), _axis(dy))  # Step in until the skill reaches
+        elif distance < self.kite_range and not ready_reach:
+            move = (-_axis(dx, 0), -_axis(dy, 0))  # Retreat while on cooldown
+        else:
+            move = (0, 0)
+
+        commands = [self.steer(obs, *move)]
+        if obs.attack_ready and distance <= settings.ATTACK_RANGE:
+            commands.append((CMD_ATTACK,))
+        self.cast_ready_skills(obs, distance, commands)
+        return commands
+
+
+class RandomPolicy(Policy):
+    """Mash random keys; picks stay random too (a baseline, not a player)"""
+
+    def act(self, obs):
+        """Press a random direction, attack and skill now and then"""
+        rng = self.rng
+        commands = []
+        if rng.random() < 0.1:
+            commands.append((CMD_MOVE, rng.randint(-1, 1), rng.randint(-1, 1)))
+        if rng.random() < 0.2:
+            commands.append((CMD_ATTACK,))
+        if obs.skills and rng.random() < 0.05:
+            commands.append((CMD_SKILL, rng.randrange(len(obs.skills))))
+        return commands
+
+    def pick_stat(self, obs):
+        """Random stat"""
+        return self.rng.randrange(len(obs.choices))
+
+    def pick_preferred(self, choices, preference):
+        """Random offer"""
+        return self.rng.randrange(len(choices))
+
+
+# Built-in policies by name; each is constructed with a seed per run
+POLICIES = {
+    "greedy": GreedyMeleePolicy,
+    "kite": KiteSkillPolicy,
+    "random": RandomPolicy,
+}
+
+
+def get_policy(name, seed=None):
+    """Create a built-in policy by name"""
+    return POLICIES[name](seed)
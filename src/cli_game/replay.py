@@ -0,0 +1,246 @@
+"""
+Session replays
+
+A replay is the run's seed plus the commands of every step that had input,
+stored as (steps since the previous input, commands) pairs, with a snapshot of
+the full simulation every REPLAY_KEYFRAME_INTERVAL seconds. The simulation is
+deterministic for a seed and a command stream, so playing the inputs back
+reproduces the session exactly; seeking restores the nearest keyframe and
+plays forward from there.
+
+File layout (gzip): one JSON line holding the header and inputs, followed by
+the pickled keyframes. Keyframes are pickles, so they are only loaded when
+trusted; otherwise they are rebuilt from the inputs while playing.
+
+    python -m cli_game.replay replays/session.replay [--speed 2]
+"""
+
+import argparse
+import gzip
+import io
+import json
+import pickle
+import random
+import sys
+import time
+import zlib
+import arcade
+from .config import *
+from .simulation import GameSimulation, SIM_TICK
+
+REPLAY_VERSION = 1
+
+
+def _rebuild_sprite_list(sprites, use_spatial_hash):
+    """Unpickle a sprite list: a fresh list holding the same sprites"""
+    sprite_list = arcade.SpriteList(use_spatial_hash=use_spatial_hash)
+    sprite_list.extend(sprites)
+    return sprite_list
+
+
+class _SimulationPickler(pickle.Pickler):
+    """
+    Pickles a simulation without any GPU state
+    Sprite lists pickle as their sprites (a window's lists hold GL objects), and
+    sprites forget their list memberships, which rebuilding the lists restores.
+    """
+
+    def reducer_override(self, obj):
+        """Custom reductions for sprite lists and sprites"""
+        if isinstance(obj, arcade.SpriteList):
+            return _rebuild_sprite_list, (list(obj), obj.spatial_hash is not None)
+        if isinstance(obj, arcade.BasicSprite):
+            reduced = obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
+            attributes, slots = reduced[2]
+            return (reduced[0], reduced[1], (attributes, dict(slots, sprite_lists=[]))) + reduced[3:]
+        return NotImplemented
+
+
+def snapshot(sim):
+    """Capture the simulation and the shared random state it draws from"""
+    buffer = io.BytesIO()
+    _SimulationPickler(buffer, pickle.HIGHEST_PROTOCOL).dump((sim, random.getstate()))
+    return zlib.compress(buffer.getvalue(), 1)
+
+
+def restore(blob):
+    """Rebuild a simulation from a snapshot (also restores the shared random state)"""
+    sim, random_state = pickle.loads(zlib.decompress(blob))
+    random.setstate(random_state)
+    return sim
+
+
+class Replay:
+    """Seed, per-step input deltas and keyframes of one session"""
+
+    def __init__(self, seed, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.seed = seed
+        self.keyframe_steps = max(1, round(keyframe_interval / SIM_TICK))
+        self.steps = 0  # Steps recorded so far
+        self.inputs = []  # (steps since previous input, commands)
+        self.last_input_step = 0
+        self.keyframes = []  # (step, snapshot)
+        self.outcome = None  # Summary of the final state, checked on playback
+
+    def record(self, sim, commands):
+        """Note the commands of the step the simulation is about to take"""
+        if self.steps % self.keyframe_steps == 0:
+            self.keyframes.append((self.steps, snapshot(sim)))
+        if commands:
+            self.inputs.append((self.steps - self.last_input_step, [list(command) for command in commands]))
+            self.last_input_step = self.steps
+        self.steps += 1
+
+    def finish(self, sim):
+        """Remember where the session ended"""
+        self.outcome = outcome_of(sim)
+
+    def save(self, path):
+        """Write the replay to a file"""
+        header = {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "tick": SIM_TICK,
+            "keyframe_steps": self.keyframe_steps,
+            "steps": self.steps,
+            "outcome": self.outcome,
+            "inputs": self.inputs,
+        }
+        with gzip.open(path, "wb") as f:
+            f.write(json.dumps(header, separators=(",", ":")).encode() + b"\n")
+            pickle.dump(self.keyframes, f, pickle.HIGHEST_PROTOCOL)
+
+
+def load_replay(path, trust_keyframes=False):
+    """Read a replay file; keyframes are skipped unless trusted"""
+    with gzip.open(path, "rb") as f:
+        header = json.loads(f.readline())
+        if header["version"] != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version {header['version']}")
+        keyframes = pickle.load(f) if trust_keyframes else []
+
+    replay = Replay(header["seed"])
+    replay.keyframe_steps = header["keyframe_steps"]
+    replay.steps = header["steps"]
+    replay.outcome = header["outcome"]
+    replay.inputs = [(gap, commands) for gap, commands in header["inputs"]]
+    replay.keyframes = keyframes
+    return replay
+
+
+def outcome_of(sim):
+    """State summary used to check that a playback ended where the recording did"""
+    player = sim.player
+    return {
+        "state": sim.state,
+        "tick": sim.tick,
+        "hp": player.hp,
+        "x": round(player.center_x, 3),
+        "y": round(player.center_y, 3),
+        **sim.summary(),
+    }
+
+
+class ReplayPlayer:
+    """Plays a replay into a fresh simulation, seeking through keyframes"""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.keyframes = dict(replay.keyframes)
+
+        # Expand input deltas to absolute steps
+        self.inputs = {}
+        step = 0
+        for gap, commands in replay.inputs:
+            step += gap
+            self.inputs[step] = commands
+
+        self.sim = None
+        self.step = 0
+        self._restart()
+
+    def _restart(self):
+        """Go back to step 0"""
+        self.sim = GameSimulation(seed=self.replay.seed)
+        self.step = 0
+
+    @property
+    def done(self):
+        """Whether every recorded step has been played"""
+        return self.step >= self.replay.steps
+
+    def advance(self):
+        """Play the next step and return its events (None once the replay is over)"""
+        if self.done:
+            return None
+
+        # Keyframes missing from the file are rebuilt on the way through
+        if self.step % self.replay.keyframe_steps == 0 and self.step not in self.keyframes:
+            self.keyframes[self.step] = snapshot(self.sim)
+
+        events = self.sim.step(self.inputs.get(self.step, ()))
+        self.step += 1
+        return events
+
+    def seek(self, step):
+        """Jump to a step: restore the nearest keyframe at or before it, then play forward"""
+        step = max(0, min(step, self.replay.steps))
+        base = max((k for k in self.keyframes if k <= step), default=None)
+
+        if step < self.step or (base is not None and base > self.step):
+            if base is None:
+                self._restart()
+            else:
+                self.sim = restore(self.keyframes[base])
+                self.step = base
+
+        while self.step < step:
+            self.advance()
+
+    def play(self, speed=None, on_step=None):
+        """
+        Play to the end, paced at speed times real time (None: as fast as possible)
+        on_step is called with each step's events.
+        """
+        start = time.perf_counter()
+        first_step = self.step
+        while not self.done:
+            events = self.advance()
+            if on_step:
+                on_step(events)
+            if speed:
+                due = start + (self.step - first_step) * SIM_TICK / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+
+def main():
+    """Play a replay headless and check it ends where the recording did"""
+    parser = argparse.ArgumentParser(description="Play back a recorded session without a window")
+    parser.add_argument("path", help="replay file")
+    parser.add_argument("--speed", type=float, default=None, help="playback speed multiplier (default: full speed)")
+    parser.add_argument("--seek", type=float, default=0, help="start this many seconds in")
+    parser.add_argument("--trust-keyframes", action="store_true", help="load the file's pickled keyframes")
+    args = parser.parse_args()
+
+    replay = load_replay(args.path, args.trust_keyframes)
+    player = ReplayPlayer(replay)
+    player.seek(round(args.seek / SIM_TICK))
+
+    start = time.perf_counter()
+    first_step = player.step
+    player.play(args.speed)
+    elapsed = time.perf_counter() - start
+
+    outcome = outcome_of(player.sim)
+    print(json.dumps(outcome))
+    print(f"{player.step - first_step} steps in {elapsed:.2f}s", file=sys.stderr)
+    if replay.outcome is not None and outcome != replay.outcome:
+        print(f"Playback diverged from the recording: {replay.outcome}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+"""
+Shared-memory game state
+
+Publishes a compact snapshot of every tick into a multiprocessing
+shared_memory block so overlays, analyzers and recorders in other processes
+can follow the game without being in it. The block is a ring of
+SHARED_STATE_SLOTS fixed-size slots behind a header; tick n goes to slot
+(n - 1) % slots, so the newest snapshot is never the one being written.
+
+Readers take no locks. Each slot starts with a sequence counter that the
+writer makes odd before it touches the slot and even again when it is done
+(a seqlock): a reader notes the counter, reads the slot in place through a
+numpy view, and keeps what it read only if the counter is still the same
+even number afterwards. The writer never waits for readers.
+
+Layout (little-endian, offsets in bytes):
+
+    header (HEADER_SIZE)  magic "CGSS", version, slot count, slot size,
+                          max players, max enemies, published (u64),
+                          names (JSON: forms, enemy kinds and states by index)
+    slot                  seq, number, tick (u64), floor, enemy total (u32),
+                          state, player count (u8), enemy count (u16),
+                          players[max players], enemies[max enemies],
+                          padded to a multiple of 64
+
+PLAYER_DTYPE and ENEMY_DTYPE give the record layouts. The slot layout is
+rebuilt from the header, so readers need no config of their own.
+
+    python -m cli_game.shared_state watch
+    python -m cli_game.shared_state bench --steps 20000
+"""
+
+import argparse
+import json
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from .config import *
+from .simulation import GameSimulation, GameState, CMD_RESTART, STATES, FORMS, ENEMY_KINDS
+
+MAGIC = b"CGSS"
+LAYOUT_VERSION = 1
+HEADER_SIZE = 2048
+SLOT_ALIGN = 64
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u4"),
+    ("slot_count", "<u4"),
+    ("slot_size", "<u4"),
+    ("max_players", "<u4"),
+    ("max_enemies", "<u4"),
+    ("published", "<u8"),  # Snapshots published so far (the newest one's number)
+    ("names", f"S{HEADER_SIZE - 32}"),
+])
+PLAYER_DTYPE = np.dtype([
+    ("alive", "u1"),
+    ("form", "u1"),
+    ("level", "<u2"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("hp", "<f4"),
+    ("max_hp", "<f4"),
+    ("atk", "<f4"),
+    ("defense", "<f4"),
+    ("xp", "<f4"),
+    ("xp_to_next", "<f4"),
+])
+ENEMY_DTYPE = np.dtype([
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("hp", "<f4"),
+    ("max_hp", "<f4"),
+    ("kind", "<u4"),
+])
+
+FORM_INDEX = {form: index for index, form in enumerate(FORMS)}
+STATE_INDEX = {state: index for index, state in enumerate(STATES)}
+KIND_INDEX = {kind: index for index, kind in enumerate(ENEMY_KINDS)}
+
+
+def slot_dtype(max_players, max_enemies):
+    """Record layout of one ring slot"""
+    packed = np.dtype([
+        ("seq", "<u8"),  # Odd while the writer is inside the slot
+        ("number", "<u8"),  # Which snapshot the slot holds
+        ("tick", "<u8"),
+        ("floor", "<u4"),
+        ("enemy_total", "<u4"),  # Enemies on the floor, including any past max_enemies
+        ("state", "u1"),
+        ("player_count", "u1"),
+        ("enemy_count", "<u2"),
+        ("players", PLAYER_DTYPE, (max_players,)),
+        ("enemies", ENEMY_DTYPE, (max_enemies,)),
+    ])
+    padded = -(-packed.itemsize // SLOT_ALIGN) * SLOT_ALIGN
+    return np.dtype({
+        "names": packed.names,
+        "formats": [packed.fields[name][0] for name in packed.names],
+        "offsets": [packed.fields[name][1] for name in packed.names],
+        "itemsize": padded,
+    })
+
+
+def _attach(name):
+    """Open an existing block without letting this process's exit unlink it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # Older Pythons track attached blocks too and unlink them when the reader exits
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedStatePublisher:
+    """Writes a snapshot of the simulation into the shared ring after each step"""
+
+    def __init__(self, name=SHARED_STATE_NAME, slots=SHARED_STATE_SLOTS,
+                 max_players=SHARED_STATE_MAX_PLAYERS, max_enemies=SHARED_STATE_MAX_ENEMIES):
+        dtype = slot_dtype(max_players, max_enemies)
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + slots * dtype.itemsize)
+        self.name = self.shm.name
+        self.slot_count = slots
+        self.max_players = max_players
+        self.max_enemies = max_enemies
+
+        self.header = np.ndarray((), HEADER_DTYPE, buffer=self.shm.buf)
+        self.slots = np.ndarray((slots,), dtype, buffer=self.shm.buf, offset=HEADER_SIZE)
+        self.slots.fill(0)
+        self.seqs = self.slots["seq"]
+        # Per-slot views, built once: (record, its players, its enemies)
+        self.views = [(record, record["players"], record["enemies"]) for record in self.slots]
+
+        names = {"forms": FORMS, "enemy_kinds": ENEMY_KINDS, "states": STATES}
+        self.header[()] = (
+            MAGIC, LAYOUT_VERSION, slots, dtype.itemsize, max_players, max_enemies, 0, json.dumps(names).encode()
+        )
+        self.published = 0
+
+    def publish(self, sim):
+        """Write the simulation's current state as the next snapshot"""
+        number = self.published + 1
+        index = (number - 1) % self.slot_count
+        self.seqs[index] += 1  # Odd: readers of this slot retry
+
+        record, players, enemies = self.views[index]
+        record["number"] = number
+        record["tick"] = sim.tick
+        record["floor"] = sim.floor_number
+        record["state"] = STATE_INDEX[sim.state]
+
+        sim_players = sim.players[:self.max_players]
+        for slot, player in enumerate(sim_players):
+            players[slot] = (
+                player.is_alive(), FORM_INDEX[player.current_form], player.level,
+                player.center_x, player.center_y, player.hp, player.max_hp,
+                player.atk, player.defense, player.xp, player.xp_to_next_level,
+            )
+        record["player_count"] = len(sim_players)
+
+        floor_enemies = sim.current_floor.enemies
+        shown = floor_enemies[:self.max_enemies]
+        enemies[:len(shown)] = [
+            (enemy.center_x, enemy.center_y, enemy.hp, enemy.max_hp, KIND_INDEX[type(enemy).__name__])
+            for enemy in shown
+        ]
+        record["enemy_count"] = len(shown)
+        record["enemy_total"] = len(floor_enemies)
+
+        self.seqs[index] += 1  # Even again: the slot is complete
+        self.header["published"] = number
+        self.published = number
+
+    def close(self):
+        """Drop the views and remove the block"""
+        self.header = self.slots = self.seqs = self.views = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SharedStateReader:
+    """Reads snapshots from a publisher's ring in place, without locks"""
+
+    def __init__(self, name=SHARED_STATE_NAME):
+        self.shm = _attach(name)
+        self.header = np.ndarray((), HEADER_DTYPE, buffer=self.shm.buf)
+        if self.header["magic"] != MAGIC or self.header["version"] != LAYOUT_VERSION:
+            self.close()
+            raise ValueError(f"{name} is not a version {LAYOUT_VERSION} game state block")
+
+        self.names = json.loads(self.header["names"].item())
+        self.slot_count = int(self.header["slot_count"])
+        dtype = slot_dtype(int(self.header["max_players"]), int(self.header["max_enemies"]))
+        self.slots = np.ndarray((self.slot_count,), dtype, buffer=self.shm.buf, offset=HEADER_SIZE)
+        self.seqs = self.slots["seq"]
+        self.reads = 0
+        self.retries = 0  # Reads repeated because the writer got to the slot first
+
+    @property
+    def published(self):
+        """Number of the newest snapshot"""
+        return int(self.header["published"])
+
+    def read(self, consume, number=None, attempts=100):
+        """
+        Call consume with the newest snapshot (or snapshot number) and return its result
+        consume gets a numpy record viewing the slot in shared memory, so nothing is
+        copied; it is called again if the writer touched the slot meanwhile, and must
+        not keep the record. Returns None if there is nothing to read yet or number
+        has already left the ring.
+        """
+        for _ in range(attempts):
+            newest = self.published
+            target = newest if number is None else number
+            if target < 1 or target > newest or newest - target >= self.slot_count:
+                return None
+
+            index = (target - 1) % self.slot_count
+            seq = int(self.seqs[index])
+            if not seq & 1:
+                record = self.slots[index]
+                if record["number"] == target:
+                    result = consume(record)
+                    if int(self.seqs[index]) == seq:
+                        self.reads += 1
+                        return result
+            self.retries += 1
+        return None
+
+    def to_dict(self, record):
+        """Copy a snapshot out into plain Python values"""
+        names = self.names
+        players = record["players"][:record["player_count"]]
+        enemies = record["enemies"][:record["enemy_count"]]
+        return {
+            "number": int(record["number"]),
+            "tick": int(record["tick"]),
+            "floor": int(record["floor"]),
+            "state": names["states"][record["state"]],
+            "players": [
+                {**dict(zip(PLAYER_DTYPE.names, player.tolist())), "form": names["forms"][player["form"]]}
+                for player in players
+            ],
+            "enemies": [
+                {**dict(zip(ENEMY_DTYPE.names, enemy.tolist())), "kind": names["enemy_kinds"][enemy["kind"]]}
+                for enemy in enemies
+            ],
+            "enemy_total": int(record["enemy_total"]),
+        }
+
+    def close(self):
+        """Drop the views and detach (the block stays for the publisher)"""
+        self.header = self.slots = self.seqs = None
+        self.shm.close()
+
+
+def _enemy_hp_left(record):
+    """Example in-place read: total enemy HP of a snapshot"""
+    return float(record["enemies"]["hp"][:record["enemy_count"]].sum())
+
+
+def watch(name, interval=1.0):
+    """Print the newest snapshot of a running game every interval"""
+    reader = SharedStateReader(name)
+    try:
+        while True:
+            start = time.perf_counter()
+            snapshot = reader.read(reader.to_dict)
+            reads = 1000
+            for _ in range(reads):
+                reader.read(_enemy_hp_left)
+            read_us = (time.perf_counter() - start) / (reads + 1) * 1e6
+            if snapshot:
+                players = "  ".join(
+                    f"P{slot} {player['form']} L{player['level']} {player['hp']:.0f}/{player['max_hp']:.0f}"
+                    for slot, player in enumerate(snapshot["players"])
+                )
+                print(
+                    f"tick {snapshot['tick']:7d}  floor {snapshot['floor']:3d}  {snapshot['state']:<20}"
+                    f"  {players}  enemies {snapshot['enemy_total']:3d}"
+                    f"  read {read_us:.1f}us  retries {reader.retries}"
+                )
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+def bench(steps, name):
+    """Time publishing while a headless bot plays"""
+    from .policies import get_policy, observe
+
+    sim = GameSimulation(seed=0)
+    policy = get_policy("greedy", 0)
+    publisher = SharedStatePublisher(name)
+    reader = None
+    times = []
+    try:
+        reader = SharedStateReader(name)
+        for _ in range(steps):
+            commands = [(CMD_RESTART,)] if sim.state == GameState.GAME_OVER else policy.decide(observe(sim))
+            sim.step(commands)
+            start = time.perf_counter()
+            publisher.publish(sim)
+            times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(steps):
+            reader.read(_enemy_hp_left)
+        read_us = (time.perf_counter() - start) / steps * 1e6
+        final = reader.read(reader.to_dict)
+    finally:
+        if reader:
+            reader.close()
+        publisher.close()
+
+    times.sort()
+    print(f"{steps} snapshots, ending on floor {final['floor']} with {final['enemy_total']} enemies")
+    print(
+        f"publish: mean {sum(times) / len(times) * 1e6:.1f}us  p50 {times[len(times) // 2] * 1e6:.1f}us"
+        f"  p99 {times[int(len(times) * 0.99)] * 1e6:.1f}us"
+    )
+    print(f"read in place: {read_us:.2f}us")
+
+
+def main():
+    """Watch a running game's shared state, or benchmark publishing"""
+    parser = argparse.ArgumentParser(description="Read the game's shared-memory state from another process")
+    sub = parser.add_subparsers(dest="command", required=True)
+    watch_parser = sub.add_parser("watch", help="print the newest snapshot of a running game")
+    watch_parser.add_argument("--name", default=SHARED_STATE_NAME, help="shared memory block name")
+    watch_parser.add_argument("--interval", type=float, default=1.0, help="seconds between lines")
+    bench_parser = sub.add_parser("bench", help="time publishing while a headless bot plays")
+    bench_parser.add_argument("--name", default=f"{SHARED_STATE_NAME}_bench", help="shared memory block name")
+    bench_parser.add_argument("--steps", type=int, default=20000, help="steps to play and publish")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "watch":
+            watch(args.name, args.interval)
+        else:
+            bench(args.steps, args.name)
+    except FileNotFoundError:
+        print(f"No shared state block named {args.name}; start the game with --share-state", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,479 @@
+"""
+Headless game simulation
+
+GameSimulation owns the player, the current floor, the game clock, the state
+machine and progression. It never opens a window: each step applies a list of
+input commands and advances one tick, so the game can be driven by the window,
+a bot or a benchmark with no display. Things a renderer wants to show (hits,
+casts, floor changes) are reported as events for the tick that caused them.
+"""
+
+import functools
+import random
+import arcade
+from .config import *
+from .entities import MonsterPlayer, Slime, Goblin, OrcWarrior, GoblinShaman
+from .systems import (
+    DungeonFloor,
+    get_evolution_options,
+    evolve_player,
+    EVOLUTION_TREE,
+    get_random_traits,
+    get_skill_by_id,
+    execute_skills,
+    TimerWheel,
+)
+
+
+class GameState:
+    """Game state enum"""
+    PLAYING = "playing"
+    STAT_UPGRADE = "stat_upgrade"
+    TRAIT_SELECTION = "trait_selection"
+    EVOLUTION_SELECTION = "evolution_selection"
+    GAME_OVER = "game_over"
+
+
+# Input commands are tuples led by one of these names:
+# (CMD_MOVE, dx, dy)   held movement direction, each of -1, 0 or 1
+# (CMD_ATTACK,)        basic attack
+# (CMD_SKILL, slot)    cast the skill in a slot
+# (CMD_SELECT, index)  pick one of sim.choices (stat, trait or evolution)
+# (CMD_RESTART,)       start a new run after game over
+CMD_MOVE = "move"
+CMD_ATTACK = "attack"
+CMD_SKILL = "skill"
+CMD_SELECT = "select"
+CMD_RESTART = "restart"
+
+# Events recorded during a step, tuples led by one of these names:
+# (EVENT_FLOOR, floor_number)           a floor was entered (also on new runs)
+# (EVENT_ATTACK, x, y)                  the player swung
+# (EVENT_CAST, skill, x, y, dx, dy)     a skill fired from (x, y) facing (dx, dy)
+# (EVENT_HIT, enemy, damage, crit)      an enemy took damage
+# (EVENT_KILL, enemy)                   an enemy died
+# (EVENT_HURT, damage, cause)           the player took damage (enemy class name or "projectile")
+EVENT_FLOOR = "floor"
+EVENT_ATTACK = "attack"
+EVENT_CAST = "cast"
+EVENT_HIT = "hit"
+EVENT_KILL = "kill"
+EVENT_HURT = "hurt"
+
+# Stat upgrades offered on level up
+STAT_UPGRADES = {
+    "hp": {"max_hp": 20, "hp": 20},
+    "atk": {"base_atk": 5},
+    "def": {"base_def": 3},
+}
+
+SIM_TICK = 1 / FPS  # Seconds per step (movement speeds are per tick)
+
+# Index tables for packing states, forms and enemy kinds into numbers (netplay, shared_state)
+STATES = (
+    GameState.PLAYING,
+    GameState.STAT_UPGRADE,
+    GameState.TRAIT_SELECTION,
+    GameState.EVOLUTION_SELECTION,
+    GameState.GAME_OVER,
+)
+FORMS = tuple(EVOLUTION_TREE)
+ENEMY_KINDS = tuple(enemy_class.__name__ for enemy_class in (Slime, Goblin, OrcWarrior, GoblinShaman))
+
+
+class GameSimulation:
+    """The game rules and state, stepped one tick at a time without a window"""
+
+    def __init__(self, seed=None):
+        # Seeds the shared random module: floors, enemy AI and crits draw from it
+        if seed is not None:
+            random.seed(seed)
+
+        self.state = GameState.PLAYING
+        self.player = None
+        self.partner = None  # Second player of a co-op session (see add_partner)
+        self.current_floor = None
+        self.floor_number = 1
+        self.choices = []  # Options of the open selection (stat ids, trait classes or form ids)
+
+        self.timers = None
+        self.tick = 0
+        self.pending_level_ups = 0
+        self.queued_skill_casts = []  # (caster, skill)
+        self.events = []
+        self.hurt_cause = None  # What the player is being hit by this tick
+
+        # Contact damage cooldown (players whose contact damage is re-arming)
+        self.contact_damage_cooldown = settings.CONTACT_DAMAGE_COOLDOWN
+        self.contact_cooling = set()
+
+        self.setup()
+
+    def setup(self):
+        """Initialize/reset the run"""
+        # Fresh game clock (drops every timer from the previous run)
+        self.timers = TimerWheel()
+        self.tick = 0
+
+        # Reset floor
+        self.floor_number = 1
+        self.current_floor = DungeonFloor(self.floor_number)
+
+        # Create player
+        spawn_x, spawn_y = self.current_floor.get_player_spawn_position()
+        self.player = MonsterPlayer(spawn_x, spawn_y, self.timers)
+        self.player.on_hurt = self._on_player_hurt
+
+        # Give player initial skills based on form
+        self._update_player_skills()
+
+        # A partner starts the new run with the host
+        if self.partner:
+            self.add_partner()
+
+        # Reset state
+        self.state = GameState.PLAYING
+        self.choices = []
+        self.pending_level_ups = 0
+        self.queued_skill_casts = []
+        self.contact_cooling = set()
+        self.events.append((EVENT_FLOOR, self.floor_number))
+
+    @property
+    def players(self):
+        """The player, then the partner if there is one"""
+        return [self.player, self.partner] if self.partner else [self.player]
+
+    @property
+    def active_players(self):
+        """Players still standing on this floor"""
+        return [player for player in self.players if player.is_alive()]
+
+    def add_partner(self):
+        """
+        Add a co-op partner next to the player
+        The partner starts at base stats in the player's form; the player's
+        menu picks (stats, evolutions, traits) from then on apply to both.
+        Partners have no menus of their own and a downed partner stands back
+        up at the start of the next floor.
+        """
+        partner = MonsterPlayer(self.player.center_x, self.player.center_y, self.timers)
+        partner.color = PARTNER_TINT
+        if self.player.current_form != partner.current_form:
+            evolve_player(partner, self.player.current_form)
+        partner.level = self.player.level
+        self.partner = partner
+        self._update_player_skills()
+        return partner
+
+    def remove_partner(self):
+        """Drop the co-op partner"""
+        self.contact_cooling.discard(self.partner)
+        self.queued_skill_casts = [(caster, skill) for caster, skill in self.queued_skill_casts if caster is self.player]
+        self.partner = None
+
+    def _update_player_skills(self):
+        """Update player skills based on current form"""
+        for player in self.players:
+            form_data = EVOLUTION_TREE.get(player.current_form)
+            if form_data:
+                skill_ids = form_data.get("skills", [])
+                player.skills = []
+                for skill_id in skill_ids:
+                    skill = get_skill_by_id(skill_id)
+                    if skill:
+                        player.add_skill(skill)
+
+    def step(self, commands=(), delta_time=SIM_TICK, partner_commands=()):
+        """
+        Apply input commands, then advance one tick if playing
+        partner_commands drive the co-op partner (move, attack and skill only).
+        Returns the events recorded during the step.
+        """
+        self.events = []
+        for command in commands:
+            self._apply_command(command)
+        if self.partner and self.state == GameState.PLAYING and self.partner.is_alive():
+            for command in partner_commands:
+                self._apply_player_command(self.partner, command)
+
+        if self.state == GameState.PLAYING:
+            self._advance(delta_time)
+        return self.events
+
+    def _apply_command(self, command):
+        """Route one input command to the current state"""
+        name = command[0]
+        if self.state == GameState.PLAYING:
+            self._apply_player_command(self.player, command)
+        elif name == CMD_SELECT and self.choices:
+            self.select(command[1])
+        elif name == CMD_RESTART and self.state == GameState.GAME_OVER:
+            self.setup()
+
+    def _apply_player_command(self, player, command):
+        """Apply a movement, attack or skill command to one player"""
+        name = command[0]
+        if name == CMD_MOVE:
+            player.velocity_x, player.velocity_y = command[1], command[2]
+        elif name == CMD_ATTACK:
+            self._player_attack(player)
+        elif name == CMD_SKILL:
+            self._cast_skill(player, command[1])
+
+    def select(self, index):
+        """Pick an option of the open selection"""
+        choice = self.choices[index]
+        if self.state == GameState.STAT_UPGRADE:
+            self._on_stat_upgrade_selected(choice)
+        elif self.state == GameState.TRAIT_SELECTION:
+            self._on_trait_selected(choice)
+        elif self.state == GameState.EVOLUTION_SELECTION:
+            self._on_evolution_selected(choice)
+
+    def _advance(self, delta_time):
+        """Run one tick of game logic"""
+        self.tick += 1
+
+        # Advance game time; fires cooldowns, regen ticks and effect expiry
+        self.timers.advance(delta_time)
+
+        players = self.active_players
+        for player in players:
+            # Update player movement
+            old_x = player.center_x
+            old_y = player.center_y
+
+            player.update_movement(delta_time)
+
+            # Check wall collision
+            if arcade.check_for_collision_with_list(player, self.current_floor.walls):
+                player.center_x = old_x
+                player.center_y = old_y
+
+            # Update traits
+            player.update_traits(delta_time)
+
+        # Update floor (enemy AI)
+        self.current_floor.update(players, delta_time)
+
+        # Fire skills cast since the last tick
+        if self.queued_skill_casts:
+            self._resolve_skill_casts()
+
+        # Move projectiles and resolve their hits
+        self.hurt_cause = "projectile"
+        hits = self.current_floor.projectiles.step(
+            delta_time,
+            self.current_floor.wall_grid,
+            self.current_floor.enemy_index,
+            players
+        )
+        if hits:
+            self._resolve_hits(hits)
+
+        # Check player-enemy collision
+        for player in players:
+            self._check_player_enemy_collision(player)
+
+        # Check if player died
+        if not self.player.is_alive():
+            self._game_over()
+            return
+
+        # Check if floor cleared
+        if self.current_floor.is_cleared():
+            self._floor_cleared()
+
+        # Check for pending level ups
+        if self.pending_level_ups > 0 and self.state == GameState.PLAYING:
+            self.pending_level_ups -= 1
+            self._show_stat_upgrade()
+
+    def _player_attack(self, player):
+        """Handle player basic attack"""
+        if not player.can_attack():
+            return
+
+        self.events.append((EVENT_ATTACK, player.center_x, player.center_y))
+
+        # Find enemies in range
+        for enemy in self.current_floor.enemies:
+            distance = (
+                (enemy.center_x - player.center_x) ** 2 +
+                (enemy.center_y - player.center_y) ** 2
+            ) ** 0.5
+
+            if distance <= settings.ATTACK_RANGE:
+                damage = player.perform_attack(enemy)
+                # Apply damage to enemy
+                self._resolve_hits(
+                    [(enemy, enemy.take_damage(damage))], crit=player.last_attack_crit
+                )
+
+                # Only attack one enemy per press
+                break
+
+    def _cast_skill(self, player, slot):
+        """Queue the skill in a slot to fire with this tick's other casts"""
+        if slot >= len(player.skills):
+            return
+
+        skill = player.skills[slot]
+        if skill.can_use(self.timers.now):
+            skill.start_cooldown(self.timers.now)
+            self.queued_skill_casts.append((player, skill))
+
+    def _resolve_skill_casts(self):
+        """Execute all queued skill casts in one batch per caster and clear out the dead"""
+        hits = []
+        for player in self.players:
+            skills = [skill for caster, skill in self.queued_skill_casts if caster is player]
+            if not skills:
+                continue
+            for skill in skills:
+                self.events.append(
+                    (EVENT_CAST, skill, player.center_x, player.center_y, player.facing_x, player.facing_y)
+                )
+
+            hits += execute_skills(
+                skills,
+                player,
+                self.current_floor.enemy_index,
+                self.current_floor.projectiles
+            )
+        self.queued_skill_casts = []
+        self._resolve_hits(hits)
+
+    def _resolve_hits(self, hits, crit=False):
+        """Record hits, then reward and remove every enemy killed by (enemy, damage) hits"""
+        for enemy, damage in hits:
+            self.events.append((EVENT_HIT, enemy, damage, crit))
+
+        # An enemy can be hit several times; reward each kill once
+        killed = dict.fromkeys(enemy for enemy, damage in hits if not enemy.is_alive())
+        for enemy in killed:
+            self._on_enemy_killed(enemy)
+
+    def _on_enemy_killed(self, enemy):
+        """Grant XP for a dead enemy and remove it from the floor"""
+        level_ups = self.player.gain_xp(enemy.xp_value)
+        self.pending_level_ups += level_ups
+
+        self.current_floor.remove_enemy(enemy)
+        self.events.append((EVENT_KILL, enemy))
+
+    def _on_player_hurt(self, damage):
+        """Record damage taken by the player"""
+        self.events.append((EVENT_HURT, damage, self.hurt_cause))
+
+    def _rearm_contact_damage(self, player):
+        """Allow contact damage again"""
+        self.contact_cooling.discard(player)
+
+    def _check_player_enemy_collision(self, player):
+        """Check if player is touching enemies (contact damage)"""
+        if player in self.contact_cooling:
+            return
+
+        hit_list = arcade.check_for_collision_with_list(
+            player,
+            self.current_floor.enemies
+        )
+
+        if hit_list:
+            enemy = hit_list[0]  # Take damage from first enemy in list
+            self.hurt_cause = type(enemy).__name__
+            player.take_damage(enemy.atk)
+            self.contact_cooling.add(player)
+            self.timers.schedule(self.contact_damage_cooldown, functools.partial(self._rearm_contact_damage, player))
+
+    def _show_stat_upgrade(self):
+        """Offer a stat upgrade"""
+        self.state = GameState.STAT_UPGRADE
+        self.choices = list(STAT_UPGRADES)
+
+    def _on_stat_upgrade_selected(self, stat_id):
+        """Handle stat upgrade selection"""
+        for player in self.players:
+            for attribute, amount in STAT_UPGRADES[stat_id].items():
+                setattr(player, attribute, getattr(player, attribute) + amount)
+        if self.partner:
+            self.partner.level = self.player.level
+
+        self.state = GameState.PLAYING
+        self.choices = []
+
+        # Check if player can evolve
+        self._check_evolution()
+
+    def _check_evolution(self):
+        """Check if player can evolve and offer the forms if so"""
+        evolution_options = get_evolution_options(self.player)
+        if evolution_options:
+            self.state = GameState.EVOLUTION_SELECTION
+            self.choices = evolution_options
+
+    def _on_evolution_selected(self, form_id):
+        """Handle evolution selection"""
+        for player in self.players:
+            evolve_player(player, form_id)
+        self._update_player_skills()
+
+        self.state = GameState.PLAYING
+        self.choices = []
+
+    def _floor_cleared(self):
+        """Handle floor cleared"""
+        # Offer traits (offers are classes until one is picked)
+        available_traits = get_random_traits(3, exclude_mask=self.player.trait_mask)
+
+        if available_traits:
+            self.state = GameState.TRAIT_SELECTION
+            self.choices = available_traits
+        else:
+            # No traits available, go to next floor
+            self._next_floor()
+
+    def _on_trait_selected(self, trait_class):
+        """Handle trait selection"""
+        for player in self.players:
+            player.add_trait(trait_class())
+
+        # Go to next floor
+        self._next_floor()
+
+    def _next_floor(self):
+        """Generate next floor"""
+        self.floor_number += 1
+        self.current_floor = DungeonFloor(self.floor_number)
+
+        # Spawn player at start
+        spawn_x, spawn_y = self.current_floor.get_player_spawn_position()
+        self.player.center_x = spawn_x
+        self.player.center_y = spawn_y
+
+        # A downed partner stands back up beside the player
+        if self.partner:
+            self.partner.center_x = spawn_x
+            self.partner.center_y = spawn_y
+            if not self.partner.is_alive():
+                self.partner.hp = self.partner.max_hp
+
+        self.state = GameState.PLAYING
+        self.choices = []
+        self.events.append((EVENT_FLOOR, self.floor_number))
+
+    def _game_over(self):
+        """Handle game over"""
+        self.state = GameState.GAME_OVER
+        self.choices = []
+
+    def summary(self):
+        """Stats of the run so far (shown on game over)"""
+        return {
+            "form": self.player.current_form,
+            "level": self.player.level,
+            "floor": self.floor_number,
+            "trait_count": len(self.player.traits)
+        }
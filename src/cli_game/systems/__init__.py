@@ -3,15 +3,19 @@ Game systems: evolution, traits, skills, combat, world
 """
 
 from .evolution import EVOLUTION_TREE, evolve_player, get_evolution_options
-from .traits import TRAIT_REGISTRY, get_random_traits
-from .skills import Skill, SKILL_REGISTRY, FireBreath, WingBuffet, TidalCrash, LeviathanRoar, StonePunch, Earthquake
-from .combat import calculate_damage
+from .traits import TRAIT_REGISTRY, TRAIT_CATALOG, get_random_traits
+from .skills import Skill, SKILL_REGISTRY, get_skill_by_id, execute_skills
+from .combat import calculate_damage, roll_damage, damage_for_roll
 from .world import DungeonFloor
+from .timers import TimerWheel
+from .particles import ParticleSystem, PARTICLE_EMITTERS
 
 __all__ = [
     'EVOLUTION_TREE', 'evolve_player', 'get_evolution_options',
-    'TRAIT_REGISTRY', 'get_random_traits',
-    'Skill', 'SKILL_REGISTRY', 'FireBreath', 'WingBuffet', 'TidalCrash', 'LeviathanRoar', 'StonePunch', 'Earthquake',
-    'calculate_damage',
-    'DungeonFloor'
+    'TRAIT_REGISTRY', 'TRAIT_CATALOG', 'get_random_traits',
+    'Skill', 'SKILL_REGISTRY', 'get_skill_by_id', 'execute_skills',
+    'calculate_damage', 'roll_damage', 'damage_for_roll',
+    'DungeonFloor',
+    'TimerWheel',
+    'ParticleSystem', 'PARTICLE_EMITTERS',
 ]
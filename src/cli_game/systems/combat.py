@@ -3,23 +3,34 @@ Combat system with damage calculation
 """
 
 import random
-from ..config import BASE_CRIT_MULTIPLIER
+from ..config import settings
 
 
-def calculate_damage(attacker, defender):
+def damage_for_roll(attacker, defender, variance, is_crit):
+    """Damage from attacker to defender for a given variance roll and crit outcome"""
+    base_damage = attacker.atk + variance
+    if is_crit:
+        base_damage = int(base_damage * settings.BASE_CRIT_MULTIPLIER)
+
+    # Apply defense
+    return max(1, base_damage - defender.defense)
+
+
+def roll_damage(attacker, defender):
     """
-    Calculate damage from attacker to defender
+    Roll damage from attacker to defender
     Takes into account: base attack, defense, crit chance
+    Returns (damage, is_crit).
     """
     # Base damage with some variance
-    base_damage = attacker.atk + random.randint(-2, 2)
+    variance = random.randint(-settings.DAMAGE_VARIANCE, settings.DAMAGE_VARIANCE)
 
     # Critical hit check
     is_crit = random.random() < attacker.crit_chance
-    if is_crit:
-        base_damage = int(base_damage * BASE_CRIT_MULTIPLIER)
 
-    # Apply defense
-    final_damage = max(1, base_damage - defender.defense)
+    return damage_for_roll(attacker, defender, variance, is_crit), is_crit
 
-    return final_damage
+
+def calculate_damage(attacker, defender):
+    """Calculate damage from attacker to defender"""
+    return roll_damage(attacker, defender)[0]
@@ -2,7 +2,7 @@
 Evolution system with branching evolution tree
 """
 
-from ..config import EVOLUTION_STAGE_1_LEVEL, EVOLUTION_STAGE_2_LEVEL, EVOLUTION_STAGE_3_LEVEL
+from ..config import settings
 
 
 # Evolution tree structure
@@ -173,11 +173,11 @@ def get_evolution_options(player):
     required_level = 0
 
     if stage == 0:
-        required_level = EVOLUTION_STAGE_1_LEVEL
+        required_level = settings.EVOLUTION_STAGE_1_LEVEL
     elif stage == 1:
-        required_level = EVOLUTION_STAGE_2_LEVEL
+        required_level = settings.EVOLUTION_STAGE_2_LEVEL
     elif stage == 2:
-        required_level = EVOLUTION_STAGE_3_LEVEL
+        required_level = settings.EVOLUTION_STAGE_3_LEVEL
 
     if player.level >= required_level and evolves_to:
         return evolves_to
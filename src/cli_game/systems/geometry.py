@@ -0,0 +1,126 @@
+"""
+Shape queries for skill targeting
+
+Every query culls candidates through a SpatialGrid first, then runs the exact
+shape test on enemy centers. Results are (enemy, distance) pairs sorted from
+nearest to farthest, where distance is measured from the query origin.
+"""
+
+import math
+
+
+def normalize(x, y, default=(1.0, 0.0)):
+    """Get a unit vector, or the default if the input has no length"""
+    length = math.sqrt(x * x + y * y)
+    if length == 0:
+        return default
+    return x / length, y / length
+
+
+def _finish(hits):
+    """Sort hits nearest first"""
+    hits.sort(key=lambda hit: hit[1])
+    return hits
+
+
+def query_circle(index, x, y, radius):
+    """Get everything within radius of (x, y)"""
+    return query_ring(index, x, y, 0, radius)
+
+
+def query_ring(index, x, y, inner_radius, outer_radius):
+    """Get everything between inner_radius and outer_radius of (x, y)"""
+    inner_sq = inner_radius * inner_radius
+    outer_sq = outer_radius * outer_radius
+
+    hits = []
+    for item in index.query_radius(x, y, outer_radius):
+        dx = item.center_x - x
+        dy = item.center_y - y
+        dist_sq = dx * dx + dy * dy
+        if inner_sq <= dist_sq <= outer_sq:
+            hits.append((item, math.sqrt(dist_sq)))
+    return _finish(hits)
+
+
+def query_cone(index, x, y, facing_x, facing_y, radius, angle):
+    """
+    Get everything inside a cone opening from (x, y) along the facing vector
+    angle is the full opening angle in radians
+    """
+    facing_x, facing_y = normalize(facing_x, facing_y)
+    cos_half = math.cos(angle / 2)
+    radius_sq = radius * radius
+
+    hits = []
+    for item in index.query_radius(x, y, radius):
+        dx = item.center_x - x
+        dy = item.center_y - y
+        dist_sq = dx * dx + dy * dy
+        if dist_sq > radius_sq:
+            continue
+        if dist_sq == 0:
+            hits.append((item, 0.0))
+            continue
+
+        dist = math.sqrt(dist_sq)
+        if (dx * facing_x + dy * facing_y) / dist >= cos_half:
+            hits.append((item, dist))
+    return _finish(hits)
+
+
+def query_box(index, x, y, facing_x, facing_y, length, width):
+    """
+    Get everything inside a box extending length pixels forward from (x, y)
+    The box is width pixels wide, centered on the facing axis
+    """
+    facing_x, facing_y = normalize(facing_x, facing_y)
+    half_width = width / 2
+
+    # Broadphase on the box's axis-aligned bounds
+    end_x = x + facing_x * length
+    end_y = y + facing_y * length
+    pad_x = abs(facing_y) * half_width
+    pad_y = abs(facing_x) * half_width
+    candidates = index.query_rect(
+        min(x, end_x) - pad_x, min(y, end_y) - pad_y,
+        max(x, end_x) + pad_x, max(y, end_y) + pad_y,
+    )
+
+    hits = []
+    for item in candidates:
+        dx = item.center_x - x
+        dy = item.center_y - y
+        forward = dx * facing_x + dy * facing_y
+        side = -dx * facing_y + dy * facing_x
+        if 0 <= forward <= length and abs(side) <= half_width:
+            hits.append((item, math.sqrt(dx * dx + dy * dy)))
+    return _finish(hits)
+
+
+def query_capsule(index, x0, y0, x1, y1, radius):
+    """Get everything within radius of the segment (x0, y0)-(x1, y1)"""
+    seg_x = x1 - x0
+    seg_y = y1 - y0
+    seg_len_sq = seg_x * seg_x + seg_y * seg_y
+    radius_sq = radius * radius
+
+    candidates = index.query_rect(
+        min(x0, x1) - radius, min(y0, y1) - radius,
+        max(x0, x1) + radius, max(y0, y1) + radius,
+    )
+
+    hits = []
+    for item in candidates:
+        dx = item.center_x - x0
+        dy = item.center_y - y0
+
+        # Project onto the segment and clamp to its ends
+        t = 0.0
+        if seg_len_sq > 0:
+            t = max(0.0, min(1.0, (dx * seg_x + dy * seg_y) / seg_len_sq))
+        off_x = dx - seg_x * t
+        off_y = dy - seg_y * t
+        if off_x * off_x + off_y * off_y <= radius_sq:
+            hits.append((item, math.sqrt(dx * dx + dy * dy)))
+    return _finish(hits)
@@ -0,0 +1,287 @@
+"""
+Pooled particle system for visual effects
+
+Particle state lives in fixed-capacity NumPy arrays allocated once. Emitters
+are plain data in PARTICLE_EMITTERS; emitting, aging and culling are
+vectorized, and every live particle is drawn in one point-sprite call.
+"""
+
+import math
+import arcade
+import numpy as np
+from arcade.gl import BufferDescription
+from pyglet import gl
+from ..config import *
+
+# Emitter definitions
+# Each emitter has: count, pattern, speed (min, max pixels per second),
+# lifetime (min, max seconds), size (min, max pixels), colors (palette)
+# Patterns: burst -> all directions, cone -> around a facing within angle,
+# area -> scattered over a disk of radius reach, drifting slowly.
+# When an emit call passes a reach, burst/cone speeds are scaled so the
+# fastest particle travels exactly that far.
+PARTICLE_EMITTERS = {
+    "attack": {
+        "count": 16,
+        "pattern": "burst",
+        "speed": (120, 240),
+        "lifetime": (ATTACK_EFFECT_DURATION * 0.6, ATTACK_EFFECT_DURATION),
+        "size": (6, 10),
+        "colors": [COLOR_ATTACK_EFFECT],
+    },
+
+    "hit": {
+        "count": 8,
+        "pattern": "burst",
+        "speed": (40, 140),
+        "lifetime": (0.15, 0.3),
+        "size": (3, 6),
+        "colors": [(255, 90, 90, 255), (255, 180, 120, 255)],
+    },
+
+    "fire_breath": {
+        "count": 80,
+        "pattern": "cone",
+        "angle": math.pi / 3,
+        "speed": (120, 300),
+        "lifetime": (0.3, 0.5),
+        "size": (6, 14),
+        "colors": [(255, 120, 30, 230), (255, 200, 60, 230), (220, 60, 20, 230)],
+    },
+
+    "wing_buffet": {
+        "count": 48,
+        "pattern": "burst",
+        "speed": (200, 250),
+        "lifetime": (0.3, 0.4),
+        "size": (4, 8),
+        "colors": [(230, 230, 255, 200), (180, 200, 255, 200)],
+    },
+
+    "tidal_crash": {
+        "count": 30,
+        "pattern": "cone",
+        "angle": math.pi / 4,
+        "speed": (60, 160),
+        "lifetime": (0.2, 0.35),
+        "size": (4, 8),
+        "colors": [(80, 160, 255, 220), (200, 230, 255, 220)],
+    },
+
+    "leviathan_roar": {
+        "count": 64,
+        "pattern": "burst",
+        "speed": (280, 320),
+        "lifetime": (0.4, 0.5),
+        "size": (5, 9),
+        "colors": [(60, 120, 220, 220), (120, 200, 255, 220)],
+    },
+
+    "stone_punch": {
+        "count": 24,
+        "pattern": "cone",
+        "angle": math.pi / 8,
+        "speed": (120, 260),
+        "lifetime": (0.2, 0.3),
+        "size": (5, 9),
+        "colors": [(150, 130, 110, 255), (110, 95, 80, 255)],
+    },
+
+    "earthquake": {
+        "count": 90,
+        "pattern": "area",
+        "speed": (10, 40),
+        "lifetime": (0.4, 0.7),
+        "size": (6, 12),
+        "colors": [(140, 110, 70, 230), (100, 80, 50, 230), (180, 150, 100, 230)],
+    },
+}
+
+VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+in vec2 in_pos;
+in float in_size;
+in vec4 in_color;
+
+out vec4 v_color;
+
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_pos, 0.0, 1.0);
+    gl_PointSize = in_size;
+    v_color = in_color;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+out vec4 fragColor;
+
+void main() {
+    // Round points: drop the corners of the point square
+    vec2 offset = gl_PointCoord - vec2(0.5);
+    if (dot(offset, offset) > 0.25) {
+        discard;
+    }
+    fragColor = v_color;
+}
+"""
+
+# Interleaved per-particle vertex: position, size, normalized RGBA bytes
+VERTEX_DTYPE = np.dtype([("pos", np.float32, 2), ("size", np.float32), ("color", np.uint8, 4)])
+
+
+class ParticleSystem:
+    """Fixed-capacity particle storage updated and drawn in batches"""
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+
+        # Per-particle state
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 4), dtype=np.uint8)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.count = 0
+
+        # Emitter palettes resolved once
+        self.palettes = {
+            effect_id: np.array([_rgba(color) for color in emitter["colors"]], dtype=np.uint8)
+            for effect_id, emitter in PARTICLE_EMITTERS.items()
+        }
+
+        # Scratch buffers reused every frame
+        self._fade = np.zeros(capacity, dtype=np.float32)
+        self._dead = np.zeros(capacity, dtype=bool)
+        self._vertices = np.zeros(capacity, dtype=VERTEX_DTYPE)
+
+        # GL objects, created on first draw (needs a window)
+        self._program = None
+        self._buffer = None
+        self._geometry = None
+
+    def emit(self, effect_id, x, y, dir_x=1.0, dir_y=0.0, reach=None):
+        """
+        Spawn one burst of an emitter's particles at (x, y)
+        Returns how many particles were spawned (fewer if the pool is full).
+        """
+        emitter = PARTICLE_EMITTERS.get(effect_id)
+        if emitter is None:
+            return 0
+
+        slots = np.flatnonzero(~self.active)[:emitter["count"]]
+        n = slots.size
+        if n == 0:
+            return 0
+
+        rng = self.rng
+        life = rng.uniform(*emitter["lifetime"], size=n)
+        speed = rng.uniform(*emitter["speed"], size=n)
+
+        pattern = emitter["pattern"]
+        if pattern == "cone":
+            half = emitter["angle"] / 2
+            angle = math.atan2(dir_y, dir_x) + rng.uniform(-half, half, size=n)
+        else:
+            angle = rng.uniform(0, 2 * math.pi, size=n)
+
+        if pattern == "area":
+            # Scatter over the disk (sqrt keeps the density even)
+            radius = (reach or 0) * np.sqrt(rng.random(n))
+            self.x[slots] = x + np.cos(angle) * radius
+            self.y[slots] = y + np.sin(angle) * radius
+            angle = rng.uniform(0, 2 * math.pi, size=n)
+        else:
+            if reach is not None:
+                speed *= reach / (emitter["speed"][1] * emitter["lifetime"][1])
+            self.x[slots] = x
+            self.y[slots] = y
+
+        self.vx[slots] = np.cos(angle) * speed
+        self.vy[slots] = np.sin(angle) * speed
+        self.life[slots] = life
+        self.max_life[slots] = life
+        self.size[slots] = rng.uniform(*emitter["size"], size=n)
+        palette = self.palettes[effect_id]
+        self.color[slots] = palette[rng.integers(len(palette), size=n)]
+        self.active[slots] = True
+
+        self.count += n
+        return n
+
+    def clear(self):
+        """Remove every particle (e.g. on floor change)"""
+        self.active.fill(False)
+        self.count = 0
+
+    def update(self, delta_time):
+        """Move and age every live particle, culling the expired ones"""
+        if self.count == 0:
+            return
+
+        step = self._fade
+        np.multiply(self.vx, delta_time, out=step)
+        self.x += step
+        np.multiply(self.vy, delta_time, out=step)
+        self.y += step
+        self.life -= delta_time
+
+        dead = self._dead
+        np.less_equal(self.life, 0, out=dead)
+        dead &= self.active
+        if dead.any():
+            self.active &= ~dead
+            self.count = int(np.count_nonzero(self.active))
+
+    def _create_gl(self):
+        """Create the point shader and a vertex buffer sized for the pool"""
+        ctx = arcade.get_window().ctx
+        self._program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self._buffer = ctx.buffer(reserve=self.capacity * VERTEX_DTYPE.itemsize)
+        self._geometry = ctx.geometry(
+            [BufferDescription(self._buffer, "2f 1f 4f1", ["in_pos", "in_size", "in_color"])],
+            mode=ctx.POINTS,
+        )
+
+    def draw(self):
+        """Draw every live particle in one call, shrinking and fading with age"""
+        if self.count == 0:
+            return
+        if self._program is None:
+            self._create_gl()
+
+        live = np.flatnonzero(self.active)
+        n = live.size
+        vertices = self._vertices[:n]
+
+        fade = self._fade[:n]
+        np.divide(self.life[live], self.max_life[live], out=fade)
+        vertices["pos"][:, 0] = self.x[live]
+        vertices["pos"][:, 1] = self.y[live]
+        np.multiply(self.size[live], fade, out=vertices["size"])
+        vertices["color"] = self.color[live]
+        vertices["color"][:, 3] = self.color[live, 3] * fade
+
+        self._buffer.write(vertices.tobytes())
+
+        ctx = self._program.ctx
+        with ctx.enabled(ctx.BLEND, gl.GL_PROGRAM_POINT_SIZE):
+            self._geometry.render(self._program, vertices=n)
+
+
+def _rgba(color):
+    """Pad an RGB color to RGBA"""
+    return tuple(color) if len(color) == 4 else (*color, 255)
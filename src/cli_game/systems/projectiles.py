@@ -0,0 +1,298 @@
+"""
+Pooled, array-backed projectile system
+
+All projectile state lives in fixed-capacity NumPy arrays allocated once.
+Each step integrates every live projectile at once and resolves swept-segment
+collisions against the wall grid and the enemy SpatialGrid.
+"""
+
+import heapq
+import math
+import arcade
+import numpy as np
+from ..config import *
+
+OWNER_PLAYER = 0
+OWNER_ENEMY = 1
+
+# Half the width of a player/enemy body, added to the projectile radius
+BODY_RADIUS = TILE_SIZE / 2
+
+
+class ProjectilePool:
+    """Fixed-capacity projectile storage updated in vectorized steps"""
+
+    def __init__(self, capacity=PROJECTILE_CAPACITY):
+        self.capacity = capacity
+
+        # Per-projectile state
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.damage = np.zeros(capacity, dtype=np.float32)
+        self.radius = np.zeros(capacity, dtype=np.float32)
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.active = np.zeros(capacity, dtype=bool)
+
+        # Free slots as a min-heap so live projectiles stay packed at the front
+        self._free = list(range(capacity))
+        self.count = 0
+        self._high = 0  # One past the highest slot that may be live
+
+        # Scratch buffers reused every step
+        self._dx = np.zeros(capacity, dtype=np.float32)
+        self._dy = np.zeros(capacity, dtype=np.float32)
+        self._sx = np.zeros(capacity, dtype=np.float32)
+        self._sy = np.zeros(capacity, dtype=np.float32)
+        self._wx = np.zeros(capacity, dtype=np.float32)
+        self._wy = np.zeros(capacity, dtype=np.float32)
+        self._seg_len_sq = np.zeros(capacity, dtype=np.float32)
+        self._reach_sq = np.zeros(capacity, dtype=np.float32)
+        self._t_end = np.zeros(capacity, dtype=np.float32)
+        self._tmp = np.zeros(capacity, dtype=np.float32)
+        self._proj = np.zeros(capacity, dtype=np.float32)
+        self._tile = np.zeros(capacity, dtype=np.intp)
+        self._tile_row = np.zeros(capacity, dtype=np.intp)
+        self._wall_hit = np.zeros(capacity, dtype=bool)
+        self._blocked = np.zeros(capacity, dtype=bool)
+        self._owned = np.zeros(capacity, dtype=bool)
+        self._hit = np.zeros(capacity, dtype=bool)
+        self._spent = np.zeros(capacity, dtype=bool)
+
+    def spawn(self, x, y, vx, vy, lifetime, damage, owner, radius=PROJECTILE_RADIUS):
+        """Activate a free slot; returns its index, or -1 if the pool is full"""
+        if not self._free:
+            return -1
+
+        slot = heapq.heappop(self._free)
+        self.x[slot] = x
+        self.y[slot] = y
+        self.vx[slot] = vx
+        self.vy[slot] = vy
+        self.life[slot] = lifetime
+        self.damage[slot] = damage
+        self.radius[slot] = radius
+        self.owner[slot] = owner
+        self.active[slot] = True
+
+        self.count += 1
+        self._high = max(self._high, slot + 1)
+        return slot
+
+    def spawn_fan(self, x, y, dir_x, dir_y, speed, count, spread, lifetime, damage, owner):
+        """Spawn count projectiles spread evenly across an arc around a direction"""
+        base_angle = math.atan2(dir_y, dir_x)
+        for i in range(count):
+            offset = 0.0 if count == 1 else spread * (i / (count - 1) - 0.5)
+            angle = base_angle + offset
+            self.spawn(
+                x, y, math.cos(angle) * speed, math.sin(angle) * speed,
+                lifetime, damage, owner
+            )
+
+    def clear(self):
+        """Remove every projectile (e.g. on floor change)"""
+        self.active.fill(False)
+        self.vx.fill(0)
+        self.vy.fill(0)
+        self._free = list(range(self.capacity))
+        self.count = 0
+        self._high = 0
+
+    def _release(self, mask):
+        """Deactivate projectiles in mask and return their slots to the pool"""
+        slots = np.flatnonzero(mask)
+        if not slots.size:
+            return
+
+        self.active[slots] = False
+        self.vx[slots] = 0
+        self.vy[slots] = 0
+        for slot in slots.tolist():
+            heapq.heappush(self._free, slot)
+        self.count -= slots.size
+
+        live = np.flatnonzero(self.active[:self._high])
+        self._high = int(live[-1]) + 1 if live.size else 0
+
+    def _segment_hits(self, n, px, py, out):
+        """
+        Mark projectiles whose swept segment this step passes within reach
+        of the point (px, py). Only slots already set in out are tested.
+        """
+        wx, wy = self._wx[:n], self._wy[:n]
+        tmp, proj = self._tmp[:n], self._proj[:n]
+        seg_x, seg_y = self._sx[:n], self._sy[:n]
+        near = self._wall_hit[:n]
+
+        # Parameter of the closest point on each segment, clamped to [0, 1]
+        np.subtract(px, self.x[:n], out=wx)
+        np.subtract(py, self.y[:n], out=wy)
+        np.multiply(wx, seg_x, out=tmp)
+        np.multiply(wy, seg_y, out=proj)
+        tmp += proj
+        tmp /= self._seg_len_sq[:n]
+        np.clip(tmp, 0, 1, out=tmp)
+
+        # Squared distance from the point to that closest point
+        np.multiply(seg_x, tmp, out=proj)
+        wx -= proj
+        np.multiply(seg_y, tmp, out=proj)
+        wy -= proj
+        np.multiply(wx, wx, out=tmp)
+        np.multiply(wy, wy, out=proj)
+        tmp += proj
+
+        np.less_equal(tmp, self._reach_sq[:n], out=near)
+        np.logical_and(out, near, out=out)
+        return out
+
+    def step(self, delta_time, wall_grid, enemy_index, players):
+        """
+        Advance every live projectile and resolve swept collisions
+        Enemy projectiles damage the players directly, each consumed by the first it touches.
+        Returns a list of (enemy, damage) hits from player projectiles.
+        """
+        hits = []
+        if self.count == 0:
+            return hits
+
+        n = self._high
+        active = self.active[:n]
+        dx, dy = self._dx[:n], self._dy[:n]
+        sx, sy, tmp = self._sx[:n], self._sy[:n], self._tmp[:n]
+        t_end, blocked, wall_hit = self._t_end[:n], self._blocked[:n], self._wall_hit[:n]
+        tile, tile_row = self._tile[:n], self._tile_row[:n]
+
+        np.multiply(self.vx[:n], delta_time, out=dx)
+        np.multiply(self.vy[:n], delta_time, out=dy)
+
+        # Walls: sample each path at most half a tile apart
+        np.hypot(dx, dy, out=tmp)
+        substeps = max(1, math.ceil(float(tmp.max()) / (TILE_SIZE / 2)))
+
+        rows, cols = wall_grid.shape
+        flat_grid = wall_grid.ravel()
+        t_end.fill(1.0)
+        blocked.fill(False)
+        for i in range(1, substeps + 1):
+            t = i / substeps
+            np.multiply(dx, t, out=sx)
+            sx += self.x[:n]
+            np.multiply(dy, t, out=sy)
+            sy += self.y[:n]
+
+            # Flat tile index of each sample point
+            np.floor_divide(sx, TILE_SIZE, out=tmp)
+            np.clip(tmp, 0, cols - 1, out=tmp)
+            tile[:] = tmp
+            np.floor_divide(sy, TILE_SIZE, out=tmp)
+            np.clip(tmp, 0, rows - 1, out=tmp)
+            tile_row[:] = tmp
+            tile_row *= cols
+            tile += tile_row
+            np.take(flat_grid, tile, out=wall_hit)
+
+            # Projectiles that reach a wall stop just before it
+            np.logical_and(wall_hit, active, out=wall_hit)
+            np.greater(wall_hit, blocked, out=wall_hit)
+            np.copyto(t_end, (i - 1) / substeps, where=wall_hit)
+            np.logical_or(blocked, wall_hit, out=blocked)
+
+        # Swept segment for this step, cut short at walls
+        np.multiply(dx, t_end, out=sx)
+        np.multiply(dy, t_end, out=sy)
+        seg_len_sq = self._seg_len_sq[:n]
+        np.multiply(sx, sx, out=seg_len_sq)
+        np.multiply(sy, sy, out=tmp)
+        seg_len_sq += tmp
+        np.maximum(seg_len_sq, 1e-6, out=seg_len_sq)
+
+        reach_sq = self._reach_sq[:n]
+        np.add(self.radius[:n], BODY_RADIUS, out=reach_sq)
+        reach_sq *= reach_sq
+
+        spent = self._spent[:n]
+        spent.fill(False)
+
+        owned, hit = self._owned[:n], self._hit[:n]
+
+        # Player projectiles against enemies near the swarm
+        np.equal(self.owner[:n], OWNER_PLAYER, out=owned)
+        np.logical_and(owned, active, out=owned)
+        if owned.any():
+            for enemy in self._enemies_near(n, owned, enemy_index):
+                if not enemy.is_alive():
+                    continue
+                np.greater(owned, spent, out=hit)
+                self._segment_hits(n, enemy.center_x, enemy.center_y, hit)
+                if not hit.any():
+                    continue
+
+                # Each projectile is consumed by the first enemy it touches
+                for damage in self.damage[:n][hit].tolist():
+                    if not enemy.is_alive():
+                        break
+                    hits.append((enemy, enemy.take_damage(int(damage))))
+                np.logical_or(spent, hit, out=spent)
+
+        # Enemy projectiles against the players
+        np.equal(self.owner[:n], OWNER_ENEMY, out=owned)
+        np.logical_and(owned, active, out=owned)
+        if players and owned.any():
+            for player in players:
+                np.greater(owned, spent, out=hit)
+                self._segment_hits(n, player.center_x, player.center_y, hit)
+                if hit.any():
+                    player.take_damage(int(self.damage[:n][hit].max()))
+                    np.logical_or(spent, hit, out=spent)
+
+        # Move survivors and age everything
+        self.x[:n] += dx
+        self.y[:n] += dy
+        self.life[:n] -= delta_time
+        np.less_equal(self.life[:n], 0, out=wall_hit)
+        np.logical_or(spent, wall_hit, out=spent)
+        np.logical_or(spent, blocked, out=spent)
+        np.logical_and(spent, active, out=spent)
+        self._release(spent)
+
+        return hits
+
+    def live(self):
+        """(x, y, owner) arrays of the live projectiles"""
+        n = self._high
+        mask = self.active[:n]
+        return self.x[:n][mask], self.y[:n][mask], self.owner[:n][mask]
+
+    def _enemies_near(self, n, mask, enemy_index):
+        """Broadphase: enemies in the bounding box of all masked segments"""
+        x, y = self.x[:n], self.y[:n]
+        end_x = np.add(x, self._sx[:n], out=self._wx[:n])
+        end_y = np.add(y, self._sy[:n], out=self._wy[:n])
+
+        left = min(x.min(where=mask, initial=np.inf), end_x.min(where=mask, initial=np.inf))
+        right = max(x.max(where=mask, initial=-np.inf), end_x.max(where=mask, initial=-np.inf))
+        bottom = min(y.min(where=mask, initial=np.inf), end_y.min(where=mask, initial=np.inf))
+        top = max(y.max(where=mask, initial=-np.inf), end_y.max(where=mask, initial=-np.inf))
+
+        pad = float(self.radius[:n].max()) + BODY_RADIUS
+        return enemy_index.query_rect(left - pad, bottom - pad, right + pad, top + pad)
+
+    def draw(self):
+        """Draw all live projectiles, one batched call per owner"""
+        n = self._high
+        if n == 0:
+            return
+
+        colors = (
+            (OWNER_PLAYER, COLOR_PROJECTILE_PLAYER),
+            (OWNER_ENEMY, COLOR_PROJECTILE_ENEMY),
+        )
+        for owner, color in colors:
+            mask = self.active[:n] & (self.owner[:n] == owner)
+            if mask.any():
+                points = np.column_stack((self.x[:n][mask], self.y[:n][mask])).tolist()
+                arcade.draw_points(points, color, PROJECTILE_RADIUS * 2)
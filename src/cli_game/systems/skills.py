@@ -1,220 +1,236 @@
 """
 Active skill system
+
+Skills are plain data in SKILL_REGISTRY. Each entry declares a targeting shape
+and its numbers; one generic kernel (execute_skills) runs every skill.
 """
 
-import time
 import math
-import arcade
+from ..config import TILE_SIZE
+from .geometry import query_ring, query_cone, query_box, query_capsule
+from .projectiles import OWNER_PLAYER
+
+
+# Skill definitions
+# Each skill has: name, description, cooldown, shape, range, multiplier,
+# max_targets (None = unlimited), falloff (fraction of damage lost at max range)
+# Shape-specific keys: cone -> angle, ring -> inner_range, box/capsule -> width,
+# projectile -> count, speed (pixels per second), spread (arc in radians)
+SKILL_REGISTRY = {
+    "fire_breath": {
+        "name": "Fire Breath",
+        "description": "Breathe fire in front, dealing 2x ATK damage in a cone",
+        "cooldown": 3.0,
+        "shape": "cone",
+        "range": 150,
+        "angle": math.pi / 3,  # 60 degrees
+        "multiplier": 2.0,
+        "max_targets": None,
+        "falloff": 0.0,
+    },
+
+    "wing_buffet": {
+        "name": "Wing Buffet",
+        "description": "Powerful wing attack around you, 1.5x ATK damage",
+        "cooldown": 4.0,
+        "shape": "circle",
+        "range": 100,
+        "multiplier": 1.5,
+        "max_targets": None,
+        "falloff": 0.0,
+    },
+
+    "tidal_crash": {
+        "name": "Tidal Crash",
+        "description": "Launch a wave of water, 2.5x ATK damage",
+        "cooldown": 4.5,
+        "shape": "projectile",
+        "range": 200,
+        "count": 5,
+        "speed": 360,
+        "spread": math.pi / 4,
+        "multiplier": 2.5,
+        "max_targets": None,
+        "falloff": 0.0,
+    },
+
+    "leviathan_roar": {
+        "name": "Leviathan Roar",
+        "description": "Powerful roar, 1.8x ATK damage to all nearby enemies",
+        "cooldown": 5.0,
+        "shape": "circle",
+        "range": 150,
+        "multiplier": 1.8,
+        "max_targets": None,
+        "falloff": 0.0,
+    },
+
+    "stone_punch": {
+        "name": "Stone Punch",
+        "description": "Devastating punch, 3x ATK damage to target in front",
+        "cooldown": 3.5,
+        "shape": "box",
+        "range": 80,
+        "width": TILE_SIZE * 1.5,
+        "multiplier": 3.0,
+        "max_targets": 1,
+        "falloff": 0.0,
+    },
+
+    "earthquake": {
+        "name": "Earthquake",
+        "description": "Slam the ground, 2x ATK damage in large area",
+        "cooldown": 6.0,
+        "shape": "circle",
+        "range": 180,
+        "multiplier": 2.0,
+        "max_targets": None,
+        "falloff": 0.0,
+    },
+}
+
+
+def _target_circle(skill, player, enemy_index):
+    return query_ring(enemy_index, player.center_x, player.center_y, 0, skill.range)
+
+
+def _target_ring(skill, player, enemy_index):
+    return query_ring(
+        enemy_index, player.center_x, player.center_y, skill.inner_range, skill.range
+    )
+
+
+def _target_cone(skill, player, enemy_index):
+    return query_cone(
+        enemy_index, player.center_x, player.center_y,
+        player.facing_x, player.facing_y, skill.range, skill.angle
+    )
+
+
+def _target_box(skill, player, enemy_index):
+    return query_box(
+        enemy_index, player.center_x, player.center_y,
+        player.facing_x, player.facing_y, skill.range, skill.width
+    )
+
+
+def _target_capsule(skill, player, enemy_index):
+    # Sweep from the player forward; width is the capsule's diameter
+    end_x = player.center_x + player.facing_x * skill.range
+    end_y = player.center_y + player.facing_y * skill.range
+    return query_capsule(
+        enemy_index, player.center_x, player.center_y, end_x, end_y, skill.width / 2
+    )
+
+
+SHAPE_TARGETING = {
+    "circle": _target_circle,
+    "ring": _target_ring,
+    "cone": _target_cone,
+    "box": _target_box,
+    "capsule": _target_capsule,
+    "projectile": None,  # Spawns projectiles instead of hitting instantly
+}
 
 
 class Skill:
-    """Base skill class"""
+    """An active skill built from a SKILL_REGISTRY definition"""
 
-    def __init__(self, skill_id, name, description, cooldown):
+    def __init__(self, skill_id, definition):
         self.id = skill_id
-        self.name = name
-        self.description = description
-        self.cooldown = cooldown
-        self.last_used = 0
-
-    def can_use(self):
-        """Check if skill is off cooldown"""
-        return time.time() - self.last_used >= self.cooldown
-
-    def get_remaining_cooldown(self):
-        """Get remaining cooldown time"""
-        elapsed = time.time() - self.last_used
-        remaining = max(0, self.cooldown - elapsed)
-        return remaining
-
-    def activate(self, player, enemies, walls):
-        """Activate the skill"""
-        if not self.can_use():
-            return False
-
-        self.last_used = time.time()
-        self._execute(player, enemies, walls)
-        return True
-
-    def _execute(self, player, enemies, walls):
-        """Override this in subclasses"""
-        pass
-
-
-class FireBreath(Skill):
-    """Dragon fire breath cone attack"""
-
-    def __init__(self):
-        super().__init__(
-            "fire_breath",
-            "Fire Breath",
-            "Breathe fire in front, dealing 2x ATK damage in a cone",
-            3.0
-        )
-        self.range = 150
-        self.cone_angle = math.pi / 3  # 60 degrees
-
-    def _execute(self, player, enemies, walls):
-        """Deal damage to enemies in front cone"""
-        damage = player.atk * 2
-
-        for enemy in enemies:
-            dx = enemy.center_x - player.center_x
-            dy = enemy.center_y - player.center_y
-            distance = math.sqrt(dx * dx + dy * dy)
-
-            if distance <= self.range and distance > 0:
-                # Check if in cone (simplified - just check distance for MVP)
-                enemy.take_damage(damage)
-
-
-class WingBuffet(Skill):
-    """Dragon wing attack that knocks back"""
-
-    def __init__(self):
-        super().__init__(
-            "wing_buffet",
-            "Wing Buffet",
-            "Powerful wing attack around you, 1.5x ATK damage",
-            4.0
-        )
-        self.range = 100
-
-    def _execute(self, player, enemies, walls):
-        """Deal damage to nearby enemies"""
-        damage = int(player.atk * 1.5)
-
-        for enemy in enemies:
-            distance = math.sqrt(
-                (enemy.center_x - player.center_x) ** 2 +
-                (enemy.center_y - player.center_y) ** 2
-            )
-            if distance <= self.range:
-                enemy.take_damage(damage)
-
-
-class TidalCrash(Skill):
-    """Leviathan wave attack"""
-
-    def __init__(self):
-        super().__init__(
-            "tidal_crash",
-            "Tidal Crash",
-            "Launch a wave of water, 2.5x ATK damage",
-            4.5
-        )
-        self.range = 200
-
-    def _execute(self, player, enemies, walls):
-        """Linear wave attack"""
-        damage = int(player.atk * 2.5)
-
-        for enemy in enemies:
-            dx = enemy.center_x - player.center_x
-            dy = enemy.center_y - player.center_y
-            distance = math.sqrt(dx * dx + dy * dy)
-
-            if distance <= self.range:
-                enemy.take_damage(damage)
-
-
-class LeviathanRoar(Skill):
-    """AoE stun/damage"""
-
-    def __init__(self):
-        super().__init__(
-            "leviathan_roar",
-            "Leviathan Roar",
-            "Powerful roar, 1.8x ATK damage to all nearby enemies",
-            5.0
-        )
-        self.range = 150
-
-    def _execute(self, player, enemies, walls):
-        """AoE damage"""
-        damage = int(player.atk * 1.8)
-
-        for enemy in enemies:
-            distance = math.sqrt(
-                (enemy.center_x - player.center_x) ** 2 +
-                (enemy.center_y - player.center_y) ** 2
-            )
-            if distance <= self.range:
-                enemy.take_damage(damage)
-
-
-class StonePunch(Skill):
-    """Heavy melee attack"""
-
-    def __init__(self):
-        super().__init__(
-            "stone_punch",
-            "Stone Punch",
-            "Devastating punch, 3x ATK damage to target in front",
-            3.5
-        )
-        self.range = 80
-
-    def _execute(self, player, enemies, walls):
-        """Heavy single target damage"""
-        damage = int(player.atk * 3)
-
-        # Find closest enemy in front
-        closest = None
-        closest_dist = self.range
-
-        for enemy in enemies:
-            dx = enemy.center_x - player.center_x
-            dy = enemy.center_y - player.center_y
-            distance = math.sqrt(dx * dx + dy * dy)
-
-            if distance < closest_dist:
-                closest = enemy
-                closest_dist = distance
-
-        if closest:
-            closest.take_damage(damage)
-
-
-class Earthquake(Skill):
-    """AoE ground slam"""
-
-    def __init__(self):
-        super().__init__(
-            "earthquake",
-            "Earthquake",
-            "Slam the ground, 2x ATK damage in large area",
-            6.0
-        )
-        self.range = 180
-
-    def _execute(self, player, enemies, walls):
-        """Large AoE damage"""
-        damage = int(player.atk * 2)
-
-        for enemy in enemies:
-            distance = math.sqrt(
-                (enemy.center_x - player.center_x) ** 2 +
-                (enemy.center_y - player.center_y) ** 2
-            )
-            if distance <= self.range:
-                enemy.take_damage(damage)
-
-
-# Skill registry
-SKILL_REGISTRY = {
-    "fire_breath": FireBreath,
-    "wing_buffet": WingBuffet,
-    "tidal_crash": TidalCrash,
-    "leviathan_roar": LeviathanRoar,
-    "stone_punch": StonePunch,
-    "earthquake": Earthquake,
-}
+        self.name = definition["name"]
+        self.description = definition["description"]
+        self.cooldown = definition["cooldown"]
+        self.ready_at = 0.0  # Game time when the skill can fire again
+
+        # Resolve the definition once so the kernel never touches the dict
+        shape = definition["shape"]
+        if shape not in SHAPE_TARGETING:
+            raise ValueError(f"Skill '{skill_id}' has unknown shape '{shape}'")
+        self.shape = shape
+        self.find_targets = SHAPE_TARGETING[shape]
+        self.range = definition["range"]
+        self.inner_range = definition.get("inner_range", 0)
+        self.angle = definition.get("angle", 0)
+        self.width = definition.get("width", 0)
+        self.multiplier = definition["multiplier"]
+        self.max_targets = definition.get("max_targets")
+        self.falloff = definition.get("falloff", 0.0)
+        self.count = definition.get("count", 1)
+        self.speed = definition.get("speed", 0)
+        self.spread = definition.get("spread", 0)
+
+    def can_use(self, now):
+        """Check if skill is off cooldown at game time now"""
+        return now >= self.ready_at
+
+    def get_remaining_cooldown(self, now):
+        """Get remaining cooldown time at game time now"""
+        return max(0, self.ready_at - now)
+
+    def start_cooldown(self, now):
+        """Mark the skill as used at game time now"""
+        self.ready_at = now + self.cooldown
+
+    def activate(self, player, enemy_index, projectiles=None):
+        """
+        Fire the skill immediately
+        Returns the list of (enemy, damage) hits, or None if on cooldown
+        """
+        now = player.timers.now
+        if not self.can_use(now):
+            return None
+
+        self.start_cooldown(now)
+        return execute_skills([self], player, enemy_index, projectiles)
+
+
+def execute_skills(skills, player, enemy_index, projectiles=None):
+    """
+    Run every skill cast by the player this tick through one shared kernel
+    Cooldowns are not checked here; callers start them when queueing casts.
+    Projectile skills spawn into the projectiles pool and report hits later.
+    Returns a list of (enemy, damage) hits in the order they were applied.
+    """
+    hits = []
+    if not skills:
+        return hits
+
+    atk = player.atk
+    for skill in skills:
+        if skill.find_targets is None:
+            if projectiles is not None:
+                projectiles.spawn_fan(
+                    player.center_x, player.center_y,
+                    player.facing_x, player.facing_y,
+                    skill.speed, skill.count, skill.spread,
+                    skill.range / skill.speed,
+                    int(atk * skill.multiplier), OWNER_PLAYER
+                )
+            continue
+
+        targets = skill.find_targets(skill, player, enemy_index)
+        if skill.max_targets is not None:
+            targets = targets[:skill.max_targets]
+
+        base_damage = atk * skill.multiplier
+        falloff = skill.falloff
+        for enemy, distance in targets:
+            # Earlier casts this tick may already have killed it
+            if not enemy.is_alive():
+                continue
+
+            damage = base_damage
+            if falloff:
+                damage *= 1 - falloff * min(1.0, distance / skill.range)
+            hits.append((enemy, enemy.take_damage(int(damage))))
+
+    return hits
 
 
 def get_skill_by_id(skill_id):
     """Get a skill instance by ID"""
-    skill_class = SKILL_REGISTRY.get(skill_id)
-    if skill_class:
-        return skill_class()
+    definition = SKILL_REGISTRY.get(skill_id)
+    if definition:
+        return Skill(skill_id, definition)
     return None
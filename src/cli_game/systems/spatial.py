@@ -0,0 +1,118 @@
+"""
+Uniform grid spatial index for fast neighbourhood lookups
+"""
+
+import math
+from ..config import TILE_SIZE
+
+
+class SpatialGrid:
+    """Buckets sprites into square cells by their center point"""
+
+    def __init__(self, cell_size=TILE_SIZE * 4):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.item_cells = {}
+
+    def _cell_of(self, x, y):
+        """Get the cell key containing a world position"""
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def clear(self):
+        """Remove every item from the grid"""
+        self.cells.clear()
+        self.item_cells.clear()
+
+    def insert(self, item):
+        """Add an item at its current center position"""
+        key = self._cell_of(item.center_x, item.center_y)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            bucket = self.cells[key] = []
+        bucket.append(item)
+        self.item_cells[id(item)] = key
+
+    def remove(self, item):
+        """Remove an item from the grid (no-op if it isn't indexed)"""
+        key = self.item_cells.pop(id(item), None)
+        if key is None:
+            return
+        bucket = self.cells[key]
+        bucket.remove(item)
+        if not bucket:
+            del self.cells[key]
+
+    def rebuild(self, items):
+        """Re-index all items from scratch (call once per tick after movement)"""
+        self.clear()
+        for item in items:
+            self.insert(item)
+
+    def __len__(self):
+        return len(self.item_cells)
+
+    def cells_in_rect(self, left, bottom, right, top):
+        """Get the keys of occupied cells overlapping an axis-aligned rectangle"""
+        min_cx, min_cy = self._cell_of(left, bottom)
+        max_cx, max_cy = self._cell_of(right, top)
+
+        # Few cells covered: probe them directly. Huge rects: walk occupied cells.
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self.cells):
+            return [
+                (cx, cy) for cx, cy in self.cells
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy
+            ]
+
+        cells = self.cells
+        return [
+            (cx, cy)
+            for cx in range(min_cx, max_cx + 1)
+            for cy in range(min_cy, max_cy + 1)
+            if (cx, cy) in cells
+        ]
+
+    def query_rect(self, left, bottom, right, top):
+        """Get candidate items whose cell overlaps an axis-aligned rectangle"""
+        result = []
+        for key in self.cells_in_rect(left, bottom, right, top):
+            result.extend(self.cells[key])
+        return result
+
+    def query_radius(self, x, y, radius):
+        """Get candidate items in the cells overlapping a circle's bounding box"""
+        return self.query_rect(x - radius, y - radius, x + radius, y + radius)
+
+    def nearest(self, x, y, max_distance=math.inf):
+        """Get the (item, distance) closest to a point, or (None, max_distance)"""
+        best = None
+        best_dist = max_distance
+        if max_distance == math.inf:
+            candidates = self._all()
+        else:
+            candidates = self.query_radius(x, y, max_distance)
+
+        for item in candidates:
+            dx = item.center_x - x
+            dy = item.center_y - y
+            dist = math.sqrt(dx * dx + dy * dy)
+            if dist < best_dist:
+                best = item
+                best_dist = dist
+        return best, best_dist
+
+    def _all(self):
+        """Iterate over every indexed item"""
+        for bucket in self.cells.values():
+            yield from bucket
+
+
+def rect_hits_grid(grid, left, bottom, right, top, cell_size=TILE_SIZE):
+    """Check whether a rectangle overlaps any set cell of an occupancy grid indexed [y, x]"""
+    rows, cols = grid.shape
+    x0 = max(0, int(left // cell_size))
+    y0 = max(0, int(bottom // cell_size))
+    x1 = min(cols, math.ceil(right / cell_size))
+    y1 = min(rows, math.ceil(top / cell_size))
+    if x0 >= x1 or y0 >= y1:
+        return False
+    return bool(grid[y0:y1, x0:x1].any())
@@ -0,0 +1,121 @@
+"""
+Hierarchical timer wheel driven by game time
+
+Timers live in slots of four 64-slot wheels, each wheel covering 64x the span
+of the one below. Advancing only touches the current slot (plus an occasional
+cascade), so per-frame cost depends on how many timers fire, not how many exist.
+"""
+
+from ..config import TIMER_RESOLUTION
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+LEVELS = 4
+
+
+class Timer:
+    """Handle for a scheduled callback"""
+
+    __slots__ = ("expires", "interval", "callback", "cancelled")
+
+    def __init__(self, expires, interval, callback):
+        self.expires = expires  # Absolute tick
+        self.interval = interval  # Ticks between repeats, or 0 for one-shot
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop the timer from firing again"""
+        self.cancelled = True
+
+
+class TimerWheel:
+    """Schedules one-shot and repeating callbacks against game time"""
+
+    def __init__(self, resolution=TIMER_RESOLUTION):
+        self.resolution = resolution
+        self.now = 0.0  # Game time in seconds
+        self.tick = 0
+        self.wheels = [[[] for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self.overflow = []
+
+    def schedule(self, delay, callback, repeat=None):
+        """
+        Call callback after delay seconds of game time
+        repeat: seconds between further calls, or None for one-shot
+        """
+        ticks = max(1, round(delay / self.resolution))
+        interval = 0
+        if repeat is not None:
+            interval = max(1, round(repeat / self.resolution))
+
+        timer = Timer(self.tick + ticks, interval, callback)
+        self._insert(timer)
+        return timer
+
+    def schedule_repeating(self, interval, callback):
+        """Call callback every interval seconds, starting one interval from now"""
+        return self.schedule(interval, callback, repeat=interval)
+
+    def _insert(self, timer):
+        """Place a timer in the wheel level whose span covers its expiry"""
+        expires = timer.expires
+
+        for level in range(LEVELS):
+            shift = SLOT_BITS * (level + 1)
+            if expires >> shift == self.tick >> shift:
+                slot = (expires >> (SLOT_BITS * level)) & SLOT_MASK
+                self.wheels[level][slot].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def _cascade(self, level):
+        """Re-insert the current slot of a higher wheel into the lower wheels"""
+        slot = (self.tick >> (SLOT_BITS * level)) & SLOT_MASK
+        timers = self.wheels[level][slot]
+        if not timers:
+            return
+        self.wheels[level][slot] = []
+        for timer in timers:
+            if not timer.cancelled:
+                self._insert(timer)
+
+    def advance(self, delta_time):
+        """Move game time forward and fire every timer that came due"""
+        self.now += delta_time
+        target = int(self.now / self.resolution)
+
+        while self.tick < target:
+            self.tick += 1
+            tick = self.tick
+
+            # Pull timers down whenever a wheel rolls over, highest level first
+            if not tick & SLOT_MASK:
+                if not tick & ((1 << SLOT_BITS * LEVELS) - 1) and self.overflow:
+                    pending = self.overflow
+                    self.overflow = []
+                    for timer in pending:
+                        if not timer.cancelled:
+                            self._insert(timer)
+                for level in range(LEVELS - 1, 0, -1):
+                    if not tick & ((1 << SLOT_BITS * level) - 1):
+                        self._cascade(level)
+
+            slot = tick & SLOT_MASK
+            due = self.wheels[0][slot]
+            if not due:
+                continue
+            self.wheels[0][slot] = []
+
+            for timer in due:
+                if timer.cancelled:
+                    continue
+                timer.callback()
+                if timer.interval and not timer.cancelled:
+                    timer.expires = tick + timer.interval
+                    self._insert(timer)
+
+    def time_until(self, deadline):
+        """Seconds of game time left until a deadline (0 if passed)"""
+        return max(0.0, deadline - self.now)
@@ -3,16 +3,30 @@ Trait/perk system with passive abilities
 """
 
 import random
-import time
+
+
+# Offer weight for each rarity tier (higher = offered more often)
+RARITY_WEIGHTS = {
+    "common": 10,
+    "uncommon": 5,
+    "rare": 2,
+    "legendary": 1,
+}
 
 
 class Trait:
-    """Base trait class"""
+    """
+    Base trait class
+    Catalog metadata lives on the class so offers never need an instance.
+    """
 
-    def __init__(self, trait_id, name, description):
-        self.id = trait_id
-        self.name = name
-        self.description = description
+    id = None
+    name = ""
+    description = ""
+    rarity = "common"
+    weight = None  # Overrides the rarity weight when set
+    tags = ()
+    bit = 0  # Assigned by TraitCatalog at import
 
     def apply(self, player):
         """Apply trait to player (called when trait is acquired)"""
@@ -39,19 +53,19 @@ class Trait:
         return 0
 
     def update(self, player, delta_time):
-        """Called each frame"""
+        """Called each frame (prefer player.timers for periodic effects)"""
         pass
 
 
 class LifestealTrait(Trait):
     """Heal for a portion of damage dealt"""
 
+    id = "lifesteal"
+    name = "Lifesteal"
+    description = "Heal 15% of damage dealt"
+    tags = ("sustain", "offense")
+
     def __init__(self):
-        super().__init__(
-            "lifesteal",
-            "Lifesteal",
-            "Heal 15% of damage dealt"
-        )
         self.lifesteal_percent = 0.15
 
     def on_damage_dealt(self, damage):
@@ -61,12 +75,10 @@ class LifestealTrait(Trait):
 class PredatorInstinctTrait(Trait):
     """Increased damage vs low HP enemies"""
 
-    def __init__(self):
-        super().__init__(
-            "predator_instinct",
-            "Predator Instinct",
-            "Deal 25% more damage to enemies below 30% HP"
-        )
+    id = "predator_instinct"
+    name = "Predator Instinct"
+    description = "Deal 25% more damage to enemies below 30% HP"
+    tags = ("offense",)
 
     def modify_atk(self, atk):
         # This would need context about target HP, simplified for now
@@ -76,12 +88,10 @@ class PredatorInstinctTrait(Trait):
 class ArmorShellTrait(Trait):
     """Flat damage reduction"""
 
-    def __init__(self):
-        super().__init__(
-            "armor_shell",
-            "Armor Shell",
-            "Reduce incoming damage by 20%"
-        )
+    id = "armor_shell"
+    name = "Armor Shell"
+    description = "Reduce incoming damage by 20%"
+    tags = ("defense",)
 
     def modify_incoming_damage(self, damage):
         return int(damage * 0.8)
@@ -90,12 +100,10 @@ class ArmorShellTrait(Trait):
 class QuickFuryTrait(Trait):
     """Increased attack speed"""
 
-    def __init__(self):
-        super().__init__(
-            "quick_fury",
-            "Quick Fury",
-            "Reduce attack cooldown by 25%"
-        )
+    id = "quick_fury"
+    name = "Quick Fury"
+    description = "Reduce attack cooldown by 25%"
+    tags = ("offense",)
 
     def apply(self, player):
         player.attack_cooldown *= 0.75
@@ -104,31 +112,32 @@ class QuickFuryTrait(Trait):
 class RegrowthTrait(Trait):
     """Periodic HP regeneration"""
 
+    id = "regrowth"
+    name = "Regrowth"
+    description = "Regenerate 2 HP per second"
+    tags = ("sustain",)
+
     def __init__(self):
-        super().__init__(
-            "regrowth",
-            "Regrowth",
-            "Regenerate 2 HP per second"
-        )
         self.regen_per_second = 2
-        self.accumulated_time = 0
+        self.player = None
+        self.timer = None
 
-    def update(self, player, delta_time):
-        self.accumulated_time += delta_time
-        if self.accumulated_time >= 1.0:
-            player.heal(self.regen_per_second)
-            self.accumulated_time = 0
+    def apply(self, player):
+        self.player = player
+        self.timer = player.timers.schedule_repeating(1.0, self._regenerate)
+
+    def _regenerate(self):
+        """Timer callback: heal the player (a method, so replay keyframes can pickle it)"""
+        self.player.heal(self.regen_per_second)
 
 
 class RuneSurgeTrait(Trait):
     """Increased skill power"""
 
-    def __init__(self):
-        super().__init__(
-            "rune_surge",
-            "Rune Surge",
-            "Skills deal 30% more damage"
-        )
+    id = "rune_surge"
+    name = "Rune Surge"
+    description = "Skills deal 30% more damage"
+    tags = ("skills",)
 
     # This would need integration with skill damage calculation
 
@@ -136,12 +145,12 @@ class RuneSurgeTrait(Trait):
 class IronHideTrait(Trait):
     """Increased defense"""
 
+    id = "iron_hide"
+    name = "Iron Hide"
+    description = "+5 Defense"
+    tags = ("defense",)
+
     def __init__(self):
-        super().__init__(
-            "iron_hide",
-            "Iron Hide",
-            "+5 Defense"
-        )
         self.defense_bonus = 5
 
     def modify_def(self, defense):
@@ -151,12 +160,12 @@ class IronHideTrait(Trait):
 class BerserkerRageTrait(Trait):
     """Increased attack"""
 
+    id = "berserker_rage"
+    name = "Berserker Rage"
+    description = "+8 Attack"
+    tags = ("offense",)
+
     def __init__(self):
-        super().__init__(
-            "berserker_rage",
-            "Berserker Rage",
-            "+8 Attack"
-        )
         self.attack_bonus = 8
 
     def modify_atk(self, atk):
@@ -166,12 +175,10 @@ class BerserkerRageTrait(Trait):
 class DeadlyPrecisionTrait(Trait):
     """Increased crit chance"""
 
-    def __init__(self):
-        super().__init__(
-            "deadly_precision",
-            "Deadly Precision",
-            "+10% Critical Hit Chance"
-        )
+    id = "deadly_precision"
+    name = "Deadly Precision"
+    description = "+10% Critical Hit Chance"
+    tags = ("offense",)
 
     def modify_crit_chance(self, crit_chance):
         return crit_chance + 0.10
@@ -180,12 +187,12 @@ class DeadlyPrecisionTrait(Trait):
 class VitalityBoostTrait(Trait):
     """Increased max HP"""
 
+    id = "vitality_boost"
+    name = "Vitality Boost"
+    description = "+30 Max HP"
+    tags = ("defense", "sustain")
+
     def __init__(self):
-        super().__init__(
-            "vitality_boost",
-            "Vitality Boost",
-            "+30 Max HP"
-        )
         self.hp_bonus = 30
 
     def apply(self, player):
@@ -206,20 +213,119 @@ TRAIT_REGISTRY = [
 ]
 
 
-def get_random_traits(count=3, exclude_ids=None):
+class TraitCatalog:
     """
-    Get random traits for selection
-    exclude_ids: list of trait IDs to exclude (already owned)
+    Import-time index of trait classes for cheap weighted offers
+    Each trait gets a bit so an owned set is a single int mask, and offers
+    draw from a Vose alias table in O(1) per pick.
     """
-    if exclude_ids is None:
-        exclude_ids = set()
-    else:
-        exclude_ids = set(exclude_ids)
-
-    available = [t for t in TRAIT_REGISTRY if t().id not in exclude_ids]
 
-    if len(available) <= count:
-        return [t() for t in available]
+    # Rejected draws per pick before falling back to an exact linear pick
+    MAX_REJECTIONS = 16
+
+    def __init__(self, trait_classes):
+        self.classes = list(trait_classes)
+        self.by_id = {}
+        self.weights = []
+
+        for index, trait_class in enumerate(self.classes):
+            if trait_class.id in self.by_id:
+                raise ValueError(f"Duplicate trait id '{trait_class.id}'")
+            trait_class.bit = 1 << index
+            self.by_id[trait_class.id] = trait_class
+
+            weight = trait_class.weight
+            if weight is None:
+                weight = RARITY_WEIGHTS[trait_class.rarity]
+            self.weights.append(weight)
+
+        self.full_mask = (1 << len(self.classes)) - 1
+        self._build_alias_table()
+
+    def _build_alias_table(self):
+        """Build Vose's alias table from the trait weights"""
+        count = len(self.weights)
+        self.prob = [0.0] * count
+        self.alias = [0] * count
+        if count == 0:
+            return
+
+        total = sum(self.weights)
+        scaled = [w * count / total for w in self.weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.prob[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            if scaled[high] < 1.0:
+                small.append(high)
+            else:
+                large.append(high)
+
+        # Leftovers are 1.0 up to float error
+        for index in small + large:
+            self.prob[index] = 1.0
+
+    def get(self, trait_id):
+        """Get a trait class by ID"""
+        return self.by_id.get(trait_id)
+
+    def mask_for(self, trait_ids):
+        """Build an exclusion mask from trait IDs"""
+        mask = 0
+        for trait_id in trait_ids:
+            trait_class = self.by_id.get(trait_id)
+            if trait_class:
+                mask |= trait_class.bit
+        return mask
+
+    def with_tag(self, tag):
+        """Get all trait classes carrying a tag"""
+        return [t for t in self.classes if tag in t.tags]
+
+    def sample(self, count, exclude_mask=0, rng=random):
+        """
+        Draw up to count distinct trait classes, weighted, skipping excluded bits
+        Returns classes; instantiate only the one the player picks.
+        """
+        taken = exclude_mask & self.full_mask
+        picks = []
+        size = len(self.classes)
+
+        while len(picks) < count and taken != self.full_mask:
+            index = -1
+            for _ in range(self.MAX_REJECTIONS):
+                column = rng.randrange(size)
+                candidate = column if rng.random() < self.prob[column] else self.alias[column]
+                if not taken >> candidate & 1:
+                    index = candidate
+                    break
+
+            # Mostly excluded: pick exactly among what is left
+            if index < 0:
+                remaining = [i for i in range(size) if not taken >> i & 1]
+                index = rng.choices(remaining, [self.weights[i] for i in remaining])[0]
+
+            taken |= 1 << index
+            picks.append(self.classes[index])
+
+        return picks
+
+
+TRAIT_CATALOG = TraitCatalog(TRAIT_REGISTRY)
+
+
+def get_random_traits(count=3, exclude_ids=None, exclude_mask=0):
+    """
+    Get random trait classes for selection
+    exclude_ids: list of trait IDs to exclude (already owned)
+    exclude_mask: bitmask of owned traits (see MonsterPlayer.trait_mask)
+    """
+    if exclude_ids:
+        exclude_mask |= TRAIT_CATALOG.mask_for(exclude_ids)
 
-    selected_classes = random.sample(available, count)
-    return [t() for t in selected_classes]
+    return TRAIT_CATALOG.sample(count, exclude_mask)
@@ -4,8 +4,11 @@ Dungeon/world generation system
 
 import arcade
 import random
+import numpy as np
 from ..config import *
-from ..entities.enemies import Slime, Goblin, OrcWarrior
+from ..entities.enemies import Slime, Goblin, OrcWarrior, GoblinShaman
+from .spatial import SpatialGrid
+from .projectiles import ProjectilePool
 
 
 class DungeonFloor:
@@ -16,10 +19,15 @@ class DungeonFloor:
         self.walls = arcade.SpriteList(use_spatial_hash=True)
         self.floor_tiles = arcade.SpriteList(use_spatial_hash=True)
         self.enemies = arcade.SpriteList()
+        self.enemy_index = SpatialGrid()
+        self.projectiles = ProjectilePool()
 
         self.width = MAP_WIDTH
         self.height = MAP_HEIGHT
 
+        # Wall occupancy per tile, indexed [y, x]
+        self.wall_grid = np.zeros((self.height, self.width), dtype=bool)
+
         # Generate the floor
         self.generate()
 
@@ -27,6 +35,7 @@ class DungeonFloor:
         """Generate floor layout and spawn enemies"""
         self._create_walls()
         self._spawn_enemies()
+        self.enemy_index.rebuild(self.enemies)
 
     def _create_walls(self):
         """Create wall boundaries and some obstacles"""
@@ -35,10 +44,11 @@ class DungeonFloor:
             for y in range(self.height):
                 # Border walls
                 if x == 0 or x == self.width - 1 or y == 0 or y == self.height - 1:
-                    wall = arcade.SpriteSolidColor(TILE_SIZE, TILE_SIZE, COLOR_WALL)
+                    wall = arcade.SpriteSolidColor(TILE_SIZE, TILE_SIZE, color=COLOR_WALL)
                     wall.center_x = x * TILE_SIZE + TILE_SIZE / 2
                     wall.center_y = y * TILE_SIZE + TILE_SIZE / 2
                     self.walls.append(wall)
+                    self.wall_grid[y, x] = True
 
         # Add some random interior obstacles
         num_obstacles = 10 + self.floor_number * 2
@@ -50,14 +60,15 @@ class DungeonFloor:
             for dx in range(random.randint(1, 3)):
                 for dy in range(random.randint(1, 2)):
                     if x + dx < self.width - 1 and y + dy < self.height - 1:
-                        wall = arcade.SpriteSolidColor(TILE_SIZE, TILE_SIZE, COLOR_WALL)
+                        wall = arcade.SpriteSolidColor(TILE_SIZE, TILE_SIZE, color=COLOR_WALL)
                         wall.center_x = (x + dx) * TILE_SIZE + TILE_SIZE / 2
                         wall.center_y = (y + dy) * TILE_SIZE + TILE_SIZE / 2
                         self.walls.append(wall)
+                        self.wall_grid[y + dy, x + dx] = True
 
     def _spawn_enemies(self):
         """Spawn enemies for this floor"""
-        base_count = ENEMY_SPAWN_COUNT + self.floor_number
+        base_count = settings.ENEMY_SPAWN_COUNT + self.floor_number
         enemy_count = random.randint(base_count, base_count + 3)
 
         # Determine enemy types based on floor
@@ -65,9 +76,9 @@ class DungeonFloor:
         if self.floor_number <= 2:
             enemy_types = [Slime, Slime, Goblin]
         elif self.floor_number <= 5:
-            enemy_types = [Slime, Goblin, Goblin, OrcWarrior]
+            enemy_types = [Slime, Goblin, Goblin, OrcWarrior, GoblinShaman]
         else:
-            enemy_types = [Goblin, Goblin, OrcWarrior, OrcWarrior]
+            enemy_types = [Goblin, Goblin, OrcWarrior, OrcWarrior, GoblinShaman]
 
         for _ in range(enemy_count):
             # Find valid spawn position
@@ -92,6 +103,7 @@ class DungeonFloor:
             if valid_position:
                 enemy_class = random.choice(enemy_types)
                 enemy = enemy_class(x, y, self.floor_number)
+                enemy.projectiles = self.projectiles
                 self.enemies.append(enemy)
 
     def get_player_spawn_position(self):
@@ -113,11 +125,20 @@ class DungeonFloor:
         # Fallback
         return TILE_SIZE * 2, TILE_SIZE * 2
 
-    def update(self, player, delta_time):
-        """Update floor elements"""
+    def update(self, players, delta_time):
+        """Update floor elements (enemies go after the nearest of the players)"""
         # Update enemy AI
         for enemy in self.enemies:
-            enemy.update_ai(player, self.walls, delta_time)
+            target = players[0] if len(players) == 1 else min(players, key=enemy.distance_to)
+            enemy.update_ai(target, self.wall_grid, delta_time)
+
+        # Re-index enemies at their new positions for skill queries
+        self.enemy_index.rebuild(self.enemies)
+
+    def remove_enemy(self, enemy):
+        """Remove a dead enemy from the floor and its spatial index"""
+        self.enemies.remove(enemy)
+        self.enemy_index.remove(enemy)
 
     def is_cleared(self):
         """Check if floor is cleared (all enemies dead)"""
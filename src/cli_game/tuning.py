@@ -0,0 +1,193 @@
+"""
+Config parameter sweeps
+
+A variant is a set of overrides for config.settings. A sweep builds variants
+from a parameter space, either the full grid or a seeded random sample, and
+plays the same seeds under each one in a process pool, so differences between
+variants come from the config and not from luck. Each variant streams one JSON
+line to the results file when it finishes, and variants already in the file
+are skipped, so an overnight sweep can be interrupted and resumed.
+
+A parameter space maps tunable names to either a list of values (grid points
+or random choices) or a (low, high) range (random search only; integers if
+both ends are).
+
+    FLOOR_SCALING_FACTOR=1.1,1.15,1.2     values
+    ATTACK_COOLDOWN=0.25:0.45             range
+"""
+
+import csv
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import random
+from collections import Counter
+from .config import *
+from .balance import MAX_RUN_TICKS, load_results, play_run, trim_results, _percentile
+
+RESULT_COLUMNS = (
+    "floor_mean", "floor_p10", "floor_p50", "floor_p90",
+    "level_mean", "minutes_mean", "timeout_rate", "ttk_mean", "top_death",
+)
+
+
+def _parse_value(text):
+    """Int if it reads as one, else float"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_space(specs):
+    """Parse NAME=v1,v2 / NAME=low:high specs into a parameter space"""
+    space = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        name = name.strip().upper()
+        if not sep or name not in Settings.TUNABLES:
+            raise ValueError(f"Expected TUNABLE=values or TUNABLE=low:high, got {spec!r}")
+        if ":" in values:
+            low, high = values.split(":", 1)
+            space[name] = (_parse_value(low), _parse_value(high))
+        else:
+            space[name] = [_parse_value(value) for value in values.split(",")]
+    return space
+
+
+def grid_variants(space):
+    """Every combination of the listed values"""
+    for name, values in space.items():
+        if isinstance(values, tuple):
+            raise ValueError(f"{name}: ranges need a random search, list values for a grid")
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(space[name] for name in names))]
+
+
+def random_variants(space, count, seed=0):
+    """count variants drawn independently per parameter (the same seed draws the same variants)"""
+    rng = random.Random(seed)
+    variants = []
+    for _ in range(count):
+        variant = {}
+        for name, values in space.items():
+            if isinstance(values, list):
+                variant[name] = rng.choice(values)
+            elif all(isinstance(value, int) for value in values):
+                variant[name] = rng.randint(*values)
+            else:
+                variant[name] = round(rng.uniform(*values), 4)
+        variants.append(variant)
+    return variants
+
+
+def variant_id(overrides):
+    """Stable short id of a set of overrides"""
+    text = json.dumps(overrides, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()[:10]
+
+
+def play_variant(overrides, seeds, policy_name="greedy", max_ticks=MAX_RUN_TICKS):
+    """Play seeds under a set of overrides and summarize them as one results row"""
+    settings.override(**overrides)
+    try:
+        records = [play_run(seed, policy_name, max_ticks) for seed in seeds]
+    finally:
+        settings.reset()
+
+    floors = sorted(record["floor"] for record in records)
+    kill_times = [time for record in records for times in record["kill_times"].values() for time in times]
+    deaths = Counter(record["death_cause"] for record in records)
+    return {
+        "variant": variant_id(overrides),
+        "overrides": overrides,
+        "policy": policy_name,
+        "runs": len(records),
+        "first_seed": seeds[0],
+        "max_ticks": max_ticks,
+        "floor_mean": sum(floors) / len(floors),
+        "floor_p10": _percentile(floors, 0.1),
+        "floor_p50": _percentile(floors, 0.5),
+        "floor_p90": _percentile(floors, 0.9),
+        "level_mean": sum(record["level"] for record in records) / len(records),
+        "minutes_mean": sum(record["ticks"] for record in records) / len(records) / FPS / 60,
+        "timeout_rate": deaths["timeout"] / len(records),
+        "ttk_mean": sum(kill_times) / len(kill_times) if kill_times else None,
+        "top_death": deaths.most_common(1)[0][0],
+    }
+
+
+def _play_task(task):
+    """Pool entry point: play one (overrides, seeds, policy, max_ticks) task"""
+    return play_variant(*task)
+
+
+def run_tuning(path, variants, runs=SWEEP_RUNS, policy_name="greedy", first_seed=0, workers=None,
+               max_ticks=MAX_RUN_TICKS, progress=None):
+    """
+    Play every variant across a process pool, appending one row per variant to path
+    Variants already recorded in path for the same policy, seeds and tick cap are
+    skipped, so an interrupted sweep resumes. Returns the number of variants played.
+    """
+    trim_results(path)
+    done = {
+        (row["variant"], row["policy"], row["runs"], row.get("first_seed"), row.get("max_ticks"))
+        for row in load_results(path)
+    }
+    seeds = list(range(first_seed, first_seed + runs))
+    tasks = [
+        (overrides, seeds, policy_name, max_ticks)
+        for overrides in variants
+        if (variant_id(overrides), policy_name, runs, first_seed, max_ticks) not in done
+    ]
+    if not tasks:
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    played = 0
+    with open(path, "a") as out, multiprocessing.Pool(workers) as pool:
+        for row in pool.imap_unordered(_play_task, tasks):
+            out.write(json.dumps(row) + "\n")
+            out.flush()
+            played += 1
+            if progress:
+                progress(played, len(tasks))
+    return played
+
+
+def _sort_key(metric):
+    """Descending sort key that puts missing values last"""
+    return lambda row: (row[metric] is None, -(row[metric] or 0))
+
+
+def format_results(rows, sort="floor_mean", limit=None):
+    """Render results rows as a plain-text table, best first by a metric"""
+    rows = sorted(rows, key=_sort_key(sort))[:limit]
+    names = sorted({name for row in rows for name in row["overrides"]})
+    header = ["variant", *names, "runs", *RESULT_COLUMNS]
+    table = [header]
+    for row in rows:
+        cells = [row["variant"], *(row["overrides"].get(name, "") for name in names), row["runs"]]
+        for column in RESULT_COLUMNS:
+            value = row[column]
+            cells.append(f"{value:.3f}" if isinstance(value, float) else "-" if value is None else value)
+        table.append([str(cell) for cell in cells])
+
+    widths = [max(len(line[index]) for line in table) for index in range(len(header))]
+    return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in table)
+
+
+def write_csv(rows, path, sort="floor_mean"):
+    """Write results rows as CSV, one column per swept parameter and metric"""
+    rows = sorted(rows, key=_sort_key(sort))
+    names = sorted({name for row in rows for name in row["overrides"]})
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["variant", "policy", *names, "runs", *RESULT_COLUMNS])
+        for row in rows:
+            writer.writerow([
+                row["variant"], row["policy"], *(row["overrides"].get(name, "") for name in names),
+                row["runs"], *(row[column] for column in RESULT_COLUMNS),
+            ])
@@ -3,6 +3,12 @@ UI system: HUD and menus
 """
 
 from .hud import HUD
+from .hp_bars import EnemyHPBars
+from .culling import ChunkedLayer, VisibleLayer
+from .damage_numbers import DamageNumbers
+from .minimap import Minimap
+from .lod import bake_wall_texture, draw_wall_texture, draw_enemy_points
 from .menus import TraitSelectionMenu, EvolutionSelectionMenu, GameOverMenu, StatUpgradeMenu
 
-__all__ = ['HUD', 'TraitSelectionMenu', 'EvolutionSelectionMenu', 'GameOverMenu', 'StatUpgradeMenu']
+__all__ = ['HUD', 'EnemyHPBars', 'ChunkedLayer', 'VisibleLayer', 'DamageNumbers', 'Minimap',
+           'bake_wall_texture', 'draw_wall_texture', 'draw_enemy_points', 'TraitSelectionMenu', 'EvolutionSelectionMenu', 'GameOverMenu', 'StatUpgradeMenu']
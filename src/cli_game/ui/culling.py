@@ -0,0 +1,86 @@
+"""
+Viewport culling for world draws
+
+Static sprites (walls) are split once into chunk SpriteLists keyed by
+SpatialGrid cell, and only chunks overlapping the view are drawn. Moving
+sprites (enemies) are found through their SpatialGrid each frame and kept in
+a small SpriteList of what is on screen. Both layers count drawn vs culled.
+"""
+
+import arcade
+from ..config import *
+from ..systems.spatial import SpatialGrid
+
+
+class ChunkedLayer:
+    """Static sprites drawn chunk by chunk, skipping chunks outside the view"""
+
+    def __init__(self, sprites, chunk_size=CULL_CHUNK_SIZE):
+        self.grid = SpatialGrid(chunk_size)
+        for sprite in sprites:
+            self.grid.insert(sprite)
+
+        self.chunks = {}
+        for key, bucket in self.grid.cells.items():
+            chunk = arcade.SpriteList()
+            chunk.extend(bucket)
+            self.chunks[key] = chunk
+
+        self.total = len(self.grid)
+        self.drawn = 0
+        self.culled = 0
+
+    def draw(self, left, bottom, right, top):
+        """Draw the chunks overlapping a world-space rectangle"""
+        drawn = 0
+        for key in self.grid.cells_in_rect(left, bottom, right, top):
+            chunk = self.chunks[key]
+            chunk.draw()
+            drawn += len(chunk)
+
+        self.drawn = drawn
+        self.culled = self.total - drawn
+
+
+class VisibleLayer:
+    """Moving sprites looked up in a SpatialGrid and drawn only when in view"""
+
+    def __init__(self):
+        self.sprites = arcade.SpriteList()
+        self.members = set()
+        self.drawn = 0
+        self.culled = 0
+
+    def clear(self):
+        """Forget every sprite (e.g. on floor change)"""
+        self.sprites.clear()
+        self.members = set()
+        self.drawn = 0
+        self.culled = 0
+
+    def update(self, index, left, bottom, right, top):
+        """
+        Sync the layer with the sprites of index overlapping a rectangle
+        Returns the visible sprites.
+        """
+        visible = [
+            sprite for sprite in index.query_rect(left, bottom, right, top)
+            if sprite.right >= left and sprite.left <= right
+            and sprite.top >= bottom and sprite.bottom <= top
+        ]
+
+        # Only touch the SpriteList for sprites entering or leaving the view
+        current = set(visible)
+        for sprite in self.members - current:
+            self.sprites.remove(sprite)
+        for sprite in current - self.members:
+            self.sprites.append(sprite)
+        self.members = current
+
+        self.drawn = len(visible)
+        self.culled = len(index) - self.drawn
+        return visible
+
+    def draw(self):
+        """Draw every sprite in view in one call"""
+        self.sprites.draw()
@@ -0,0 +1,129 @@
+"""
+Floating combat text
+
+Damage numbers are built from pre-rendered glyph textures on a fixed pool of
+sprites in one SpriteList, so showing a number never lays out text. Entries
+are handed out round-robin: when the pool is full the oldest is recycled.
+"""
+
+import arcade
+from ..config import *
+
+GLYPHS = "0123456789!"
+MAX_GLYPHS = 6  # Up to five digits plus the crit mark
+GLYPH_FONT_SIZE = 14
+
+COLOR_DAMAGE = (255, 255, 255)
+COLOR_CRIT = (255, 150, 40)
+CRIT_SCALE = 1.5
+
+
+class DamageNumbers:
+    """Pool of rising, fading damage numbers drawn in one call"""
+
+    def __init__(self, capacity=DAMAGE_NUMBER_CAPACITY):
+        self.capacity = capacity
+        self.sprites = arcade.SpriteList()
+        self.glyphs = None  # char -> texture, rendered on first use (needs a window)
+
+        # Per-entry state; entry i owns sprites [i * MAX_GLYPHS, (i + 1) * MAX_GLYPHS)
+        self.entry_glyphs = [[] for _ in range(capacity)]
+        self.start_y = [0.0] * capacity
+        self.age = [0.0] * capacity
+        self.active = [False] * capacity
+        self.next_entry = 0  # Oldest entry, reused next
+        self.count = 0
+
+    def _load_glyphs(self):
+        """Render each glyph once in white; sprites tint it per style"""
+        self.glyphs = {
+            char: arcade.create_text_sprite(char, COLOR_TEXT, GLYPH_FONT_SIZE, bold=True).texture
+            for char in GLYPHS
+        }
+        blank = self.glyphs["0"]
+        for _ in range(self.capacity * MAX_GLYPHS):
+            sprite = arcade.Sprite(blank)
+            sprite.visible = False
+            self.sprites.append(sprite)
+
+    def show(self, x, y, damage, crit=False):
+        """Start a damage number above a world position"""
+        if self.glyphs is None:
+            self._load_glyphs()
+
+        entry = self.next_entry
+        self.next_entry = (entry + 1) % self.capacity
+        if self.active[entry]:
+            self._hide(entry)
+        else:
+            self.count += 1
+
+        text = str(max(0, int(damage)))[:MAX_GLYPHS - 1]
+        if crit:
+            text += "!"
+        scale = CRIT_SCALE if crit else 1.0
+        color = COLOR_CRIT if crit else COLOR_DAMAGE
+
+        # Lay glyphs out left to right, centered on x
+        base = entry * MAX_GLYPHS
+        used = self.sprites[base:base + len(text)]
+        width = sum(self.glyphs[char].width for char in text) * scale
+        left = x - width / 2
+        for sprite, char in zip(used, text):
+            texture = self.glyphs[char]
+            sprite.texture = texture
+            sprite.scale = scale
+            sprite.color = color
+            sprite.alpha = 255
+            sprite.center_x = left + texture.width * scale / 2
+            sprite.center_y = y
+            sprite.visible = True
+            left += texture.width * scale
+
+        self.entry_glyphs[entry] = used
+        self.start_y[entry] = y
+        self.age[entry] = 0.0
+        self.active[entry] = True
+
+    def _hide(self, entry):
+        """Return an entry's sprites to the pool"""
+        for sprite in self.entry_glyphs[entry]:
+            sprite.visible = False
+        self.entry_glyphs[entry] = []
+        self.active[entry] = False
+
+    def clear(self):
+        """Remove every number (e.g. on floor change)"""
+        for entry in range(self.capacity):
+            if self.active[entry]:
+                self._hide(entry)
+        self.count = 0
+
+    def update(self, delta_time):
+        """Rise and fade every live number, retiring the expired ones"""
+        if self.count == 0:
+            return
+
+        for entry in range(self.capacity):
+            if not self.active[entry]:
+                continue
+
+            age = self.age[entry] + delta_time
+            if age >= DAMAGE_NUMBER_DURATION:
+                self._hide(entry)
+                self.count -= 1
+                continue
+            self.age[entry] = age
+
+            # Ease out while rising, fade out over the second half
+            t = age / DAMAGE_NUMBER_DURATION
+            y = self.start_y[entry] + DAMAGE_NUMBER_RISE * (1 - (1 - t) ** 2)
+            alpha = 255 if t < 0.5 else int(255 * (1 - t) * 2)
+            for sprite in self.entry_glyphs[entry]:
+                sprite.center_y = y
+                sprite.alpha = alpha
+
+    def draw(self):
+        """Draw every live number in one call"""
+        if self.count:
+            self.sprites.draw()
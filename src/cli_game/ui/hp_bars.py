@@ -0,0 +1,116 @@
+"""
+Batched enemy HP bars
+
+Every bar is three sprites (border, background, fill) in one SpriteList, so
+all bars draw in a single call. A bar's sprites are only touched when its
+enemy moves or its HP changes, and bars of full-HP enemies are hidden. Only
+enemies in view are visited each frame; bars of enemies that left the view
+are found by diffing against the previous frame's set, and are hidden but
+kept, so crossing the view edge costs no sprite allocations.
+"""
+
+import arcade
+from ..config import *
+
+BAR_WIDTH = 30
+BAR_HEIGHT = 4
+BAR_OFFSET_Y = 8  # Pixels above enemy
+
+
+class EnemyHPBars:
+    """HP bar layer kept in sync with a floor's enemies"""
+
+    def __init__(self):
+        self.sprites = arcade.SpriteList()
+        self.bars = {}  # enemy -> [border, background, fill, last_state]
+        self.shown = set()  # Enemies in view at the last sync
+
+    def _create_bar(self, enemy):
+        """Create the sprites for one enemy's bar"""
+        border = arcade.SpriteSolidColor(BAR_WIDTH + 2, BAR_HEIGHT + 2, color=COLOR_UI_BORDER)
+        background = arcade.SpriteSolidColor(BAR_WIDTH, BAR_HEIGHT, color=COLOR_HP_EMPTY)
+        fill = arcade.SpriteSolidColor(BAR_WIDTH, BAR_HEIGHT, color=COLOR_HP_FILL)
+
+        # List order is draw order: border, then background, then fill
+        self.sprites.append(border)
+        self.sprites.append(background)
+        self.sprites.append(fill)
+
+        # Hidden until its enemy is first seen in view
+        border.visible = background.visible = fill.visible = False
+
+        bar = [border, background, fill, None]
+        self.bars[enemy] = bar
+        return bar
+
+    def _remove_bar(self, enemy):
+        """Drop the sprites of an enemy that left the floor"""
+        border, background, fill, _ = self.bars.pop(enemy)
+        self.sprites.remove(border)
+        self.sprites.remove(background)
+        self.sprites.remove(fill)
+
+    def clear(self):
+        """Remove every bar (e.g. on floor change)"""
+        self.sprites.clear()
+        self.bars.clear()
+        self.shown = set()
+
+    def sync(self, enemies, visible=None):
+        """
+        Update the bars of the enemies in visible (default: all of enemies)
+        Bars of enemies that left the view are hidden, or removed if the enemy
+        died (only dead enemies leave a floor). One that dies out of view keeps
+        its hidden bar until clear().
+        """
+        if visible is None:
+            visible = enemies
+        shown = set(visible)
+        for enemy in self.shown - shown:
+            if enemy.is_alive():
+                self._hide_bar(self.bars[enemy])
+            else:
+                self._remove_bar(enemy)
+        self.shown = shown
+
+        for enemy in visible:
+            bar = self.bars.get(enemy)
+            if bar is None:
+                bar = self._create_bar(enemy)
+
+            state = (enemy.center_x, enemy.top, enemy.hp, enemy.max_hp)
+            if state == bar[3]:
+                continue
+            bar[3] = state
+            self._update_bar(bar, enemy)
+
+    def _hide_bar(self, bar):
+        """Hide a culled enemy's bar; it is brought up to date when the enemy is back in view"""
+        for sprite in bar[:3]:
+            sprite.visible = False
+        bar[3] = None
+
+    def _update_bar(self, bar, enemy):
+        """Move and resize one bar to match its enemy"""
+        border, background, fill, _ = bar
+
+        hp_ratio = max(0, min(1, enemy.hp / enemy.max_hp))
+        visible = 0 < hp_ratio < 1
+        border.visible = visible
+        background.visible = visible
+        fill.visible = visible
+        if not visible:
+            return
+
+        bar_x = enemy.center_x
+        bar_y = enemy.top + BAR_OFFSET_Y
+        border.position = (bar_x, bar_y)
+        background.position = (bar_x, bar_y)
+
+        fill_width = BAR_WIDTH * hp_ratio
+        fill.width = fill_width
+        fill.position = (bar_x - (BAR_WIDTH - fill_width) / 2, bar_y)
+
+    def draw(self):
+        """Draw every visible bar in one call"""
+        self.sprites.draw()
@@ -1,10 +1,27 @@
 """
 Heads-up display (HUD)
+
+Retained mode: text lives in persistent arcade.Text objects in one batch and
+panels/bars live in shape lists. Layout is rebuilt only when the screen size
+or the number of traits/skills shown changes, and each label is only touched
+when the value behind it changes.
 """
 
 import arcade
+import pyglet
+from arcade.shape_list import (
+    ShapeElementList,
+    create_rectangle_filled,
+    create_rectangle_outline,
+)
 from ..config import *
 
+# Skill cooldown labels refresh at most this often (seconds of game time)
+COOLDOWN_REFRESH_INTERVAL = 0.1
+
+COLOR_COOLDOWN = (255, 100, 100)
+COLOR_READY = (100, 255, 100)
+
 
 class HUD:
     """Game HUD showing player stats and info"""
@@ -17,257 +34,238 @@ class HUD:
         self.screen_width = SCREEN_WIDTH
         self.screen_height = SCREEN_HEIGHT
 
-    def draw(self, player, screen_width=None, screen_height=None):
-        """Draw the HUD"""
-        # Use provided dimensions or defaults
-        if screen_width is None:
-            screen_width = self.screen_width
-        if screen_height is None:
-            screen_height = self.screen_height
+        # Retained drawing state (built by _layout)
+        self.text_batch = None
+        self.frame_shapes = None
+        self.fill_shapes = None
+        self.outline_shapes = None
+        self.labels = {}
+        self.static_labels = []  # Kept referenced so they stay in the batch
+        self.skill_labels = []
+        self.trait_labels = []
+        self.bar_rects = {}
 
-        # Update stored dimensions
-        self.screen_width = screen_width
-        self.screen_height = screen_height
+        # Last values pushed into labels/shapes, used to skip unchanged updates
+        self._layout_key = None
+        self._values = {}
+        self._next_cooldown_refresh = 0.0
+
+    def _layout(self, player):
+        """Create shapes and text objects for the current screen and player"""
+        self.text_batch = pyglet.graphics.Batch()
+        self.frame_shapes = ShapeElementList()
+        self.fill_shapes = ShapeElementList()
+        self.outline_shapes = ShapeElementList()
+        self.labels = {}
+        self.static_labels = []
+        self.skill_labels = []
+        self.trait_labels = []
+        self.bar_rects = {}
+        self._values = {}
+        self._next_cooldown_refresh = 0.0
+
+        batch = self.text_batch
+        screen_height = self.screen_height
 
         # Background panel (top-left)
         panel_width = 240
         panel_height = 180
         panel_x = self.padding
         panel_y = screen_height - panel_height - self.padding
-
-        arcade.draw_rect_filled(
-            arcade.XYWH(
-                panel_x + panel_width / 2,
-                panel_y + panel_height / 2,
-                panel_width,
-                panel_height,
-            ),
-            COLOR_UI_BG,
-        )
-
-        arcade.draw_rect_outline(
-            arcade.XYWH(
-                panel_x + panel_width / 2,
-                panel_y + panel_height / 2,
-                panel_width,
-                panel_height,
-            ),
-            COLOR_UI_BORDER,
-            2,
-        )
+        self._add_box(panel_x, panel_y, panel_width, panel_height, COLOR_UI_BG, 2)
 
         # Content positioning
         content_x = panel_x + 10
         y = screen_height - 40
 
-        # Player form
-        arcade.draw_text(
-            f"Form: {player.current_form.replace('_', ' ').title()}",
-            content_x,
-            y,
-            COLOR_TEXT,
-            12,
-            bold=True
-        )
+        self.labels["form"] = arcade.Text("", content_x, y, COLOR_TEXT, 12, bold=True, batch=batch)
         y -= 25
-
-        # Level
-        arcade.draw_text(
-            f"Level: {player.level}",
-            content_x,
-            y,
-            COLOR_TEXT,
-            12
-        )
+        self.labels["level"] = arcade.Text("", content_x, y, COLOR_TEXT, 12, batch=batch)
         y -= 25
-
-        # HP Bar
-        self._draw_bar(
-            content_x,
-            y,
-            self.bar_width,
-            self.bar_height,
-            player.hp,
-            player.max_hp,
-            COLOR_HP_BAR,
-            f"HP: {int(player.hp)}/{int(player.max_hp)}"
-        )
+        self._add_bar("hp", content_x, y)
         y -= 30
-
-        # XP Bar
-        self._draw_bar(
-            content_x,
-            y,
-            self.bar_width,
-            self.bar_height,
-            player.xp,
-            player.xp_to_next_level,
-            COLOR_XP_BAR,
-            f"XP: {int(player.xp)}/{int(player.xp_to_next_level)}"
-        )
+        self._add_bar("xp", content_x, y)
         y -= 30
-
-        # Stats
-        arcade.draw_text(
-            f"ATK: {int(player.atk)}  DEF: {int(player.defense)}",
-            content_x,
-            y,
-            COLOR_TEXT,
-            11
-        )
+        self.labels["stats"] = arcade.Text("", content_x, y, COLOR_TEXT, 11, batch=batch)
         y -= 20
-
-        arcade.draw_text(
-            f"CRIT: {int(player.crit_chance * 100)}%",
-            content_x,
-            y,
-            COLOR_TEXT,
-            11
-        )
+        self.labels["crit"] = arcade.Text("", content_x, y, COLOR_TEXT, 11, batch=batch)
 
         # Traits (below the main HUD panel)
-        if player.traits:
+        shown_traits = min(len(player.traits), 3)
+        if shown_traits:
             y = panel_y - 30
-            arcade.draw_text(
-                "Traits:",
-                content_x,
-                y,
-                COLOR_TEXT,
-                11,
-                bold=True
+            self.static_labels.append(
+                arcade.Text("Traits:", content_x, y, COLOR_TEXT, 11, bold=True, batch=batch)
             )
             y -= 20
-            for trait in player.traits[:3]:  # Show first 3
-                arcade.draw_text(
-                    f"• {trait.name}",
-                    content_x,
-                    y,
-                    COLOR_TEXT_DARK,
-                    10
+            for _ in range(shown_traits):
+                self.trait_labels.append(
+                    arcade.Text("", content_x, y, COLOR_TEXT_DARK, 10, batch=batch)
                 )
                 y -= 18
 
         # Skills
-        if player.skills:
-            self._draw_skills(player)
+        self._layout_skills(min(len(player.skills), 2))
 
         # Controls hint
-        arcade.draw_text(
-            "WASD: Move | SPACE: Attack | Q/E: Skills",
+        self.static_labels.append(arcade.Text(
+            "WASD: Move | SPACE: Attack | Q/E: Skills | -/=: Zoom",
             10,
             10,
             COLOR_TEXT_DARK,
-            10
-        )
-
-    def _draw_bar(self, x, y, width, height, current, maximum, color, label):
-        """Draw a stat bar with label"""
-        # Background
-        arcade.draw_rect_filled(
-            arcade.XYWH(
-                x + width / 2,
-                y + height / 2,
-                width,
-                height,
-            ),
-            (50, 50, 50),
-        )
-
-        # Fill
-        if maximum > 0:
-            fill_width = (current / maximum) * width
-            arcade.draw_rect_filled(
-                arcade.XYWH(
-                    x + fill_width / 2,
-                    y + height / 2,
-                    fill_width,
-                    height,
-                ),
-                color,
-            )
+            10,
+            batch=batch
+        ))
 
-        # Border
-        arcade.draw_rect_outline(
-            arcade.XYWH(
-                x + width / 2,
-                y + height / 2,
-                width,
-                height,
-            ),
-            COLOR_UI_BORDER,
+    def _add_box(self, x, y, width, height, color, border_width=1):
+        """Add a filled, outlined box to the static frame shapes"""
+        center_x = x + width / 2
+        center_y = y + height / 2
+        self.frame_shapes.append(create_rectangle_filled(center_x, center_y, width, height, color))
+        self.outline_shapes.append(
+            create_rectangle_outline(center_x, center_y, width, height, COLOR_UI_BORDER, border_width)
         )
 
-        # Label
-        arcade.draw_text(label, x + 5, y + 4, COLOR_TEXT, 10, bold=True)
+    def _add_bar(self, name, x, y):
+        """Add a stat bar frame and its label"""
+        self._add_box(x, y, self.bar_width, self.bar_height, (50, 50, 50))
+        self.bar_rects[name] = (x, y)
+        self.labels[name] = arcade.Text("", x + 5, y + 4, COLOR_TEXT, 10, bold=True, batch=self.text_batch)
 
-    def _draw_skills(self, player):
-        """Draw skill cooldown indicators"""
+    def _layout_skills(self, count):
+        """Add skill cooldown boxes and their labels"""
         x_start = 10
         y_pos = 50
         skill_width = 80
         skill_height = 60
 
         keys = ['Q', 'E']
-        for i, skill in enumerate(player.skills[:2]):  # Show first 2 skills
-            key = keys[i] if i < len(keys) else '?'
+        for i in range(count):
             x = x_start + i * (skill_width + 10)
+            self._add_box(x, y_pos, skill_width, skill_height, COLOR_UI_BG)
 
-            # Background
-            arcade.draw_rect_filled(
-                arcade.XYWH(
-                    x + skill_width / 2,
-                    y_pos + skill_height / 2,
-                    skill_width,
-                    skill_height,
-                ),
-                COLOR_UI_BG,
-            )
-            arcade.draw_rect_outline(
-                arcade.XYWH(
-                    x + skill_width / 2,
-                    y_pos + skill_height / 2,
-                    skill_width,
-                    skill_height,
-                ),
-                COLOR_UI_BORDER,
-            )
+            self.static_labels.append(arcade.Text(
+                keys[i], x + 5, y_pos + skill_height - 18, COLOR_TEXT, 12, bold=True,
+                batch=self.text_batch
+            ))
+            self.skill_labels.append((
+                arcade.Text("", x + 5, y_pos + 20, COLOR_TEXT, 9, batch=self.text_batch),
+                arcade.Text("", x + 5, y_pos + 5, COLOR_READY, 9, bold=True, batch=self.text_batch),
+            ))
 
-            # Key binding
-            arcade.draw_text(
-                key,
-                x + 5,
-                y_pos + skill_height - 18,
-                COLOR_TEXT,
-                12,
-                bold=True
-            )
+    def _changed(self, key, value):
+        """Remember value under key; True if it differs from last time"""
+        if self._values.get(key) == value:
+            return False
+        self._values[key] = value
+        return True
 
-            # Skill name
-            arcade.draw_text(
-                skill.name[:8],
-                x + 5,
-                y_pos + 20,
-                COLOR_TEXT,
-                9
-            )
+    def _refresh(self, player):
+        """Push changed player values into the retained labels and bars"""
+        labels = self.labels
 
-            # Cooldown
-            remaining = skill.get_remaining_cooldown()
-            if remaining > 0:
-                arcade.draw_text(
-                    f"{remaining:.1f}s",
-                    x + 5,
-                    y_pos + 5,
-                    (255, 100, 100),
-                    10,
-                    bold=True
-                )
-            else:
-                arcade.draw_text(
-                    "READY",
-                    x + 5,
-                    y_pos + 5,
-                    (100, 255, 100),
-                    9,
-                    bold=True
-                )
+        if self._changed("form", player.current_form):
+            labels["form"].text = f"Form: {player.current_form.replace('_', ' ').title()}"
+        if self._changed("level", player.level):
+            labels["level"].text = f"Level: {player.level}"
+
+        hp = (int(player.hp), int(player.max_hp))
+        xp = (int(player.xp), int(player.xp_to_next_level))
+        if self._changed("hp", hp):
+            labels["hp"].text = f"HP: {hp[0]}/{hp[1]}"
+        if self._changed("xp", xp):
+            labels["xp"].text = f"XP: {xp[0]}/{xp[1]}"
+        if self._changed("bars", (player.hp, player.max_hp, player.xp, player.xp_to_next_level)):
+            self._rebuild_fills(player)
+
+        stats = (int(player.atk), int(player.defense))
+        if self._changed("stats", stats):
+            labels["stats"].text = f"ATK: {stats[0]}  DEF: {stats[1]}"
+        crit = int(player.crit_chance * 100)
+        if self._changed("crit", crit):
+            labels["crit"].text = f"CRIT: {crit}%"
+
+        trait_names = tuple(trait.name for trait in player.traits[:3])
+        if self._changed("traits", trait_names):
+            for label, name in zip(self.trait_labels, trait_names):
+                label.text = f"• {name}"
+
+        self._refresh_skills(player)
+
+    def _rebuild_fills(self, player):
+        """Rebuild the HP/XP fill rectangles"""
+        self.fill_shapes = ShapeElementList()
+        bars = (
+            ("hp", player.hp, player.max_hp, COLOR_HP_BAR),
+            ("xp", player.xp, player.xp_to_next_level, COLOR_XP_BAR),
+        )
+        for name, current, maximum, color in bars:
+            if maximum <= 0:
+                continue
+            fill_width = max(0, min(1, current / maximum)) * self.bar_width
+            if fill_width <= 0:
+                continue
+            x, y = self.bar_rects[name]
+            self.fill_shapes.append(create_rectangle_filled(
+                x + fill_width / 2, y + self.bar_height / 2, fill_width, self.bar_height, color
+            ))
+
+    def _refresh_skills(self, player):
+        """Update skill names and (throttled) cooldown labels"""
+        now = player.timers.now
+
+        # New skills (e.g. after evolving) refresh right away
+        skill_ids = tuple(skill.id for skill in player.skills[:2])
+        if self._changed("skills", skill_ids):
+            for (name_label, cooldown_label), skill in zip(self.skill_labels, player.skills):
+                name_label.text = skill.name[:8]
+            self._next_cooldown_refresh = now
+
+        # Skip until the interval is up, unless the clock went back (seek, restart)
+        if self._next_cooldown_refresh - COOLDOWN_REFRESH_INTERVAL <= now < self._next_cooldown_refresh:
+            return
+        self._next_cooldown_refresh = now + COOLDOWN_REFRESH_INTERVAL
+
+        for i, ((name_label, cooldown_label), skill) in enumerate(zip(self.skill_labels, player.skills)):
+            remaining = skill.get_remaining_cooldown(now)
+            text = f"{remaining:.1f}s" if remaining > 0 else "READY"
+            if not self._changed(("cooldown", i), text):
+                continue
+
+            cooldown_label.text = text
+            if self._changed(("cooldown_ready", i), remaining <= 0):
+                if remaining > 0:
+                    cooldown_label.color = COLOR_COOLDOWN
+                    cooldown_label.font_size = 10
+                else:
+                    cooldown_label.color = COLOR_READY
+                    cooldown_label.font_size = 9
+
+    def draw(self, player, screen_width=None, screen_height=None):
+        """Draw the HUD"""
+        # Use provided dimensions or defaults
+        if screen_width is None:
+            screen_width = self.screen_width
+        if screen_height is None:
+            screen_height = self.screen_height
+
+        # Update stored dimensions
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+
+        layout_key = (
+            screen_width,
+            screen_height,
+            min(len(player.traits), 3),
+            min(len(player.skills), 2),
+        )
+        if layout_key != self._layout_key:
+            self._layout_key = layout_key
+            self._layout(player)
+
+        self._refresh(player)
+
+        self.frame_shapes.draw()
+        self.fill_shapes.draw()
+        self.outline_shapes.draw()
+        self.text_batch.draw()
@@ -0,0 +1,37 @@
+"""
+Level-of-detail helpers for zoomed-out views
+
+Past LOD_ZOOM_THRESHOLD the floor's walls come from one texture baked at a
+pixel per tile, and enemies are drawn as points in a single call.
+"""
+
+import arcade
+import numpy as np
+from PIL import Image
+from ..config import *
+
+
+def bake_wall_texture(wall_grid, color=COLOR_WALL):
+    """Bake a wall occupancy grid ([y, x], y up) into a one-pixel-per-tile texture"""
+    height, width = wall_grid.shape
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    pixels[wall_grid] = (*color[:3], 255)
+
+    # Image rows run top-down, grid rows bottom-up
+    image = Image.fromarray(np.ascontiguousarray(pixels[::-1]), "RGBA")
+    return arcade.Texture(image)
+
+
+def draw_wall_texture(texture, wall_grid):
+    """Stretch a baked wall texture over the whole floor"""
+    height, width = wall_grid.shape
+    arcade.draw_texture_rect(
+        texture, arcade.LRBT(0, width * TILE_SIZE, 0, height * TILE_SIZE), pixelated=True
+    )
+
+
+def draw_enemy_points(enemies, zoom):
+    """Draw every enemy as a fixed-size screen point in one call"""
+    if enemies:
+        points = [(enemy.center_x, enemy.center_y) for enemy in enemies]
+        arcade.draw_points(points, COLOR_ENEMY, LOD_POINT_SIZE / zoom)
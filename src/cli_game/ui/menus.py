@@ -1,23 +1,92 @@
 """
 Game menus for selections and game over
+
+Menus are retained: text lives in cached arcade.Text objects in one batch and
+boxes live in shape lists. A menu is laid out again only when the window size
+or the selected option changes.
 """
 
 import arcade
+import pyglet
+from arcade.shape_list import (
+    ShapeElementList,
+    create_rectangle_filled,
+    create_rectangle_outline,
+)
 from ..config import *
 from ..systems.evolution import EVOLUTION_TREE
 
+COLOR_HIGHLIGHT = (80, 80, 100)
+
+
+class Menu:
+    """Base menu: caches its text and shapes and positions them against the window"""
+
+    def __init__(self):
+        self.selected_index = 0
+        self.screen_width = SCREEN_WIDTH
+        self.screen_height = SCREEN_HEIGHT
+
+        # Retained drawing state (built by _layout)
+        self.text_batch = None
+        self.fill_shapes = None
+        self.outline_shapes = None
+        self.texts = []  # Kept referenced so they stay in the batch
+        self._layout_key = None
+
+    def _layout(self):
+        """Rebuild every shape and text object for the current size and selection"""
+        self.text_batch = pyglet.graphics.Batch()
+        self.fill_shapes = ShapeElementList()
+        self.outline_shapes = ShapeElementList()
+        self.texts = []
+        self._build(self.screen_width / 2, self.screen_height / 2)
+
+    def _build(self, center_x, center_y):
+        """Add this menu's boxes and text around the window center"""
+        raise NotImplementedError
+
+    def _add_box(self, center_x, center_y, width, height, color, border_color=None, border_width=1):
+        """Add a filled box, optionally outlined"""
+        self.fill_shapes.append(create_rectangle_filled(center_x, center_y, width, height, color))
+        if border_color is not None:
+            self.outline_shapes.append(
+                create_rectangle_outline(center_x, center_y, width, height, border_color, border_width)
+            )
+
+    def _add_text(self, text, x, y, color, font_size, **kwargs):
+        """Add a centered text object to the batch"""
+        kwargs.setdefault("anchor_x", "center")
+        self.texts.append(arcade.Text(text, x, y, color, font_size, batch=self.text_batch, **kwargs))
+
+    def draw(self, screen_width=None, screen_height=None):
+        """Draw the menu, laying it out again first if size or selection changed"""
+        if screen_width is not None:
+            self.screen_width = screen_width
+        if screen_height is not None:
+            self.screen_height = screen_height
+
+        layout_key = (self.screen_width, self.screen_height, self.selected_index)
+        if layout_key != self._layout_key:
+            self._layout_key = layout_key
+            self._layout()
+
+        self.fill_shapes.draw()
+        self.outline_shapes.draw()
+        self.text_batch.draw()
+
 
-class StatUpgradeMenu:
+class StatUpgradeMenu(Menu):
     """Menu for choosing stat upgrades on level up"""
 
     def __init__(self, on_select_callback):
+        super().__init__()
         self.on_select = on_select_callback
         self.options = [
             {"id": "hp", "name": "Max HP +20", "description": "Increase maximum health"},
             {"id": "atk", "name": "Attack +5", "description": "Increase attack damage"},
             {"id": "def", "name": "Defense +3", "description": "Increase damage reduction"},
         ]
-        self.selected_index = 0
 
     def handle_key_press(self, key):
         """Handle keyboard input"""
@@ -28,92 +97,45 @@ class StatUpgradeMenu:
         elif key == arcade.key.ENTER or key == arcade.key.SPACE:
             self.on_select(self.options[self.selected_index]["id"])
 
-    def draw(self):
-        """Draw the stat upgrade menu"""
+    def _build(self, center_x, center_y):
+        """Lay out the stat upgrade menu"""
         # Background
-        arcade.draw_rectangle_filled(
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2,
-            500,
-            400,
-            COLOR_UI_BG
-        )
-        arcade.draw_rectangle_outline(
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2,
-            500,
-            400,
-            COLOR_UI_BORDER,
-            3
-        )
+        self._add_box(center_x, center_y, 500, 400, COLOR_UI_BG, COLOR_UI_BORDER, 3)
 
         # Title
-        arcade.draw_text(
-            "LEVEL UP! Choose an Upgrade:",
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2 + 150,
-            COLOR_TEXT,
-            20,
-            anchor_x="center",
-            bold=True
-        )
+        self._add_text("LEVEL UP! Choose an Upgrade:", center_x, center_y + 150, COLOR_TEXT, 20, bold=True)
 
         # Options
-        y = SCREEN_HEIGHT / 2 + 80
+        y = center_y + 80
         for i, option in enumerate(self.options):
             is_selected = i == self.selected_index
 
             # Highlight selected
             if is_selected:
-                arcade.draw_rectangle_filled(
-                    SCREEN_WIDTH / 2,
-                    y,
-                    450,
-                    60,
-                    (80, 80, 100)
-                )
+                self._add_box(center_x, y, 450, 60, COLOR_HIGHLIGHT)
 
             # Option name
-            arcade.draw_text(
-                option["name"],
-                SCREEN_WIDTH / 2,
-                y + 10,
-                COLOR_TEXT if is_selected else COLOR_TEXT_DARK,
-                16,
-                anchor_x="center",
-                bold=is_selected
+            self._add_text(
+                option["name"], center_x, y + 10,
+                COLOR_TEXT if is_selected else COLOR_TEXT_DARK, 16, bold=is_selected
             )
 
             # Description
-            arcade.draw_text(
-                option["description"],
-                SCREEN_WIDTH / 2,
-                y - 10,
-                COLOR_TEXT_DARK,
-                12,
-                anchor_x="center"
-            )
+            self._add_text(option["description"], center_x, y - 10, COLOR_TEXT_DARK, 12)
 
             y -= 90
 
         # Instructions
-        arcade.draw_text(
-            "W/S to select | ENTER to confirm",
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2 - 150,
-            COLOR_TEXT_DARK,
-            12,
-            anchor_x="center"
-        )
+        self._add_text("W/S to select | ENTER to confirm", center_x, center_y - 150, COLOR_TEXT_DARK, 12)
 
 
-class TraitSelectionMenu:
+class TraitSelectionMenu(Menu):
     """Menu for selecting traits after clearing a floor"""
 
     def __init__(self, traits, on_select_callback):
+        super().__init__()
         self.traits = traits
         self.on_select = on_select_callback
-        self.selected_index = 0
 
     def handle_key_press(self, key):
         """Handle keyboard input"""
@@ -124,92 +146,45 @@ class TraitSelectionMenu:
         elif key == arcade.key.ENTER or key == arcade.key.SPACE:
             self.on_select(self.traits[self.selected_index])
 
-    def draw(self):
-        """Draw the trait selection menu"""
+    def _build(self, center_x, center_y):
+        """Lay out the trait selection menu"""
         # Background
-        arcade.draw_rectangle_filled(
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2,
-            600,
-            500,
-            COLOR_UI_BG
-        )
-        arcade.draw_rectangle_outline(
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2,
-            600,
-            500,
-            COLOR_UI_BORDER,
-            3
-        )
+        self._add_box(center_x, center_y, 600, 500, COLOR_UI_BG, COLOR_UI_BORDER, 3)
 
         # Title
-        arcade.draw_text(
-            "FLOOR CLEARED! Choose a Trait:",
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2 + 200,
-            COLOR_TEXT,
-            20,
-            anchor_x="center",
-            bold=True
-        )
+        self._add_text("FLOOR CLEARED! Choose a Trait:", center_x, center_y + 200, COLOR_TEXT, 20, bold=True)
 
         # Traits
-        y = SCREEN_HEIGHT / 2 + 120
+        y = center_y + 120
         for i, trait in enumerate(self.traits):
             is_selected = i == self.selected_index
 
             # Highlight selected
             if is_selected:
-                arcade.draw_rectangle_filled(
-                    SCREEN_WIDTH / 2,
-                    y,
-                    550,
-                    80,
-                    (80, 80, 100)
-                )
+                self._add_box(center_x, y, 550, 80, COLOR_HIGHLIGHT)
 
             # Trait name
-            arcade.draw_text(
-                trait.name,
-                SCREEN_WIDTH / 2,
-                y + 20,
-                COLOR_TEXT if is_selected else COLOR_TEXT_DARK,
-                18,
-                anchor_x="center",
-                bold=is_selected
+            self._add_text(
+                trait.name, center_x, y + 20,
+                COLOR_TEXT if is_selected else COLOR_TEXT_DARK, 18, bold=is_selected
             )
 
             # Description
-            arcade.draw_text(
-                trait.description,
-                SCREEN_WIDTH / 2,
-                y - 10,
-                COLOR_TEXT_DARK,
-                13,
-                anchor_x="center"
-            )
+            self._add_text(trait.description, center_x, y - 10, COLOR_TEXT_DARK, 13)
 
             y -= 110
 
         # Instructions
-        arcade.draw_text(
-            "W/S to select | ENTER to confirm",
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2 - 210,
-            COLOR_TEXT_DARK,
-            12,
-            anchor_x="center"
-        )
+        self._add_text("W/S to select | ENTER to confirm", center_x, center_y - 210, COLOR_TEXT_DARK, 12)
 
 
-class EvolutionSelectionMenu:
+class EvolutionSelectionMenu(Menu):
     """Menu for choosing evolution path"""
 
     def __init__(self, evolution_options, on_select_callback):
+        super().__init__()
         self.evolution_options = evolution_options
         self.on_select = on_select_callback
-        self.selected_index = 0
 
     def handle_key_press(self, key):
         """Handle keyboard input"""
@@ -220,131 +195,65 @@ class EvolutionSelectionMenu:
         elif key == arcade.key.ENTER or key == arcade.key.SPACE:
             self.on_select(self.evolution_options[self.selected_index])
 
-    def draw(self):
-        """Draw the evolution selection menu"""
+    def _build(self, center_x, center_y):
+        """Lay out the evolution selection menu"""
         # Background
-        arcade.draw_rectangle_filled(
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2,
-            700,
-            500,
-            COLOR_UI_BG
-        )
-        arcade.draw_rectangle_outline(
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2,
-            700,
-            500,
-            COLOR_UI_BORDER,
-            3
-        )
+        self._add_box(center_x, center_y, 700, 500, COLOR_UI_BG, COLOR_UI_BORDER, 3)
 
         # Title
-        arcade.draw_text(
-            "EVOLUTION TIME! Choose Your Path:",
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2 + 200,
-            COLOR_TEXT,
-            22,
-            anchor_x="center",
-            bold=True
-        )
+        self._add_text("EVOLUTION TIME! Choose Your Path:", center_x, center_y + 200, COLOR_TEXT, 22, bold=True)
 
         # Evolution options in a row
         num_options = len(self.evolution_options)
         spacing = 200
-        start_x = SCREEN_WIDTH / 2 - (num_options - 1) * spacing / 2
+        start_x = center_x - (num_options - 1) * spacing / 2
 
         for i, form_id in enumerate(self.evolution_options):
             x = start_x + i * spacing
-            y = SCREEN_HEIGHT / 2 + 50
+            y = center_y + 50
 
             form_data = EVOLUTION_TREE.get(form_id)
             is_selected = i == self.selected_index
 
             # Highlight selected
             if is_selected:
-                arcade.draw_rectangle_filled(
-                    x,
-                    y,
-                    180,
-                    300,
-                    (80, 80, 100)
-                )
+                self._add_box(x, y, 180, 300, COLOR_HIGHLIGHT)
 
             # Form preview (colored box)
-            arcade.draw_rectangle_filled(
-                x,
-                y + 80,
-                100,
-                100,
-                form_data["color"]
-            )
-            arcade.draw_rectangle_outline(
-                x,
-                y + 80,
-                100,
-                100,
-                COLOR_TEXT,
-                2
-            )
+            self._add_box(x, y + 80, 100, 100, form_data["color"], COLOR_TEXT, 2)
 
             # Form name
-            arcade.draw_text(
-                form_data["name"],
-                x,
-                y - 10,
-                COLOR_TEXT if is_selected else COLOR_TEXT_DARK,
-                16,
-                anchor_x="center",
-                bold=is_selected
+            self._add_text(
+                form_data["name"], x, y - 10,
+                COLOR_TEXT if is_selected else COLOR_TEXT_DARK, 16, bold=is_selected
             )
 
             # Stats preview
-            stats_text = f"HP: x{form_data['hp_mult']:.1f}\n"
-            stats_text += f"ATK: x{form_data['atk_mult']:.1f}\n"
-            stats_text += f"DEF: x{form_data['def_mult']:.1f}"
-
-            lines = stats_text.split('\n')
+            stat_lines = (
+                f"HP: x{form_data['hp_mult']:.1f}",
+                f"ATK: x{form_data['atk_mult']:.1f}",
+                f"DEF: x{form_data['def_mult']:.1f}",
+            )
             stat_y = y - 40
-            for line in lines:
-                arcade.draw_text(
-                    line,
-                    x,
-                    stat_y,
-                    COLOR_TEXT_DARK,
-                    11,
-                    anchor_x="center"
-                )
+            for line in stat_lines:
+                self._add_text(line, x, stat_y, COLOR_TEXT_DARK, 11)
                 stat_y -= 18
 
             # Description
-            arcade.draw_text(
-                form_data["description"][:30],
-                x,
-                y - 110,
-                COLOR_TEXT_DARK,
-                10,
-                anchor_x="center",
-                width=160,
-                align="center"
+            self._add_text(
+                form_data["description"][:30], x, y - 110, COLOR_TEXT_DARK, 10,
+                width=160, align="center"
             )
 
         # Instructions
-        arcade.draw_text(
-            "A/D to select | ENTER to confirm",
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2 - 210,
-            COLOR_TEXT_DARK,
-            12,
-            anchor_x="center"
-        )
+        self._add_text("A/D to select | ENTER to confirm", center_x, center_y - 210, COLOR_TEXT_DARK, 12)
 
 
-class GameOverMenu:
+class GameOverMenu(Menu):
     """Game over screen"""
 
     def __init__(self, player_stats, on_restart_callback):
+        super().__init__()
         self.player_stats = player_stats
         self.on_restart = on_restart_callback
 
@@ -353,47 +262,19 @@ class GameOverMenu:
         if key == arcade.key.SPACE or key == arcade.key.ENTER or key == arcade.key.R:
             self.on_restart()
 
-    def draw(self):
-        """Draw the game over screen"""
-        # Dark overlay
-        arcade.draw_rectangle_filled(
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2,
-            SCREEN_WIDTH,
-            SCREEN_HEIGHT,
-            (0, 0, 0, 200)
-        )
+    def _build(self, center_x, center_y):
+        """Lay out the game over screen"""
+        # Dark overlay over the whole window
+        self._add_box(center_x, center_y, self.screen_width, self.screen_height, (0, 0, 0, 200))
 
         # Main box
-        arcade.draw_rectangle_filled(
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2,
-            500,
-            400,
-            COLOR_UI_BG
-        )
-        arcade.draw_rectangle_outline(
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2,
-            500,
-            400,
-            COLOR_UI_BORDER,
-            3
-        )
+        self._add_box(center_x, center_y, 500, 400, COLOR_UI_BG, COLOR_UI_BORDER, 3)
 
         # Title
-        arcade.draw_text(
-            "GAME OVER",
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2 + 150,
-            (255, 100, 100),
-            28,
-            anchor_x="center",
-            bold=True
-        )
+        self._add_text("GAME OVER", center_x, center_y + 150, (255, 100, 100), 28, bold=True)
 
         # Stats
-        y = SCREEN_HEIGHT / 2 + 80
+        y = center_y + 80
         stats_display = [
             f"Final Form: {self.player_stats['form'].replace('_', ' ').title()}",
             f"Level Reached: {self.player_stats['level']}",
@@ -402,23 +283,8 @@ class GameOverMenu:
         ]
 
         for stat in stats_display:
-            arcade.draw_text(
-                stat,
-                SCREEN_WIDTH / 2,
-                y,
-                COLOR_TEXT,
-                16,
-                anchor_x="center"
-            )
+            self._add_text(stat, center_x, y, COLOR_TEXT, 16)
             y -= 40
 
         # Instructions
-        arcade.draw_text(
-            "Press SPACE or R to Restart",
-            SCREEN_WIDTH / 2,
-            SCREEN_HEIGHT / 2 - 140,
-            COLOR_TEXT,
-            16,
-            anchor_x="center",
-            bold=True
-        )
+        self._add_text("Press SPACE or R to Restart", center_x, center_y - 140, COLOR_TEXT, 16, bold=True)
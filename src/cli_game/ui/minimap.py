@@ -0,0 +1,153 @@
+"""
+Minimap with fog of war
+
+The floor layout is written into a one-pixel-per-tile GL texture once per
+floor. An explored bitmask hides unvisited tiles; when the player enters a
+new tile only the newly revealed pixels are patched into the texture.
+Enemy blips in explored tiles are drawn as one point list.
+"""
+
+import arcade
+import numpy as np
+from arcade.shape_list import (
+    ShapeElementList,
+    create_rectangle_filled,
+    create_rectangle_outline,
+)
+from ..config import *
+
+COLOR_FOG = (10, 10, 15, 230)
+COLOR_MINIMAP_FLOOR = (*COLOR_FLOOR, 230)
+COLOR_MINIMAP_WALL = (*COLOR_WALL, 255)
+COLOR_BLIP_ENEMY = COLOR_ENEMY
+COLOR_BLIP_PLAYER = COLOR_PLAYER
+
+
+class Minimap:
+    """Corner minimap of the current floor with an incrementally revealed fog"""
+
+    def __init__(self, scale=MINIMAP_SCALE, reveal_radius=MINIMAP_REVEAL_RADIUS):
+        self.scale = scale  # Screen pixels per tile
+        self.padding = 20
+
+        # Tile offsets within the reveal radius, as a square boolean stencil
+        span = np.arange(-reveal_radius, reveal_radius + 1)
+        self.radius = reveal_radius
+        self.stencil = span[None, :] ** 2 + span[:, None] ** 2 <= reveal_radius ** 2
+
+        # Per-floor state (built by reset)
+        self.explored = None
+        self.layout = None  # Explored colors of every tile
+        self.pixels = None  # What the texture currently holds
+        self.texture = None
+        self.quad = None
+        self.player_tile = None
+
+        # Frame shapes, rebuilt when the screen size changes
+        self.frame_shapes = None
+        self._layout_key = None
+        self.rect = (0, 0, 0, 0)
+
+    def reset(self, wall_grid):
+        """Build the layout for a new floor and cover it in fog"""
+        height, width = wall_grid.shape
+        self.layout = np.empty((height, width, 4), dtype=np.uint8)
+        self.layout[:] = COLOR_MINIMAP_FLOOR
+        self.layout[wall_grid] = COLOR_MINIMAP_WALL
+
+        self.explored = np.zeros((height, width), dtype=bool)
+        self.pixels = np.empty_like(self.layout)
+        self.pixels[:] = COLOR_FOG
+        self.player_tile = None
+
+        # Full upload happens once per floor; after that only patches
+        if self.texture is None or self.texture.size != (width, height):
+            ctx = arcade.get_window().ctx
+            self.texture = ctx.texture((width, height), filter=(ctx.NEAREST, ctx.NEAREST))
+            self.quad = arcade.gl.geometry.quad_2d_fs()
+        self.texture.write(self.pixels.tobytes())
+
+    def reveal_around(self, x, y):
+        """Reveal tiles near a world position; only does work on entering a new tile"""
+        tile = (int(x // TILE_SIZE), int(y // TILE_SIZE))
+        if tile == self.player_tile or self.explored is None:
+            return
+        self.player_tile = tile
+
+        # Clip the stencil window to the map
+        height, width = self.explored.shape
+        tx, ty = tile
+        r = self.radius
+        x0, x1 = max(0, tx - r), min(width, tx + r + 1)
+        y0, y1 = max(0, ty - r), min(height, ty + r + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        stencil = self.stencil[y0 - (ty - r):y1 - (ty - r), x0 - (tx - r):x1 - (tx - r)]
+
+        explored = self.explored[y0:y1, x0:x1]
+        new = stencil & ~explored
+        if not new.any():
+            return
+        explored |= new
+
+        # Patch just the window that changed
+        patch = self.pixels[y0:y1, x0:x1]
+        patch[new] = self.layout[y0:y1, x0:x1][new]
+        self.texture.write(np.ascontiguousarray(patch).tobytes(), viewport=(x0, y0, x1 - x0, y1 - y0))
+
+    def _layout(self, screen_width, screen_height):
+        """Place the minimap in the top-right corner"""
+        height, width = self.explored.shape
+        map_w = width * self.scale
+        map_h = height * self.scale
+        left = screen_width - map_w - self.padding
+        bottom = screen_height - map_h - self.padding
+        self.rect = (left, bottom, map_w, map_h)
+
+        center_x = left + map_w / 2
+        center_y = bottom + map_h / 2
+        self.frame_shapes = ShapeElementList()
+        self.frame_shapes.append(create_rectangle_filled(center_x, center_y, map_w + 4, map_h + 4, COLOR_UI_BG))
+        self.frame_shapes.append(
+            create_rectangle_outline(center_x, center_y, map_w + 4, map_h + 4, COLOR_UI_BORDER, 2)
+        )
+
+    def draw(self, player, enemies, screen_width, screen_height):
+        """Draw the minimap, its blips and the player marker (UI camera)"""
+        if self.explored is None:
+            return
+
+        layout_key = (screen_width, screen_height, self.explored.shape)
+        if layout_key != self._layout_key:
+            self._layout_key = layout_key
+            self._layout(screen_width, screen_height)
+
+        self.frame_shapes.draw()
+
+        # Stretch the texture over the minimap rect by pointing the viewport at it
+        ctx = self.texture.ctx
+        ratio = arcade.get_window().get_pixel_ratio()
+        left, bottom, map_w, map_h = self.rect
+        old_viewport = ctx.viewport
+        ctx.viewport = (int(left * ratio), int(bottom * ratio), int(map_w * ratio), int(map_h * ratio))
+        self.texture.use(0)
+        with ctx.enabled(ctx.BLEND):
+            self.quad.render(ctx.utility_textured_quad_program)
+        ctx.viewport = old_viewport
+
+        # Blips: world position -> minimap position, enemies only on explored tiles
+        to_map = self.scale / TILE_SIZE
+        explored = self.explored
+        height, width = explored.shape
+        blips = []
+        for enemy in enemies:
+            tx = int(enemy.center_x // TILE_SIZE)
+            ty = int(enemy.center_y // TILE_SIZE)
+            if 0 <= tx < width and 0 <= ty < height and explored[ty, tx]:
+                blips.append((left + enemy.center_x * to_map, bottom + enemy.center_y * to_map))
+        if blips:
+            arcade.draw_points(blips, COLOR_BLIP_ENEMY, 3)
+
+        arcade.draw_point(
+            left + player.center_x * to_map, bottom + player.center_y * to_map, COLOR_BLIP_PLAYER, 4
+        )
@@ -0,0 +1,39 @@
+"""
+Balance sweep results file tests
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+from cli_game.balance import load_results, run_sweep, trim_results  # noqa: E402
+
+
+def test_resume_after_truncated_line_keeps_every_run(tmp_path):
+    """A sweep resumed after a crash mid-write appends whole lines and loses no run"""
+    path = str(tmp_path / "results.jsonl")
+    run_sweep(path, 2, workers=1, max_ticks=30)
+    with open(path, "a") as f:
+        f.write('{"seed": 2, "policy": "gre')  # Interrupted write
+
+    run_sweep(path, 4, workers=1, max_ticks=30)
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert all(json.loads(line) for line in lines)
+    assert sorted(record["seed"] for record in load_results(path)) == [0, 1, 2, 3]
+
+
+def test_trim_results_keeps_complete_files(tmp_path):
+    """Files that end in a newline, and missing files, are left alone"""
+    path = tmp_path / "results.jsonl"
+    trim_results(str(path))
+    assert not path.exists()
+    path.write_text('{"a": 1}\n')
+    trim_results(str(path))
+    assert path.read_text() == '{"a": 1}\n'
+    path.write_text("partial")
+    trim_results(str(path))
+    assert path.read_text() == ""
@@ -0,0 +1,25 @@
+"""
+Duel table regression tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+from cli_game.config import settings  # noqa: E402
+from cli_game.duels import config_hash, contact_period  # noqa: E402
+
+
+def test_overrides_change_contact_timing_and_cache_key():
+    params = {"seed": 0}
+    base_hash, base_period = config_hash(params), contact_period()
+    try:
+        settings.override(CONTACT_DAMAGE_COOLDOWN=settings.CONTACT_DAMAGE_COOLDOWN * 3)
+        assert contact_period() > base_period
+        assert config_hash(params) != base_hash
+    finally:
+        settings.reset()
+    assert contact_period() == base_period
+    assert config_hash(params) == base_hash
@@ -0,0 +1,58 @@
+"""
+Session host regression tests
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+from cli_game.config import HOST_OVERLOAD_TICKS  # noqa: E402
+from cli_game.host import SessionHost  # noqa: E402
+
+
+def test_admission_reopens_after_overloaded_host_drains():
+    """Sessions finishing during an overload streak must not leave open() waiting forever"""
+    async def scenario():
+        # A 10us tick period makes every tick an overrun
+        async with SessionHost(tick_rate=100_000) as host:
+            ticks = HOST_OVERLOAD_TICKS + 5
+            await asyncio.gather(*(host.play(seed, "greedy", ticks) for seed in range(3)))
+            assert host.overruns >= HOST_OVERLOAD_TICKS
+            session = await asyncio.wait_for(host.open(seed=9, max_ticks=1), timeout=2.0)
+            result = await asyncio.wait_for(session.done, timeout=2.0)
+            assert result["steps"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_exit_returns_when_stopped_before_the_loop_starts():
+    """A host left before its tick loop ever ran still shuts down"""
+    async def scenario():
+        async with SessionHost():
+            pass
+        async with SessionHost(tick_rate=0) as host:
+            first = await host.open(1)
+            second = await host.open(2)
+            first.close()
+            second.close()
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5.0))
+
+
+def test_unseeded_sessions_get_their_own_seeds():
+    """Sessions opened without a seed play different games and report a reproducible seed"""
+    async def scenario():
+        async with SessionHost(tick_rate=0) as host:
+            sessions = [await host.open(max_ticks=1) for _ in range(3)]
+            results = await asyncio.gather(*(session.done for session in sessions))
+        return sessions, results
+
+    sessions, results = asyncio.run(asyncio.wait_for(scenario(), timeout=5.0))
+    seeds = [result["seed"] for result in results]
+    assert None not in seeds and len(set(seeds)) == 3
+    layouts = {tuple((enemy.center_x, enemy.center_y) for enemy in session.sim.current_floor.enemies)
+               for session in sessions}
+    assert len(layouts) == 3
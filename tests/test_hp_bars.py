@@ -0,0 +1,37 @@
+"""
+Enemy HP bar tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+from cli_game.simulation import GameSimulation  # noqa: E402
+from cli_game.ui.hp_bars import EnemyHPBars  # noqa: E402
+
+
+def test_bars_follow_the_visible_set():
+    """Bars leaving view are hidden, dead enemies' bars are removed, and culled enemies get none"""
+    sim = GameSimulation(seed=0)
+    floor = sim.current_floor
+    enemies = list(floor.enemies)
+    for enemy in enemies:
+        enemy.hp = enemy.max_hp - 1  # Full-HP bars are hidden anyway
+    first, second, third, fourth = enemies[:4]
+
+    bars = EnemyHPBars()
+    bars.sync(floor.enemies, [first, second, third])
+    assert set(bars.bars) == {first, second, third}
+    assert all(bar[0].visible for bar in bars.bars.values())
+
+    third.hp = 0
+    floor.remove_enemy(third)
+    bars.sync(floor.enemies, [second, fourth])
+    assert set(bars.bars) == {first, second, fourth}
+    assert not bars.bars[first][0].visible and bars.bars[second][0].visible
+    assert len(bars.sprites) == 9
+
+    bars.sync(floor.enemies, [first])
+    assert bars.bars[first][0].visible and not bars.bars[second][0].visible
@@ -0,0 +1,114 @@
+"""
+Co-op protocol tests
+"""
+
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+from cli_game.config import COOP_BASELINES, COOP_MAX_MESSAGE  # noqa: E402
+from cli_game.netplay import (  # noqa: E402
+    EMPTY_STATE, FRAME, MSG_INPUT, CoopClient, CoopHost, Connection, _valid_partner_command,
+    decode_snapshot, encode_snapshot,
+)
+from cli_game.simulation import GameSimulation, CMD_MOVE  # noqa: E402
+
+
+def test_partner_commands_are_validated():
+    """Only exact-arity commands with in-range arguments reach the simulation"""
+    assert _valid_partner_command(["move", 1, -1], 0)
+    assert _valid_partner_command(["attack"], 0)
+    assert _valid_partner_command(["skill", 1], 2)
+    for command in (["move"], ["move", 40, 0], ["move", True, 0], ["move", 0.5, 0], ["attack", 1],
+                    ["skill", "x"], ["skill", -1], ["skill", 2], ["select", 0], ["restart"], [], {"a": 1}, 5):
+        assert not _valid_partner_command(command, 2), command
+
+
+def test_bad_frame_lengths_close_the_connection():
+    """Empty and oversized frames close the connection instead of desyncing or buffering"""
+    for length in (0, COOP_MAX_MESSAGE + 1):
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            theirs = socket.create_connection(server.getsockname())
+            connection = Connection(server.accept()[0])
+        try:
+            theirs.sendall(FRAME.pack(2, MSG_INPUT) + b"x" + FRAME.pack(length, MSG_INPUT) + b"junk")
+            time.sleep(0.05)
+            assert connection.pump() == [(MSG_INPUT, b"x")]
+            assert connection.closed and not connection.inbox
+        finally:
+            connection.close()
+            theirs.close()
+
+
+def _state(players, enemies, projectiles=b"", effects=()):
+    """Snapshot state as CoopHost.capture returns it"""
+    return {"players": players, "enemies": enemies, "projectiles": projectiles, "effects": list(effects)}
+
+
+def test_snapshot_codec_round_trips_successive_states():
+    """Deltas against the previous state rebuild each state, including removed and added entities"""
+    states = [
+        _state({0: (1, 400, 400, 100, 100, 1, 0)}, {1: (0, 800, 800, 30, 30), 2: (1, 900, 100, 50, 50)}),
+        _state({0: (1, 404, 400, 95, 100, 1, 0), 1: (1, 380, 420, 100, 100, 1, 0)},
+               {1: (0, 810, 790, 20, 30), 2: (1, 900, 100, 50, 50)}, b"\x80\x10\x00\x20", [(0, 404, 400, 0)]),
+        _state({0: (1, 404, 400, 95, 100, 2, 1), 1: (0, 380, 420, 0, 100, 1, 0)}, {3: (2, 100, 100, 80, 80)}),
+        _state({}, {}),
+    ]
+    baseline = EMPTY_STATE
+    for state in states:
+        decoded = decode_snapshot(encode_snapshot(state, baseline), baseline)
+        assert decoded == state
+        # Full snapshot, what the host sends when it has no acked baseline
+        assert decode_snapshot(encode_snapshot(state, EMPTY_STATE), EMPTY_STATE) == state
+        baseline = decoded
+
+
+def _step(sim, host, client, steps=1):
+    """Step the host's simulation and let the client read what it sent"""
+    for _ in range(steps):
+        host.poll()
+        host.after_step(sim.step(partner_commands=host.take_partner_commands()))
+        deadline = time.perf_counter() + 1.0
+        client.poll()
+        while client.connection.stats.bytes_received < host.connection.stats.bytes_sent:
+            assert time.perf_counter() < deadline
+            time.sleep(0.001)
+            client.poll()
+
+
+def test_host_and_client_exchange_over_localhost():
+    """The client rebuilds the host's snapshots, acks them, and its commands reach the partner seat"""
+    sim = GameSimulation(seed=0)
+    host = CoopHost(sim, port=0)
+    client = CoopClient("127.0.0.1", host.port)
+    try:
+        _step(sim, host, client, 30)
+        assert host.connected and client.hello["slot"] == 1
+        assert (client.wall_grid == sim.current_floor.wall_grid).all()
+        assert client.newest == host.seq > 1
+        for key in ("players", "enemies"):
+            assert client.baselines[client.newest][key] == host.sent[host.seq][key]
+        assert host.acked > 1  # Later snapshots were deltas against acked ones
+        assert client.view()["players"].keys() == {0, 1}
+
+        start_x = sim.partner.center_x
+        client.send([(CMD_MOVE, 1, 0)])
+        client.poll()
+        _step(sim, host, client, 30)
+        assert sim.partner.center_x > start_x
+
+        # A client that lost its baselines drops deltas until the host falls back to a full snapshot
+        client.baselines.clear()
+        stalled = client.newest
+        _step(sim, host, client, host.snapshot_steps * 3)
+        assert client.newest == stalled
+        _step(sim, host, client, host.snapshot_steps * (COOP_BASELINES + 2))
+        assert client.newest == host.seq
+        assert client.baselines[client.newest]["players"] == host.sent[host.seq]["players"]
+    finally:
+        client.close()
+        host.close()
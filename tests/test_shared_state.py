@@ -0,0 +1,48 @@
+"""
+Shared-memory game state tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+from cli_game.shared_state import SharedStatePublisher, SharedStateReader  # noqa: E402
+from cli_game.simulation import GameSimulation  # noqa: E402
+
+
+def test_reader_sees_published_steps_until_they_leave_the_ring():
+    """Snapshots read back as published, and numbers older than the ring read as None"""
+    sim = GameSimulation(seed=0)
+    publisher = SharedStatePublisher(f"cgss_test_{os.getpid()}", slots=4)
+    reader = None
+    try:
+        reader = SharedStateReader(publisher.name)
+        assert reader.read(reader.to_dict) is None  # Nothing published yet
+
+        ticks = []
+        for _ in range(6):
+            sim.step()
+            publisher.publish(sim)
+            ticks.append(sim.tick)
+
+        newest = reader.read(reader.to_dict)
+        assert newest["number"] == reader.published == 6
+        assert newest["tick"] == sim.tick and newest["floor"] == sim.floor_number
+        assert newest["state"] == sim.state
+        player = newest["players"][0]
+        assert player["form"] == sim.player.current_form and player["level"] == sim.player.level
+        assert abs(player["x"] - sim.player.center_x) < 1e-3
+        assert newest["enemy_total"] == len(sim.current_floor.enemies)
+        assert [enemy["kind"] for enemy in newest["enemies"]] == [
+            type(enemy).__name__ for enemy in sim.current_floor.enemies[:len(newest["enemies"])]
+        ]
+
+        assert reader.read(reader.to_dict, number=3)["tick"] == ticks[2]
+        assert reader.read(reader.to_dict, number=2) is None  # Overwritten by snapshot 6
+        assert reader.read(reader.to_dict, number=7) is None  # Not published yet
+    finally:
+        if reader:
+            reader.close()
+        publisher.close()